@@ -0,0 +1,238 @@
+"""Write-behind buffer collecting many small creates, updates and deletes into few requests"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+
+import odsbox.proto.ods_pb2 as ods
+from odsbox.pandas_to_datamatrices import from_pandas
+
+if TYPE_CHECKING:
+    from .con_i import ConI
+
+
+class _Buffer:
+    """Columnar rows of a single operation on a single entity."""
+
+    def __init__(self, operation: str, entity: ods.Model.Entity) -> None:
+        self.operation = operation
+        self.entity = entity
+        self.columns: dict[str, list[Any]] = {}
+        self.futures: list[Future[int]] = []
+        self.rows = 0
+        self.depends_on: list[_Buffer] = []
+
+    @property
+    def key(self) -> tuple[str, int]:
+        return self.operation, self.entity.aid
+
+    def append(self, values: Mapping[str, Any]) -> None:
+        for name, value in values.items():
+            column = self.columns.get(name)
+            if column is None:
+                column = self.columns[name] = [None] * self.rows
+            column.append(value)
+        self.rows += 1
+        for column in self.columns.values():
+            if len(column) < self.rows:
+                column.append(None)
+
+
+class BatchWriter:
+    """
+    Collect rows to be created, updated or deleted and send them as few large DataMatrices.
+
+    Rows are buffered in columns per operation and entity. A buffer is flushed if it reaches
+    `max_rows`, on `flush` and when the with block is left without exception. Ids of created
+    instances are returned as futures that are resolved by the flush. A pending future can be
+    used as value of a relation of another row. The buffer creating it is flushed first.
+    An update setting other attributes than the buffered updates of its entity flushes them
+    first, because cells missing in a row would be written as null.
+
+    Example::
+
+        with con_i.transaction() as transaction:
+            batch = transaction.batch_writer()
+            test_id = batch.create("AoTest", {"name": "Test", "mime_type": "application/x-asam.aotest"})
+            for index in range(1000):
+                batch.create("AoSubTest", {"name": f"SubTest{index}", "parent_test": test_id})
+            transaction.commit()  # flushes the batch writer before the commit
+        print(test_id.result())
+    """
+
+    _log: logging.Logger = logging.getLogger(__name__)
+
+    def __init__(self, con_i: ConI, max_rows: int = 1000) -> None:
+        """
+        Create a batch writer.
+
+        Args:
+            con_i: ConI used to send the requests.
+            max_rows: Number of rows of an entity and operation that trigger a flush of its buffer.
+
+        Raises:
+            ValueError: If max_rows is not positive.
+        """
+        if max_rows <= 0:
+            raise ValueError(f"max_rows must be positive, got {max_rows}.")
+        self.__con_i = con_i
+        self.__max_rows = max_rows
+        # insertion order defines the order buffers are flushed in
+        self.__buffers: dict[tuple[str, int], _Buffer] = {}
+        self.__future_buffers: dict[int, _Buffer] = {}
+
+    def __enter__(self) -> BatchWriter:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, exc_traceback: object
+    ) -> None:
+        if exc_type is None:
+            self.flush()
+        else:
+            self.clear()
+
+    def create(self, entity: str | ods.Model.Entity, values: Mapping[str, Any]) -> Future[int]:
+        """
+        Add an instance to be created.
+
+        Args:
+            entity: Entity or application or base name of the entity.
+            values: Values by attribute or relation name. Related ids may be futures returned by `create`.
+
+        Returns:
+            Future resolved to the id of the created instance when its buffer is flushed.
+        """
+        future: Future[int] = Future()
+        buffer = self.__append("create", entity, values)
+        buffer.futures.append(future)
+        self.__future_buffers[id(future)] = buffer
+        self.__flush_full(buffer)
+        return future
+
+    def update(self, entity: str | ods.Model.Entity, values: Mapping[str, Any]) -> None:
+        """
+        Add an instance to be updated.
+
+        Args:
+            entity: Entity or application or base name of the entity.
+            values: Values by attribute or relation name. Has to contain the `id` of the instance.
+
+        Raises:
+            ValueError: If values do not contain an id.
+        """
+        if not any(name.casefold() == "id" for name in values):
+            raise ValueError("Values of an update need to contain the 'id' of the instance.")
+        self.__flush_full(self.__append("update", entity, values))
+
+    def delete(self, entity: str | ods.Model.Entity, iid: int | Future[int]) -> None:
+        """
+        Add an instance to be deleted.
+
+        Args:
+            entity: Entity or application or base name of the entity.
+            iid: Id of the instance to be deleted.
+        """
+        self.__flush_full(self.__append("delete", entity, {"id": iid}))
+
+    @property
+    def pending_rows(self) -> int:
+        """Number of buffered rows not sent yet."""
+        return sum(buffer.rows for buffer in self.__buffers.values())
+
+    def flush(self) -> None:
+        """
+        Send all buffered rows. Buffers are sent in the order of their first row, buffers
+        creating instances referenced by futures are sent before the buffers using them.
+
+        Raises:
+            requests.HTTPError: If a request fails. The futures of the failed buffer get the exception.
+        """
+        while self.__buffers:
+            self.__flush_buffer(next(iter(self.__buffers.values())))
+
+    def clear(self) -> None:
+        """Discard all buffered rows and cancel the futures of discarded creates."""
+        for buffer in self.__buffers.values():
+            for future in buffer.futures:
+                future.cancel()
+                self.__future_buffers.pop(id(future), None)
+        self.__buffers.clear()
+
+    def __append(self, operation: str, entity: str | ods.Model.Entity, values: Mapping[str, Any]) -> _Buffer:
+        if not isinstance(entity, ods.Model.Entity):
+            entity = self.__con_i.mc.entity_no_throw(entity) or self.__con_i.mc.entity_by_base_name(entity)
+        key = (operation, entity.aid)
+        pending = self.__buffers.get(key)
+        if operation == "update" and pending is not None and set(pending.columns) != set(values):
+            # missing cells would be sent as null and overwrite the attributes of the other rows
+            self.__flush_buffer(pending)
+        dependencies: list[_Buffer] = []
+        for value in values.values():
+            if not isinstance(value, Future) or value.done():
+                continue
+            dependency = self.__future_buffers.get(id(value))
+            if dependency is None:
+                raise ValueError("Only futures returned by create of this BatchWriter can be used as values.")
+            pending = self.__buffers.get(key)
+            if dependency is pending or (pending is not None and self.__depends(dependency, pending)):
+                # ids within a single request are not known before it returns
+                self.__flush_buffer(dependency)
+            else:
+                dependencies.append(dependency)
+        buffer = self.__buffers.setdefault(key, _Buffer(operation, entity))
+        for dependency in dependencies:
+            if self.__pending(dependency) and dependency not in buffer.depends_on:
+                buffer.depends_on.append(dependency)
+        buffer.append(values)
+        return buffer
+
+    def __pending(self, buffer: _Buffer) -> bool:
+        return self.__buffers.get(buffer.key) is buffer
+
+    def __depends(self, buffer: _Buffer, dependency: _Buffer) -> bool:
+        return any(
+            candidate is dependency or (self.__pending(candidate) and self.__depends(candidate, dependency))
+            for candidate in buffer.depends_on
+        )
+
+    def __flush_full(self, buffer: _Buffer) -> None:
+        if buffer.rows >= self.__max_rows:
+            self.__flush_buffer(buffer)
+
+    def __flush_buffer(self, buffer: _Buffer) -> None:
+        if not self.__pending(buffer):
+            return
+        for dependency in buffer.depends_on:
+            self.__flush_buffer(dependency)
+        del self.__buffers[buffer.key]
+        try:
+            columns = {
+                name: [value.result() if isinstance(value, Future) else value for value in column]
+                for name, column in buffer.columns.items()
+            }
+            data = from_pandas(pd.DataFrame(columns), buffer.entity, self.__con_i.mc)
+            self._log.debug("Flush %d rows to %s of '%s'", buffer.rows, buffer.operation, buffer.entity.name)
+            if buffer.operation == "create":
+                ids = self.__con_i.data_create(data)
+                if len(ids) != len(buffer.futures):
+                    raise ValueError(f"Expected {len(buffer.futures)} ids for '{buffer.entity.name}', got {len(ids)}.")
+                for future, iid in zip(buffer.futures, ids):
+                    future.set_result(iid)
+            elif buffer.operation == "update":
+                self.__con_i.data_update(data)
+            else:
+                self.__con_i.data_delete(data)
+        except Exception as e:
+            for future in buffer.futures:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+        finally:
+            for future in buffer.futures:
+                self.__future_buffers.pop(id(future), None)
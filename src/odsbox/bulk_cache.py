@@ -0,0 +1,188 @@
+"""persistent on-disk cache for decoded local column values"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+
+class BulkCache:
+    """
+    Opt-in on-disk cache for decoded local column values used by the BulkReader.
+
+    Each entry is stored as `.npy` file and memory mapped when read. Entries are keyed by
+    server, local column id, the values window and a change token. If the total size of
+    the stored arrays exceeds `max_size_bytes` the least recently used entries are removed.
+
+    Example::
+
+        from odsbox.bulk_cache import BulkCache
+        from odsbox.con_i import ConI
+
+        with ConI(
+            url="https://MYSERVER/api",
+            auth=("USER", "PASSWORD"),
+        ) as con_i:
+            con_i.bulk.cache = BulkCache("/data/odsbox_cache", max_size_bytes=20 * 1024**3)
+            df = con_i.bulk.data_read(1234, ["Time", "Co*"])
+
+    Remark: Only numeric values are cached. The change token is derived from the `number_of_rows`
+    of the submatrix. Bulk data that is overwritten keeping the number of rows is not detected;
+    call `clear` in that case.
+    """
+
+    __log: logging.Logger = logging.getLogger(__name__)
+
+    def __init__(self, directory: str, max_size_bytes: int = 1024**3) -> None:
+        """
+        Create a cache in the given directory.
+
+        Args:
+            directory: Folder to store the cache files in. It is created if it does not exist.
+                The folder can be shared between processes.
+            max_size_bytes: Maximal size of all cached arrays in bytes. Defaults to 1 GiB.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_size_bytes = max_size_bytes
+
+    @staticmethod
+    def key(
+        server: str,
+        local_column_id: int,
+        values_start: int,
+        values_limit: int,
+        calculate_raw: bool,
+        change_token: str,
+    ) -> str:
+        """
+        Create the key for a cache entry.
+
+        Args:
+            server: URL of the ASAM ODS server.
+            local_column_id: Id of the local column.
+            values_start: Zero-based starting index of the values window.
+            values_limit: Maximum number of values in the window. 0 means all remaining values.
+            calculate_raw: Whether raw sequence representations were converted.
+            change_token: Token changing if the bulk data of the local column changes.
+
+        Returns:
+            A file system compatible key.
+        """
+        key_str = f"{server}|{local_column_id}|{values_start}|{values_limit}|{calculate_raw}|{change_token}"
+        return hashlib.sha1(key_str.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> tuple[np.ndarray, int] | None:
+        """
+        Get cached values as read only memory map.
+
+        Args:
+            key: Key created using `key`.
+
+        Returns:
+            Tuple of values and unit id or None if the key is not cached.
+        """
+        values_path = self.__values_path(key)
+        try:
+            with open(self.__meta_path(key), encoding="utf-8") as meta_file:
+                unit_id = int(json.load(meta_file)["unit_id"])
+            values = np.load(values_path, mmap_mode="r", allow_pickle=False)
+            # mark entry as recently used
+            os.utime(values_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return values, unit_id
+
+    def put(self, key: str, values: np.ndarray, unit_id: int) -> bool:
+        """
+        Store values in the cache.
+
+        Args:
+            key: Key created using `key`.
+            values: Values of the local column.
+            unit_id: Unit id delivered with the values.
+
+        Returns:
+            True if the values were stored. Non numeric values are not cached.
+        """
+        if not isinstance(values, np.ndarray) or values.dtype.kind not in "biufc":
+            return False
+        if values.nbytes > self.max_size_bytes:
+            return False
+
+        self.__write_atomic(self.__meta_path(key), json.dumps({"unit_id": int(unit_id)}).encode("utf-8"))
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                np.save(tmp_file, values, allow_pickle=False)
+            os.replace(tmp_path, self.__values_path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.__evict()
+        return True
+
+    def size_bytes(self) -> int:
+        """
+        Get the size of all cached values files.
+
+        Returns:
+            The size in bytes.
+        """
+        return sum(size for _, _, size in self.__entries())
+
+    def clear(self) -> None:
+        """
+        Remove all cache entries.
+        """
+        for key, _, _ in self.__entries():
+            self.__remove(key)
+
+    def __entries(self) -> list[tuple[str, float, int]]:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".npy"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue  # removed by a concurrent process
+                    entries.append((entry.name[:-4], stat.st_mtime, stat.st_size))
+        return entries
+
+    def __evict(self) -> None:
+        entries = self.__entries()
+        total_size = sum(size for _, _, size in entries)
+        if total_size <= self.max_size_bytes:
+            return
+        for key, _, size in sorted(entries, key=lambda e: e[1]):
+            self.__remove(key)
+            total_size -= size
+            self.__log.debug("Evicted cache entry '%s'", key)
+            if total_size <= self.max_size_bytes:
+                break
+
+    def __remove(self, key: str) -> None:
+        for path in (self.__values_path(key), self.__meta_path(key)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # already removed or still mapped by another reader
+
+    def __write_atomic(self, path: str, content: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(content)
+        os.replace(tmp_path, path)
+
+    def __values_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".npy")
+
+    def __meta_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
@@ -0,0 +1,138 @@
+"""adaptive chunk sizing for chunked bulk reads bounded by a memory budget"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import odsbox.proto.ods_pb2 as ods
+
+DATA_TYPE_BYTES: dict[int, int] = {
+    ods.DT_BOOLEAN: 1,
+    ods.DT_BYTE: 1,
+    ods.DT_SHORT: 2,
+    ods.DT_LONG: 4,
+    ods.DT_FLOAT: 4,
+    ods.DT_LONGLONG: 8,
+    ods.DT_DOUBLE: 8,
+    ods.DT_DATE: 8,
+    ods.DT_COMPLEX: 8,
+    ods.DT_DCOMPLEX: 16,
+}
+"""Bytes per value of the fixed size `DataTypeEnum` values after decoding."""
+
+VARIABLE_SIZE_BYTES: int = 64
+"""Assumed bytes per value of strings, bytestreams and unknown data types."""
+
+
+class ChunkSizer:
+    """
+    Determine the number of rows per chunk so that a chunk fits into a memory budget.
+
+    The first estimate is based on the data types of the columns. After each chunk the
+    observed memory per row replaces the estimate. Observations larger than the estimate
+    are taken over immediately to avoid running out of memory, smaller ones are averaged.
+    If `max_seconds` is given, chunks taking longer are shrunk proportionally and faster
+    chunks may grow by at most a factor of two per chunk, still bounded by the budget.
+
+    A chunk is assumed to need `OVERHEAD` times its decoded size while it is read, because
+    the protobuf response, the decoded arrays and the DataFrame exist at the same time.
+
+    Example::
+
+        import time
+
+        import odsbox.proto.ods_pb2 as ods
+        from odsbox.bulk_chunking import ChunkSizer
+
+        sizer = ChunkSizer(512 * 1024**2, ChunkSizer.row_bytes([ods.DT_DOUBLE] * 2000))
+        start = 0
+        while start < number_of_rows:
+            rows = sizer.rows
+            started = time.perf_counter()
+            df = con_i.bulk.data_read(submatrix_iid, values_start=start, values_limit=rows)
+            sizer.observe(df.shape[0], int(df.memory_usage().sum()), time.perf_counter() - started)
+            start += rows
+    """
+
+    OVERHEAD: int = 3
+
+    def __init__(
+        self,
+        memory_budget_bytes: int,
+        row_bytes: int,
+        min_rows: int = 1,
+        max_rows: int | None = None,
+        max_seconds: float | None = None,
+    ) -> None:
+        """
+        Create a sizer.
+
+        Args:
+            memory_budget_bytes: Memory a single chunk may use while it is read.
+            row_bytes: Estimated decoded bytes of a row, e.g. from `row_bytes`.
+            min_rows: Lower bound of the chunk rows.
+            max_rows: Upper bound of the chunk rows. None means unbounded.
+            max_seconds: Targeted maximal duration of reading a chunk. None disables latency adaption.
+
+        Raises:
+            ValueError: If memory_budget_bytes or min_rows is not positive.
+        """
+        if memory_budget_bytes <= 0:
+            raise ValueError(f"memory_budget_bytes must be positive, got {memory_budget_bytes}.")
+        if min_rows <= 0:
+            raise ValueError(f"min_rows must be positive, got {min_rows}.")
+        self.__memory_budget_bytes = memory_budget_bytes
+        self.__row_bytes = float(max(row_bytes, 1))
+        self.__min_rows = min_rows
+        self.__max_rows = max_rows
+        self.__max_seconds = max_seconds
+        self.__rows = self.__clamp(self.__budget_rows())
+
+    @property
+    def rows(self) -> int:
+        """Number of rows to request for the next chunk."""
+        return self.__rows
+
+    @property
+    def estimated_row_bytes(self) -> float:
+        """Current estimate of the decoded bytes of a row."""
+        return self.__row_bytes
+
+    def observe(self, rows: int, nbytes: int, seconds: float) -> None:
+        """
+        Adjust the chunk rows based on a chunk that was read.
+
+        Args:
+            rows: Number of rows of the chunk.
+            nbytes: Decoded size of the chunk in bytes, e.g. `df.memory_usage().sum()`.
+            seconds: Time it took to read the chunk.
+        """
+        if rows <= 0:
+            return
+        observed = max(nbytes / rows, 1.0)
+        self.__row_bytes = observed if observed > self.__row_bytes else (self.__row_bytes + observed) / 2
+        new_rows = self.__budget_rows()
+        if self.__max_seconds is not None and seconds > 0:
+            new_rows = min(new_rows, int(rows * self.__max_seconds / seconds), 2 * self.__rows)
+        self.__rows = self.__clamp(new_rows)
+
+    @staticmethod
+    def row_bytes(data_types: Iterable[int]) -> int:
+        """
+        Estimate the decoded bytes of a row.
+
+        Args:
+            data_types: `DataTypeEnum` values of the columns.
+
+        Returns:
+            Sum of the bytes per value of the columns.
+        """
+        return sum(DATA_TYPE_BYTES.get(int(data_type), VARIABLE_SIZE_BYTES) for data_type in data_types)
+
+    def __budget_rows(self) -> int:
+        return int(self.__memory_budget_bytes / (self.__row_bytes * ChunkSizer.OVERHEAD))
+
+    def __clamp(self, rows: int) -> int:
+        if self.__max_rows is not None:
+            rows = min(rows, self.__max_rows)
+        return max(rows, self.__min_rows)
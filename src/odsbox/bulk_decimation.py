@@ -0,0 +1,213 @@
+"""streaming decimation of channel values for plotting"""
+
+from __future__ import annotations
+
+import numpy as np
+
+DECIMATION_METHODS: tuple[str, ...] = ("minmax", "lttb")
+
+
+class Decimator:
+    """
+    Reduce a channel to a fixed number of points while its values arrive in chunks.
+
+    The rows of the channel are split into buckets of equal size. Only rows of buckets that
+    are not yet complete are buffered, so memory is bounded by the chunk size plus the bucket size.
+
+    Methods:
+
+    - `minmax`: Keep the minimum and the maximum of each bucket. Peaks are never lost.
+    - `lttb`: Largest-Triangle-Three-Buckets. Keep the first and the last row and one row per bucket
+      forming the largest triangle with the previously selected row and the average of the next bucket.
+
+    Example::
+
+        from odsbox.bulk_decimation import Decimator
+
+        decimator = Decimator(number_of_rows=len(y), points=1000, method="lttb")
+        for start in range(0, len(y), 100_000):
+            rows = np.arange(start, min(start + 100_000, len(y)))
+            decimator.add(rows, x[rows], y[rows])
+        rows, x_points, y_points = decimator.finish()
+    """
+
+    def __init__(self, number_of_rows: int, points: int, method: str = "minmax") -> None:
+        """
+        Create a decimator for a channel.
+
+        Args:
+            number_of_rows: Total number of rows of the channel.
+            points: Maximum number of points to return.
+            method: One of `minmax` or `lttb`.
+
+        Raises:
+            ValueError: If the method is unknown or points is too small for the method.
+        """
+        if method not in DECIMATION_METHODS:
+            raise ValueError(f"Unknown decimation method '{method}'. Use one of {list(DECIMATION_METHODS)}.")
+        if points < (2 if method == "minmax" else 3):
+            raise ValueError(f"points must be at least {2 if method == 'minmax' else 3} for '{method}', got {points}.")
+
+        self.__method = method
+        self.__number_of_rows = number_of_rows
+        if method == "minmax":
+            self.__edges = np.round(np.linspace(0, number_of_rows, points // 2 + 1)).astype(np.int64)
+        else:
+            # first and last row are kept, the rows in between are split into points - 2 buckets
+            self.__edges = np.round(np.linspace(1, max(number_of_rows - 1, 1), points - 1)).astype(np.int64)
+        self.__buffer: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+        self.__received = 0
+        self.__selected: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self.__pending: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+        self.__previous: tuple[float, float] | None = None
+        self.__last: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+
+    def add(self, rows: np.ndarray, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Add a chunk of values. Chunks must be added in ascending row order but may leave gaps.
+
+        Args:
+            rows: Zero-based row numbers of the values.
+            x: Independent values. Numeric and datetime values are used as x coordinates
+                for `lttb`, otherwise the row numbers are used.
+            y: Channel values.
+        """
+        if len(rows) == 0:
+            return
+        rows = np.asarray(rows, dtype=np.int64)
+        x = np.asarray(x)
+        y = np.asarray(y)
+        self.__received = int(rows[-1]) + 1
+
+        if self.__method == "lttb":
+            if rows[0] == 0 and self.__previous is None:
+                self.__selected.append((rows[:1], x[:1], y[:1]))
+                self.__previous = (float(Decimator.__geometry(rows[:1], x[:1])[0]), float(y[:1].astype(np.float64)[0]))
+            if self.__number_of_rows > 1 and rows[-1] == self.__number_of_rows - 1:
+                self.__last = (rows[-1:], x[-1:], y[-1:])
+            middle = (rows >= self.__edges[0]) & (rows < self.__edges[-1])
+            rows, x, y = rows[middle], x[middle], y[middle]
+
+        if self.__buffer is not None:
+            rows = np.concatenate([self.__buffer[0], rows])
+            x = np.concatenate([self.__buffer[1], x])
+            y = np.concatenate([self.__buffer[2], y])
+        # rows before the last edge that was passed belong to complete buckets
+        passed_edge = self.__edges[np.searchsorted(self.__edges, self.__received, side="right") - 1]
+        complete_rows = int(np.searchsorted(rows, passed_edge))
+        self.__process(rows[:complete_rows], x[:complete_rows], y[:complete_rows], final=False)
+        self.__buffer = (rows[complete_rows:], x[complete_rows:], y[complete_rows:])
+
+    def finish(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Process the buffered rows and return the selected points.
+
+        Returns:
+            Tuple of row numbers, x values and y values of the selected points in ascending row order.
+        """
+        if self.__buffer is not None:
+            self.__process(*self.__buffer, final=True)
+            self.__buffer = None
+        elif self.__pending is not None:
+            self.__process(np.empty(0, np.int64), np.empty(0), np.empty(0), final=True)
+        if self.__last is not None:
+            self.__selected.append(self.__last)
+            self.__last = None
+        if not self.__selected:
+            return np.empty(0, np.int64), np.empty(0), np.empty(0)
+        return (
+            np.concatenate([s[0] for s in self.__selected]),
+            np.concatenate([s[1] for s in self.__selected]),
+            np.concatenate([s[2] for s in self.__selected]),
+        )
+
+    def __process(self, rows: np.ndarray, x: np.ndarray, y: np.ndarray, final: bool) -> None:
+        if len(rows) == 0 and not (final and self.__pending is not None):
+            return
+        bucket_ids = np.searchsorted(self.__edges, rows, side="right") - 1
+        starts = np.flatnonzero(np.r_[True, bucket_ids[1:] != bucket_ids[:-1]]) if len(rows) else np.empty(0, np.int64)
+        ends = np.r_[starts[1:], len(rows)].astype(np.int64)
+        if self.__method == "minmax":
+            indices = Decimator.__minmax_indices(y.astype(np.float64), starts, ends)
+            self.__selected.append((rows[indices], x[indices], y[indices]))
+        else:
+            self.__lttb(rows, x, y, starts, ends, final)
+
+    @staticmethod
+    def __minmax_indices(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Positions of minimum and maximum of each segment in ascending order. NaN values are ignored."""
+        lengths = ends - starts
+        low = np.repeat(np.fmin.reduceat(values, starts), lengths)
+        high = np.repeat(np.fmax.reduceat(values, starts), lengths)
+        return np.unique(
+            np.concatenate(
+                [
+                    Decimator.__first_match(values == low, starts, ends),
+                    Decimator.__first_match(values == high, starts, ends),
+                ]
+            )
+        )
+
+    @staticmethod
+    def __first_match(mask: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """First position of each segment where mask is set. Segments without match return their start."""
+        hits = np.flatnonzero(mask)
+        if len(hits) == 0:
+            return starts
+        positions = np.searchsorted(hits, starts)
+        found = hits[np.minimum(positions, len(hits) - 1)]
+        return np.where((positions < len(hits)) & (found < ends), found, starts)
+
+    def __lttb(
+        self, rows: np.ndarray, x: np.ndarray, y: np.ndarray, starts: np.ndarray, ends: np.ndarray, final: bool
+    ) -> None:
+        buckets = [(rows[s:e], x[s:e], y[s:e]) for s, e in zip(starts, ends)]
+        if self.__pending is not None:
+            buckets.insert(0, self.__pending)
+        self.__pending = None if final else buckets.pop()
+
+        for index, (bucket_rows, bucket_x, bucket_y) in enumerate(buckets):
+            xs = Decimator.__geometry(bucket_rows, bucket_x)
+            ys = bucket_y.astype(np.float64)
+            if index + 1 < len(buckets):
+                next_rows, next_x, next_y = buckets[index + 1]
+            elif self.__pending is not None:
+                next_rows, next_x, next_y = self.__pending
+            elif self.__last is not None:
+                next_rows, next_x, next_y = self.__last
+            else:
+                next_rows, next_x, next_y = bucket_rows, bucket_x, bucket_y
+            next_point = (
+                float(Decimator.__geometry(next_rows, next_x).mean()),
+                Decimator.__nan_mean(next_y.astype(np.float64)),
+            )
+            previous = self.__previous if self.__previous is not None else (float(xs[0]), float(ys[0]))
+            if np.isnan(next_point[1]):
+                next_point = (next_point[0], previous[1])
+            area = np.abs(
+                (previous[0] - next_point[0]) * (ys - previous[1]) - (previous[0] - xs) * (next_point[1] - previous[1])
+            )
+            selected = int(np.argmax(np.where(np.isnan(area), -1.0, area)))
+            self.__selected.append(
+                (
+                    bucket_rows[selected : selected + 1],
+                    bucket_x[selected : selected + 1],
+                    bucket_y[selected : selected + 1],
+                )
+            )
+            if not np.isnan(ys[selected]):
+                self.__previous = (float(xs[selected]), float(ys[selected]))
+
+    @staticmethod
+    def __nan_mean(values: np.ndarray) -> float:
+        valid = values[~np.isnan(values)]
+        return float(valid.mean()) if len(valid) else float("nan")
+
+    @staticmethod
+    def __geometry(rows: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """x coordinates used to compute triangle areas."""
+        if x.dtype.kind in "biuf":
+            return x.astype(np.float64)
+        if x.dtype.kind in "mM":
+            return x.view(np.int64).astype(np.float64)
+        return rows.astype(np.float64)
@@ -0,0 +1,127 @@
+"""write chunks of bulk data to Parquet, Arrow IPC or HDF5 files"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from typing import Any
+
+import pandas as pd
+
+EXPORT_FORMATS: dict[str, str] = {"parquet": ".parquet", "arrow": ".arrow", "hdf5": ".h5"}
+HDF5_MIN_STRING_ITEMSIZE: int = 256
+"""Minimal number of characters reserved for the string columns of an HDF5 table."""
+
+
+def write_chunks(chunks: Iterable[pd.DataFrame], path: str, format: str = "parquet", hdf5_key: str = "data") -> int:
+    """
+    Write DataFrame chunks to a single file. Only one chunk is kept in memory at a time.
+
+    The unit names given in ``df.attrs["unit_names"]`` of the first chunk are stored as
+    metadata. For Parquet and Arrow IPC each field gets a `unit` metadata entry and the schema
+    gets a `unit_names` JSON entry. For HDF5 they are stored in the attribute `unit_names`
+    of the table. HDF5 tables reserve the length of the longest string of the first chunk, at
+    least `HDF5_MIN_STRING_ITEMSIZE` characters, for each string column. A RangeIndex of a
+    chunk is continued from the rows written before.
+
+    Args:
+        chunks: DataFrames sharing the same columns and dtypes.
+        path: File to write to. Existing files are overwritten.
+        format: One of `parquet`, `arrow` or `hdf5`.
+        hdf5_key: Key of the table if writing HDF5.
+
+    Returns:
+        The number of rows written.
+
+    Raises:
+        ValueError: If the format is unknown or a string of a later chunk exceeds the length
+            reserved for its HDF5 column.
+        ImportError: If the packages needed for the format are not installed.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{format}'. Use one of {list(EXPORT_FORMATS)}.")
+    if format == "hdf5":
+        return _write_hdf5(chunks, path, hdf5_key)
+    return _write_arrow(chunks, path, format)
+
+
+def _import_pyarrow() -> tuple[Any, Any, Any]:
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc as pa_ipc
+        import pyarrow.parquet as pa_parquet
+    except ImportError as e:
+        raise ImportError("Parquet and Arrow export require pyarrow. Install with: pip install odsbox[export]") from e
+    return pa, pa_ipc, pa_parquet
+
+
+def _write_arrow(chunks: Iterable[pd.DataFrame], path: str, format: str) -> int:
+    pa, pa_ipc, pa_parquet = _import_pyarrow()
+
+    writer: Any = None
+    schema: Any = None
+    row_count = 0
+    try:
+        for chunk in chunks:
+            if writer is None:
+                unit_names: dict[str, str] = chunk.attrs.get("unit_names", {})
+                schema = pa.Schema.from_pandas(chunk)
+                schema = pa.schema(
+                    [
+                        field.with_metadata({"unit": unit_names[field.name]}) if field.name in unit_names else field
+                        for field in schema
+                    ],
+                    metadata={**(schema.metadata or {}), b"unit_names": json.dumps(unit_names).encode("utf-8")},
+                )
+                writer = (
+                    pa_parquet.ParquetWriter(path, schema)
+                    if format == "parquet"
+                    else pa_ipc.new_file(path, schema)  # arrow
+                )
+            table = pa.Table.from_pandas(chunk, schema=schema)
+            writer.write_table(table)
+            row_count += chunk.shape[0]
+    finally:
+        if writer is not None:
+            writer.close()
+    return row_count
+
+
+def _max_string_length(values: pd.Series) -> int:
+    lengths = values.str.len()
+    return int(lengths.max()) if lengths.notna().any() else 0
+
+
+def _write_hdf5(chunks: Iterable[pd.DataFrame], path: str, hdf5_key: str) -> int:
+    try:
+        import tables  # noqa: F401
+    except ImportError as e:
+        raise ImportError("HDF5 export requires PyTables. Install with: pip install odsbox[export]") from e
+
+    row_count = 0
+    min_itemsize: dict[str, int] = {}
+    with pd.HDFStore(path, mode="w") as store:
+        for chunk in chunks:
+            if row_count == 0 and chunk.shape[0] == 0:
+                continue
+            if isinstance(chunk.index, pd.RangeIndex):
+                # each chunk starts at 0, the rows of the table are numbered continuously
+                chunk = chunk.set_axis(pd.RangeIndex(row_count, row_count + chunk.shape[0]))
+            lengths = {
+                str(name): _max_string_length(chunk[name])
+                for name in chunk.columns
+                if chunk[name].dtype == object or isinstance(chunk[name].dtype, pd.StringDtype)
+            }
+            if row_count == 0:
+                min_itemsize = {name: max(length, HDF5_MIN_STRING_ITEMSIZE) for name, length in lengths.items()}
+            for name, length in lengths.items():
+                if length > min_itemsize.get(name, length):
+                    raise ValueError(
+                        f"String of length {length} in column '{name}' exceeds the {min_itemsize[name]} characters "
+                        "reserved by the first chunk. Increase HDF5_MIN_STRING_ITEMSIZE."
+                    )
+            store.append(hdf5_key, chunk, format="table", index=False, min_itemsize=min_itemsize or None)
+            if row_count == 0:
+                store.get_storer(hdf5_key).attrs.unit_names = chunk.attrs.get("unit_names", {})
+            row_count += chunk.shape[0]
+    return row_count
@@ -0,0 +1,401 @@
+"""local decoding of binary files referenced by AoExternalComponent instances"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+from typing import TYPE_CHECKING, Any
+from urllib.parse import unquote, urlparse
+
+import numpy as np
+import pandas as pd
+
+import odsbox.proto.ods_pb2 as ods
+from odsbox.bulk_reader import BulkReader, SeqRepEnum
+
+if TYPE_CHECKING:
+    from .con_i import ConI
+
+TYPESPEC_DTYPES: dict[int, str] = {
+    0: "?",  # dt_boolean
+    1: "u1",  # dt_byte
+    2: "<i2",  # dt_short
+    3: "<i4",  # dt_long
+    4: "<i8",  # dt_longlong
+    5: "<f4",  # ieeefloat4
+    6: "<f8",  # ieeefloat8
+    7: ">i2",  # dt_short_beo
+    8: ">i4",  # dt_long_beo
+    9: ">i8",  # dt_longlong_beo
+    10: ">f4",  # ieeefloat4_beo
+    11: ">f8",  # ieeefloat8_beo
+    19: "i1",  # dt_sbyte
+    21: "<u2",  # dt_ushort
+    22: ">u2",  # dt_ushort_beo
+    23: "<u4",  # dt_ulong
+    24: ">u4",  # dt_ulong_beo
+}
+"""Maps the `typespec_enum` values of fixed size numeric types to NumPy dtypes."""
+
+
+def component_values(
+    path: str,
+    type_specification: int,
+    length: int,
+    start_offset: int = 0,
+    block_size: int = 0,
+    values_per_block: int = 0,
+    value_offset: int = 0,
+    start: int = 0,
+    limit: int = 0,
+) -> np.ndarray:
+    """
+    Decode the values of an external component from a binary file using a memory mapped strided view.
+
+    The component starts at `start_offset` bytes and consists of blocks of `block_size` bytes.
+    Each block contains `values_per_block` consecutive values starting `value_offset` bytes after the block start.
+
+    Args:
+        path: Path of the binary file.
+        type_specification: `typespec_enum` value of the component. See `TYPESPEC_DTYPES`.
+        length: Number of values of the component.
+        start_offset: Byte offset of the first block in the file.
+        block_size: Size of a block in bytes. 0 means the values are stored consecutively.
+        values_per_block: Number of values of the component in each block. 0 means 1.
+        value_offset: Byte offset of the first value inside of each block.
+        start: Zero-based index of the first value to return.
+        limit: Maximum number of values to return. 0 means all remaining values.
+
+    Returns:
+        The values in native byte order. If the values are stored consecutively in native byte order
+        a read-only view of the memory mapped file is returned without copying.
+
+    Raises:
+        ValueError: If the type specification is not supported, e.g. strings or bit packed values.
+    """
+    dtype_name = TYPESPEC_DTYPES.get(int(type_specification))
+    if dtype_name is None:
+        raise ValueError(f"Type specification {type_specification} is not supported for local decoding.")
+    dtype = np.dtype(dtype_name)
+    end = min(length, start + limit) if limit > 0 else length
+    if end <= start:
+        return np.empty(0, dtype=dtype.newbyteorder("="))
+
+    values_per_block = max(values_per_block, 1)
+    mapped = np.memmap(path, dtype=np.uint8, mode="r")
+    if block_size <= 0 or block_size == values_per_block * dtype.itemsize:
+        consecutive: np.ndarray = np.ndarray(
+            shape=(end - start,),
+            dtype=dtype,
+            buffer=mapped,
+            offset=start_offset + value_offset + start * dtype.itemsize,
+        )
+        return consecutive.astype(dtype.newbyteorder("="), copy=False)
+
+    first_block = start // values_per_block
+    block_count = -(-end // values_per_block) - first_block
+    offset = start_offset + first_block * block_size + value_offset
+    # the file may end inside of the last block, so it is viewed separately with the values needed only
+    last_count = end - (first_block + block_count - 1) * values_per_block
+    blocks: np.ndarray = np.ndarray(
+        shape=(block_count - 1, values_per_block),
+        dtype=dtype,
+        buffer=mapped,
+        offset=offset,
+        strides=(block_size, dtype.itemsize),
+    )
+    last_block: np.ndarray = np.ndarray(
+        shape=(last_count,), dtype=dtype, buffer=mapped, offset=offset + (block_count - 1) * block_size
+    )
+    skip = start - first_block * values_per_block
+    values = np.concatenate([blocks.reshape(-1), last_block])[skip:] if block_count > 1 else last_block[skip:]
+    return values.astype(dtype.newbyteorder("="), copy=False)
+
+
+def physical_values(values: np.ndarray, sequence_representation: int, generation_parameters: Any, name: str) -> Any:
+    """
+    Calculate the physical values of a local column from the raw values of its external components.
+
+    Args:
+        values: Raw values read from the external components.
+        sequence_representation: `SeqRepEnum` of the local column. `external_component` values are returned unchanged.
+        generation_parameters: Generation parameters of the local column.
+        name: Name of the local column used in error messages.
+
+    Returns:
+        The physical values.
+
+    Raises:
+        ValueError: If the sequence representation or its generation parameters are not supported.
+    """
+    if sequence_representation == SeqRepEnum.external_component:
+        return values
+    parameters = np.asarray(generation_parameters if generation_parameters is not None else [], dtype=np.float64)
+    raw = values.astype(np.float64)
+    if sequence_representation == SeqRepEnum.raw_linear_external and len(parameters) >= 2:
+        return parameters[0] + parameters[1] * raw
+    if sequence_representation == SeqRepEnum.raw_linear_calibrated_external and len(parameters) >= 3:
+        return (parameters[0] + parameters[1] * raw) * parameters[2]
+    if sequence_representation == SeqRepEnum.raw_polynomial_external and len(parameters) >= 2:
+        # first parameter is the degree followed by the coefficients of ascending order
+        return np.polynomial.polynomial.polyval(raw, parameters[1 : int(parameters[0]) + 2])
+    if sequence_representation == SeqRepEnum.raw_rational_external and len(parameters) >= 6:
+        p1, p2, p3, p4, p5, p6 = parameters[:6]
+        return (p1 * raw**2 + p2 * raw + p3) / (p4 * raw**2 + p5 * raw + p6)
+    raise ValueError(
+        f"Sequence representation {SeqRepEnum(sequence_representation).name} with generation parameters "
+        f"{list(parameters)} is not supported for column '{name}'."
+    )
+
+
+class ExternalComponentReader:
+    """
+    Read local columns whose values are stored in external component files by decoding the files locally.
+
+    The ASAM ODS server is only asked for the external component metadata. The files are taken from a
+    locally mounted path if available, otherwise they are downloaded once using `file_access_download`
+    and decoded using memory mapping. This avoids the server reading the files and re-encoding their
+    content into protobuf.
+
+    Example::
+
+        from odsbox.bulk_external import ExternalComponentReader
+        from odsbox.con_i import ConI
+
+        with ConI(url="https://MYSERVER/api", auth=("USER", "PASSWORD")) as con_i:
+            reader = ExternalComponentReader(con_i, path_mapping={"file:///data/": "/mnt/ods/data/"})
+            df = reader.read_submatrix(1234, ["Time", "Co*"])
+
+    Remark: Flags stored in external files are not applied. Strings, bytestreams and bit packed values
+    are not supported and need to be read using `BulkReader`.
+    """
+
+    _log: logging.Logger = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        con_i: ConI,
+        download_folder: str | None = None,
+        path_mapping: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Create the reader.
+
+        Args:
+            con_i: Session to the ASAM ODS server.
+            download_folder: Folder to download files to that are not available locally.
+                If None a temporary folder is created when the first file is downloaded.
+            path_mapping: Maps prefixes of `filename_url` to local paths, e.g. to a mounted share.
+                `file` URLs not matching any prefix are used as local path if the file exists.
+        """
+        self.__con_i = con_i
+        self.__download_folder = download_folder
+        self.__path_mapping = path_mapping or {}
+        self.__paths: dict[str, str] = {}
+
+    def local_path(self, component_iid: int, filename_url: str) -> str:
+        """
+        Get the local path of an external component file. Each file is downloaded at most once.
+
+        Args:
+            component_iid: Id of an AoExternalComponent instance referencing the file.
+            filename_url: Value of the `filename_url` attribute of the instance.
+
+        Returns:
+            Path of the local file.
+
+        Raises:
+            requests.HTTPError: If the download fails.
+        """
+        path = self.__paths.get(filename_url)
+        if path is None:
+            path = self.__mapped_path(filename_url)
+            if path is None:
+                path = self.__download(component_iid, filename_url)
+            self.__paths[filename_url] = path
+        return path
+
+    def read_local_columns(
+        self,
+        localcolumn_jaquel_condition: dict[str, Any],
+        start: int = 0,
+        limit: int = 0,
+        calculate_raw: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Read local columns stored in external components.
+
+        Args:
+            localcolumn_jaquel_condition: Jaquel query condition for the local columns.
+            start: Zero-based index of the first value.
+            limit: Maximum number of values. 0 means all remaining values.
+            calculate_raw: Whether to calculate the physical values of `raw_*_external` sequence representations.
+
+        Returns:
+            A DataFrame with the columns `name`, `id`, `values`, `independent`, `sequence_representation`,
+            `generation_parameters`, `number_of_rows` and `unit`. Local columns not stored in external
+            components are skipped.
+
+        Raises:
+            ValueError: If a component uses a type specification that is not supported.
+        """
+        columns_df = self.__con_i.query(
+            {
+                "AoLocalColumn": localcolumn_jaquel_condition,
+                "$attributes": {
+                    "id": 1,
+                    "name": 1,
+                    "independent": 1,
+                    "sequence_representation": 1,
+                    "generation_parameters": 1,
+                    "submatrix.number_of_rows": 1,
+                    "measurement_quantity.unit": 1,
+                },
+            },
+            enum_as_string=False,
+            date_as_timestamp=False,
+        )
+        columns_df = columns_df.rename(
+            columns={"submatrix.number_of_rows": "number_of_rows", "measurement_quantity.unit": "unit"}
+        )
+        result_columns = [*columns_df.columns, "values"]
+        if columns_df.empty:
+            empty: pd.DataFrame = pd.DataFrame(columns=result_columns)
+            return empty
+
+        components_df = self.__con_i.query(
+            {
+                "AoExternalComponent": {"local_column": {"$in": [int(i) for i in columns_df["id"]]}},
+                "$attributes": {
+                    "id": 1,
+                    "local_column": 1,
+                    "ordinal_number": 1,
+                    "filename_url": 1,
+                    "value_type": 1,
+                    "component_length": 1,
+                    "start_offset": 1,
+                    "block_size": 1,
+                    "valuesperblock": 1,
+                    "value_offset": 1,
+                },
+            },
+            enum_as_string=False,
+            date_as_timestamp=False,
+        )
+        components_by_column = {
+            int(str(local_column)): group.sort_values("ordinal_number")
+            for local_column, group in components_df.groupby("local_column")
+        }
+
+        rows = []
+        for _, column in columns_df.iterrows():
+            components = components_by_column.get(int(column["id"]))
+            if components is None:
+                continue
+            values = self.__column_values(components, start, limit)
+            sequence_representation = int(column["sequence_representation"])
+            if calculate_raw:
+                values = physical_values(
+                    values, sequence_representation, column["generation_parameters"], str(column["name"])
+                )
+            rows.append({**column.to_dict(), "values": values})
+        rv: pd.DataFrame = pd.DataFrame(rows, columns=result_columns)
+        return rv
+
+    def read_submatrix(
+        self,
+        submatrix_iid: int,
+        column_patterns: list[str] | None = None,
+        column_patterns_case_insensitive: bool = False,
+        start: int = 0,
+        limit: int = 0,
+        calculate_raw: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Read the local columns of a submatrix that are stored in external components.
+
+        Args:
+            submatrix_iid: The ID of the submatrix.
+            column_patterns: List of column name patterns to filter the columns.
+                If None, all columns are loaded. `*?` is used as a wildcard.
+            column_patterns_case_insensitive: Whether to treat column name patterns as case insensitive.
+            start: Zero-based index of the first row.
+            limit: Maximum number of rows. 0 means all remaining rows.
+            calculate_raw: Whether to calculate the physical values of `raw_*_external` sequence representations.
+
+        Returns:
+            A DataFrame with one column per local column. ``df.attrs["unit_names"]`` maps the
+            column names to the unit names.
+        """
+        conditions: dict[str, Any] = {"submatrix": submatrix_iid}
+        BulkReader.add_column_filters(conditions, column_patterns, column_patterns_case_insensitive)
+        columns_df = self.read_local_columns(conditions, start=start, limit=limit, calculate_raw=calculate_raw)
+
+        rv: pd.DataFrame = pd.DataFrame(dict(zip(columns_df["name"], columns_df["values"])), copy=False)
+        unit_lookup = self.__con_i.bulk.unit_name_lookup() if not columns_df.empty else {}
+        rv.attrs["unit_names"] = {
+            name: unit_lookup.get(int(unit), "") if pd.notna(unit) else ""
+            for name, unit in zip(columns_df["name"], columns_df["unit"])
+        }
+        return rv
+
+    def __column_values(self, components: pd.DataFrame, start: int, limit: int) -> np.ndarray:
+        end = start + limit if limit > 0 else None
+        parts: list[np.ndarray] = []
+        offset = 0
+        for _, component in components.iterrows():
+            length = int(component["component_length"])
+            first = max(start - offset, 0)
+            last = length if end is None else min(end - offset, length)
+            if last > first:
+                parts.append(
+                    component_values(
+                        self.local_path(int(component["id"]), str(component["filename_url"])),
+                        int(component["value_type"]),
+                        length,
+                        start_offset=ExternalComponentReader.__int(component["start_offset"]),
+                        block_size=ExternalComponentReader.__int(component["block_size"]),
+                        values_per_block=ExternalComponentReader.__int(component["valuesperblock"]),
+                        value_offset=ExternalComponentReader.__int(component["value_offset"]),
+                        start=first,
+                        limit=last - first,
+                    )
+                )
+            offset += length
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    def __mapped_path(self, filename_url: str) -> str | None:
+        for prefix, local_prefix in self.__path_mapping.items():
+            if filename_url.startswith(prefix):
+                return os.path.join(local_prefix, filename_url[len(prefix) :])
+        parsed = urlparse(filename_url)
+        if parsed.scheme in ("", "file"):
+            path = unquote(parsed.path) if parsed.scheme == "file" else filename_url
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def __download(self, component_iid: int, filename_url: str) -> str:
+        if self.__download_folder is None:
+            self.__download_folder = tempfile.mkdtemp(prefix="odsbox_external_")
+        model_cache = self.__con_i.mc
+        entity = model_cache.entity_by_base_name("AoExternalComponent")
+        attribute = model_cache.attribute_by_base_name(entity, "filename_url")
+        target = os.path.join(
+            self.__download_folder,
+            f"{component_iid}_{os.path.basename(urlparse(filename_url).path) or 'component.bin'}",
+        )
+        self._log.info("Download external component file '%s' to '%s'.", filename_url, target)
+        path: str = self.__con_i.file_access_download(
+            ods.FileIdentifier(aid=entity.aid, iid=component_iid, attribute=attribute.name),
+            target,
+            overwrite_existing=True,
+        )
+        return path
+
+    @staticmethod
+    def __int(value: Any) -> int:
+        return int(value) if pd.notna(value) else 0
@@ -3,17 +3,29 @@
 from __future__ import annotations
 
 import logging
+import os
+import tempfile
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from enum import IntEnum
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
 import pandas as pd
 
+from odsbox.bulk_cache import BulkCache
+from odsbox.bulk_chunking import ChunkSizer
+from odsbox.bulk_decimation import Decimator
+from odsbox.bulk_export import EXPORT_FORMATS, write_chunks
+from odsbox.bulk_resample import RESAMPLE_METHODS, resample
 from odsbox.datamatrices_to_pandas import extract_column_unit_ids, to_pandas
+from odsbox.jaquel import Jaquel
 from odsbox.proto.ods_pb2 import (
     DataMatrices,
     ValueMatrixRequestStruct,
 )  # pylint: disable=E0611
+from odsbox.unit_cache import UnitCache
 
 if TYPE_CHECKING:
     from .con_i import ConI
@@ -65,30 +77,78 @@ class BulkReader:
     """
 
     _log: logging.Logger = logging.getLogger(__name__)
+    __QUERY_RESULT_COLUMNS: list[str] = [
+        "submatrix",
+        "name",
+        "id",
+        "values",
+        "independent",
+        "sequence_representation",
+        "generation_parameters",
+        "number_of_rows",
+    ]
+    __SEARCH_WINDOW_ROWS: int = 1024
+    MEMMAP_CHUNK_ROWS: int = 100_000
+    """Number of rows decoded at a time while values are written to the files of a `memmap_directory`."""
+    __CHUNK_SECONDS: float = 30.0
+    __COLUMN_STATS: tuple[str, ...] = ("min", "max", "mean", "std", "count", "count_nan")
 
     def __init__(self, con_i: ConI) -> None:
         """Initialize the BulkReader with a ConI instance."""
         self.__con_i = con_i
-        self._unit_name_lookup_cache: dict[int, str] | None = None
+        self.__cache: BulkCache | None = None
+        self.__unit_cache: UnitCache = UnitCache.default()
+
+    @property
+    def cache(self) -> BulkCache | None:
+        """
+        Get the on-disk cache used for local column values. Caching is disabled if None.
+
+        Example::
+
+            from odsbox.bulk_cache import BulkCache
+
+            con_i.bulk.cache = BulkCache("/data/odsbox_cache")
+        """
+        return self.__cache
+
+    @cache.setter
+    def cache(self, cache: BulkCache | None) -> None:
+        self.__cache = cache
+
+    @property
+    def unit_cache(self) -> UnitCache:
+        """
+        Get the cache the unit names are taken from. Defaults to the process wide `UnitCache.default()`.
+
+        Example::
+
+            from odsbox.unit_cache import UnitCache
+
+            con_i.bulk.unit_cache = UnitCache(ttl_seconds=600.0, directory="/data/odsbox_cache")
+        """
+        return self.__unit_cache
+
+    @unit_cache.setter
+    def unit_cache(self, unit_cache: UnitCache) -> None:
+        self.__unit_cache = unit_cache
 
     def unit_name_lookup(self, update: bool = False) -> dict[int, str]:
         """
         Get a mapping of unit id to unit name. This is used to cache the unit names for better readability of the data.
+        The names are taken from `unit_cache` on each call, so its expiry and invalidation apply.
 
         Args:
             update: If True, force update the cache.
 
         Returns:
-            A dictionary mapping unit id to unit name.
+            A dictionary mapping unit id to unit name. Empty if the units can not be loaded.
         """
-        if self._unit_name_lookup_cache is None or update:
-            try:
-                units_df = self.__con_i.query({"AoUnit": {}, "$attributes": {"id": 1, "name": 1}})
-                self._unit_name_lookup_cache = dict(zip(units_df["id"], units_df["name"]))
-            except Exception as e:
-                self._unit_name_lookup_cache = {}
-                self._log.warning(f"Failed to load unit names: {e}")
-        return self._unit_name_lookup_cache
+        try:
+            return self.__unit_cache.unit_names(self.__con_i, update)
+        except Exception as e:
+            self._log.warning(f"Failed to load unit names: {e}")
+            return {}
 
     @staticmethod
     def __apply_sequence_representation(
@@ -149,6 +209,17 @@ class BulkReader:
                     ]
                 else:
                     raise ValueError(f"Generation parameters missing for implicit_linear in column '{name}'.")
+            elif sequence_representation == SeqRepEnum.implicit_saw:
+                # generation parameters [start, increment, end] with end being the last value of a period
+                if len(vals) >= 3:
+                    p1, p2, p3 = vals[0], vals[1], vals[2]
+                    period = 1 if p2 == 0 else round((p3 - p1) / p2) + 1
+                    if period < 1:
+                        raise ValueError(f"Invalid generation parameters for implicit_saw in column '{name}'.")
+                    positions = np.arange(values_start, values_start + values_count) % period
+                    localcolumn_df.at[index, "values"] = p1 + positions * p2
+                else:
+                    raise ValueError(f"Generation parameters missing for implicit_saw in column '{name}'.")
             elif sequence_representation in [
                 SeqRepEnum.raw_linear,
                 SeqRepEnum.raw_linear_external,
@@ -208,10 +279,12 @@ class BulkReader:
         values_start: int = 0,
         values_limit: int = 0,
         calculate_raw: bool = True,
+        use_cache: bool = True,
     ) -> pd.DataFrame:
         """
         Query bulk data for local columns based on the provided Jaquel query condition.
         This method can be used to retrieve local columns bulk data based on a Jaquel query.
+        Metadata and values are retrieved using a single `data_read` call.
 
         Example::
 
@@ -236,9 +309,12 @@ class BulkReader:
             values_start: Zero-based starting index for the values to be processed. Used for chunk loading.
             values_limit: Maximum number of values to be retrieved in this chunk. 0 means all remaining values.
             calculate_raw: Whether to calculate raw values for certain raw sequence representations.
+            use_cache: If False, the `cache` is neither read nor filled, e.g. for small probe reads.
 
         Returns:
-            The Pandas DataFrame contains the local_column metadata and values as DataFrame columns.
+            The Pandas DataFrame contains the local_column metadata and values as DataFrame columns
+            `submatrix`, `name`, `id`, `values`, `independent`, `sequence_representation`,
+            `generation_parameters` and `number_of_rows`.
             ``df.attrs["unit_names"]`` is set to a ``dict[str, str]`` mapping each local column
             name to its unit name (empty string when the unit id is unknown or zero).
 
@@ -246,48 +322,62 @@ class BulkReader:
             requests.HTTPError: If access fails.
         """
 
-        lc_meta_df: pd.DataFrame = self.__con_i.query_data(
-            {
-                "AoLocalColumn": localcolumn_jaquel_condition,
-                "$attributes": {
-                    "id": 1,
-                    "name": 1,
-                    "independent": 1,
-                    "sequence_representation": 1,
-                    "submatrix": 1,
-                    "submatrix.number_of_rows": 1,
-                },
-                "$options": {"$rowlimit": row_limit},
-            }
-        )
-        lc_meta_df.columns = [
-            "id",
-            "name",
-            "independent",
-            "sequence_representation",
-            "submatrix",
-            "number_of_rows",
-        ]
-        lc_meta_df.set_index("id", inplace=True)
-
-        raw_seq_rep_values = {
-            SeqRepEnum.raw_linear.value,
-            SeqRepEnum.raw_polynomial.value,
-            SeqRepEnum.raw_linear_external.value,
-            SeqRepEnum.raw_polynomial_external.value,
-            SeqRepEnum.raw_linear_calibrated.value,
-            SeqRepEnum.raw_linear_calibrated_external.value,
-        }
-        contains_raw_seq_rep = lc_meta_df["sequence_representation"].dropna().astype(int).isin(raw_seq_rep_values).any()
+        if self.__cache is not None and use_cache:
+            localcolumn_df, unit_names = self.__read_localcolumns_cached(
+                self.__cache,
+                localcolumn_jaquel_condition,
+                date_as_timestamp=date_as_timestamp,
+                row_limit=row_limit,
+                values_start=values_start,
+                values_limit=values_limit,
+                calculate_raw=calculate_raw,
+            )
+        else:
+            # metadata and bulk are fetched in a single request to avoid evaluating the condition twice
+            localcolumn_df, unit_names = self.__read_localcolumns(
+                localcolumn_jaquel_condition,
+                include_values=True,
+                date_as_timestamp=date_as_timestamp,
+                row_limit=row_limit,
+                values_start=values_start,
+                values_limit=values_limit,
+            )
+            BulkReader.__apply_sequence_representation(
+                localcolumn_df,
+                values_start=values_start,
+                values_limit=values_limit,
+                calculate_raw=calculate_raw,
+            )
+
+        if localcolumn_df.empty:
+            return pd.DataFrame(columns=BulkReader.__QUERY_RESULT_COLUMNS)
+        rv = localcolumn_df[BulkReader.__QUERY_RESULT_COLUMNS]
+        self._attach_unit_attr(rv, rv["name"], unit_names)
 
+        return rv
+
+    def __read_localcolumns(
+        self,
+        localcolumn_jaquel_condition: dict[str, Any],
+        include_values: bool,
+        date_as_timestamp: bool,
+        row_limit: int,
+        values_start: int,
+        values_limit: int,
+    ) -> tuple[pd.DataFrame, list[str]]:
         attributes = {
             "id": 1,
-            "values": 1,
+            "name": 1,
+            "independent": 1,
+            "sequence_representation": 1,
+            "generation_parameters": 1,
+            "submatrix": 1,
+            "submatrix.number_of_rows": 1,
         }
-        if contains_raw_seq_rep:
-            attributes["generation_parameters"] = 1
-
-        localcolumn_bulk_dms = self.__con_i.data_read_jaquel(
+        if include_values:
+            attributes["values"] = 1
+        jaquel = Jaquel(
+            self.__con_i.model(),
             {
                 "AoLocalColumn": localcolumn_jaquel_condition,
                 "$attributes": attributes,
@@ -296,40 +386,102 @@ class BulkReader:
                     "$seqlimit": values_limit,
                     "$rowlimit": row_limit,
                 },
-            }
+            },
         )
-        unit_names = self._extract_unit_names(localcolumn_bulk_dms)
-        localcolumn_bulk_df = to_pandas(
-            localcolumn_bulk_dms,
+        localcolumn_dms = self.__con_i.data_read(jaquel.select_statement)
+        unit_names = self._extract_unit_names(localcolumn_dms) if include_values else []
+        localcolumn_df = to_pandas(
+            localcolumn_dms,
             date_as_timestamp=date_as_timestamp,
             prefer_np_array_for_unknown=True,
+            jaquel_conversion_result=jaquel,
         )
-        del localcolumn_bulk_dms  # free memory
-        localcolumn_bulk_df.columns = [attr for attr in attributes]
+        del localcolumn_dms  # free memory
+        localcolumn_df.rename(columns={"submatrix.number_of_rows": "number_of_rows"}, inplace=True)
+        return localcolumn_df, unit_names
 
-        # merge metadata into bulk, preserving bulk order (left join)
-        merged: pd.DataFrame = localcolumn_bulk_df.merge(lc_meta_df, left_on="id", right_index=True, how="left")
-
-        missing_meta_ids = merged[merged["name"].isna()]["id"].unique()
-        if len(missing_meta_ids):
-            raise KeyError(f"Missing metadata for ids: {sorted(missing_meta_ids)}.")
-
-        BulkReader.__apply_sequence_representation(
-            merged,
+    def __read_localcolumns_cached(
+        self,
+        cache: BulkCache,
+        localcolumn_jaquel_condition: dict[str, Any],
+        date_as_timestamp: bool,
+        row_limit: int,
+        values_start: int,
+        values_limit: int,
+        calculate_raw: bool,
+    ) -> tuple[pd.DataFrame, list[str]]:
+        """
+        Read metadata first and only retrieve the values not found in the cache.
+        Missing values are retrieved in a single request using their ids.
+        """
+        meta_df, _ = self.__read_localcolumns(
+            localcolumn_jaquel_condition,
+            include_values=False,
+            date_as_timestamp=date_as_timestamp,
+            row_limit=row_limit,
             values_start=values_start,
             values_limit=values_limit,
-            calculate_raw=calculate_raw,
         )
+        if meta_df.empty:
+            return meta_df, []
 
-        # Reorder columns to put submatrix, name, id, values as first four columns
-        desired_first_cols = ["submatrix", "name", "id", "values"]
-        existing_cols = merged.columns.tolist()
-        remaining_cols = [col for col in existing_cols if col not in desired_first_cols]
-        new_column_order = desired_first_cols + remaining_cols
-        merged = merged[new_column_order]
-        self._attach_unit_attr(merged, merged["name"], unit_names)
+        keys = [
+            BulkCache.key(
+                self.__con_i.url, int(lc_id), values_start, values_limit, calculate_raw, str(int(number_of_rows))
+            )
+            for lc_id, number_of_rows in zip(meta_df["id"], meta_df["number_of_rows"])
+        ]
+        values: list[Any] = [None] * len(keys)
+        unit_ids: list[int] = [0] * len(keys)
+        for index, key in enumerate(keys):
+            cached = cache.get(key)
+            if cached is not None:
+                values[index], unit_ids[index] = cached
+
+        missing = [index for index, vals in enumerate(values) if vals is None]
+        if missing:
+            missing_ids = [int(meta_df["id"].iloc[index]) for index in missing]
+            jaquel = Jaquel(
+                self.__con_i.model(),
+                {
+                    "AoLocalColumn": {"id": {"$in": missing_ids}},
+                    "$attributes": {"id": 1, "values": 1},
+                    "$options": {"$seqskip": values_start, "$seqlimit": values_limit},
+                },
+            )
+            bulk_dms = self.__con_i.data_read(jaquel.select_statement)
+            bulk_unit_ids = extract_column_unit_ids(bulk_dms)
+            bulk_df = to_pandas(
+                bulk_dms,
+                date_as_timestamp=date_as_timestamp,
+                prefer_np_array_for_unknown=True,
+                jaquel_conversion_result=jaquel,
+            )
+            del bulk_dms  # free memory
+            bulk_lookup = {
+                int(lc_id): (vals, unit_id)
+                for lc_id, vals, unit_id in zip(bulk_df["id"], bulk_df["values"], bulk_unit_ids or [0] * len(bulk_df))
+            }
+            not_delivered = sorted(set(missing_ids) - bulk_lookup.keys())
+            if not_delivered:
+                raise KeyError(f"Missing bulk for ids: {not_delivered}.")
+
+            missing_df = meta_df.iloc[missing].copy()
+            missing_df["values"] = pd.Series([bulk_lookup[lc_id][0] for lc_id in missing_ids], index=missing_df.index)
+            BulkReader.__apply_sequence_representation(
+                missing_df,
+                values_start=values_start,
+                values_limit=values_limit,
+                calculate_raw=calculate_raw,
+            )
+            for index, lc_id, vals in zip(missing, missing_ids, missing_df["values"]):
+                values[index] = vals
+                unit_ids[index] = bulk_lookup[lc_id][1]
+                cache.put(keys[index], np.asarray(vals), unit_ids[index])
 
-        return merged
+        meta_df["values"] = pd.Series(values, index=meta_df.index, dtype=object)
+        unit_id_lookup = self.unit_name_lookup()
+        return meta_df, [unit_id_lookup.get(unit_id, "") for unit_id in unit_ids]
 
     def data_read(
         self,
@@ -340,6 +492,8 @@ class BulkReader:
         set_independent_as_index: bool = True,
         values_start: int = 0,
         values_limit: int = 0,
+        memmap_directory: str | None = None,
+        independent_range: tuple[Any, Any] | None = None,
     ) -> pd.DataFrame:
         """
         Loads an ASAM ODS SubMatrix and returns it as a pandas DataFrame. The method uses the HTTP API method
@@ -365,6 +519,17 @@ class BulkReader:
             set_independent_as_index: Whether to set the independent column as the index.
             values_start: Zero-based starting index for the values to be processed. Used for chunk loading.
             values_limit: Maximum number of values to be retrieved in this chunk. 0 means all remaining values.
+            memmap_directory: If given, numeric columns are written to `.npy` files with unique names
+                starting with `<local column id>_<values_start>_` in this directory and the returned DataFrame
+                is backed by read only memory maps of these files. The values are read in chunks of
+                `MEMMAP_CHUNK_ROWS` rows streamed into the files, so the data can be larger than RAM.
+                The files can be shared with other processes using ``np.load(path, mmap_mode="r")``
+                and have to be removed by the caller.
+            independent_range: Closed interval `(start, end)` of independent values to load, e.g. `(120.0, 180.0)`
+                to only load the rows between 120 s and 180 s. The matching rows are determined from the
+                generation parameters for `implicit_linear` independent columns or using a binary search with
+                small probe reads for explicit monotonic increasing independent columns. Can not be combined
+                with `values_start` and `values_limit`.
 
         Returns:
             The Pandas DataFrame contains one column per local column, named after the local
@@ -375,18 +540,35 @@ class BulkReader:
             requests.HTTPError: If access fails.
         """
 
+        if independent_range is not None:
+            if values_start != 0 or values_limit != 0:
+                raise ValueError("independent_range can not be combined with values_start or values_limit.")
+            values_start, values_limit = self._independent_window(submatrix_iid, *independent_range)
+
         conditions = {"submatrix": submatrix_iid}
         BulkReader.add_column_filters(conditions, column_patterns, column_patterns_case_insensitive)
 
-        localcolumn_df = self.query(
-            localcolumn_jaquel_condition=conditions,
-            date_as_timestamp=date_as_timestamp,
-            values_start=values_start,
-            values_limit=values_limit,
-        )
+        def read_chunk(start: int, limit: int) -> pd.DataFrame:
+            return self.query(
+                localcolumn_jaquel_condition=conditions,
+                date_as_timestamp=date_as_timestamp,
+                values_start=start,
+                values_limit=limit,
+            )
 
         # Create DataFrame from column data
-        rv = pd.DataFrame({r["name"]: r["values"] for _, r in localcolumn_df.iterrows()})
+        if memmap_directory is not None:
+            localcolumn_df, rv = self.__read_memmapped(
+                submatrix_iid,
+                values_start,
+                values_limit,
+                memmap_directory,
+                read_chunk,
+                lambda first: [f"{local_column_id}_{values_start}_" for local_column_id in first["id"].to_numpy()],
+            )
+        else:
+            localcolumn_df = read_chunk(values_start, values_limit)
+            rv = BulkReader.__to_frame(localcolumn_df["name"].to_numpy(), localcolumn_df["values"].to_numpy())
         rv.attrs["unit_names"] = localcolumn_df.attrs.get("unit_names", {})
 
         # Set independent column as index if requested
@@ -398,6 +580,621 @@ class BulkReader:
 
         return rv
 
+    def data_read_chunks(
+        self,
+        submatrix_iid: int,
+        column_patterns: list[str] | None = None,
+        chunk_rows: int = 100_000,
+        column_patterns_case_insensitive: bool = False,
+        date_as_timestamp: bool = True,
+        set_independent_as_index: bool = True,
+        memory_budget_bytes: int | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Loads an ASAM ODS SubMatrix in chunks of rows using `data_read` with `values_start`
+        and `values_limit`. Only a single chunk needs to be kept in memory.
+
+        If `memory_budget_bytes` is given, the chunk rows are derived from the data types of the
+        columns and adjusted after each chunk from its observed size and duration (see `ChunkSizer`).
+
+        Example::
+
+            from odsbox.con_i import ConI
+
+            with ConI(
+                url="https://MYSERVER/api",
+                auth=("USER", "PASSWORD"),
+            ) as con_i:
+                submatrix_id = 1234
+                for df in con_i.bulk.data_read_chunks(submatrix_id, ["Time", "Co*"], chunk_rows=50_000):
+                    print(df.shape)
+
+        Args:
+            submatrix_iid: The ID of the submatrix to load.
+            column_patterns: List of column name patterns to filter the columns.
+                If None, all columns are loaded. `*?` is used as a wildcard.
+            chunk_rows: Number of rows retrieved per chunk.
+            column_patterns_case_insensitive: Whether to treat column name patterns as case insensitive.
+            date_as_timestamp: Whether to treat date columns as timestamps.
+            set_independent_as_index: Whether to set the independent column as the index.
+            memory_budget_bytes: Memory a chunk may use while it is read. If given, `chunk_rows` is ignored.
+
+        Returns:
+            An iterator of DataFrames as returned by `data_read`. At least one, possibly empty,
+            DataFrame is returned so the columns are always known.
+
+        Raises:
+            requests.HTTPError: If access fails.
+            ValueError: If chunk_rows or memory_budget_bytes is not positive.
+        """
+        if chunk_rows <= 0:
+            raise ValueError(f"chunk_rows must be positive, got {chunk_rows}.")
+        number_of_rows = self._submatrix_number_of_rows(submatrix_iid)
+        sizer = (
+            self.__chunk_sizer(
+                submatrix_iid, column_patterns, column_patterns_case_insensitive, memory_budget_bytes, number_of_rows
+            )
+            if memory_budget_bytes is not None
+            else None
+        )
+        values_start = 0
+        while True:
+            values_limit = sizer.rows if sizer is not None else chunk_rows
+            started = time.perf_counter()
+            df = self.data_read(
+                submatrix_iid,
+                column_patterns=column_patterns,
+                column_patterns_case_insensitive=column_patterns_case_insensitive,
+                date_as_timestamp=date_as_timestamp,
+                set_independent_as_index=set_independent_as_index,
+                values_start=values_start,
+                values_limit=values_limit,
+            )
+            if sizer is not None:
+                sizer.observe(df.shape[0], BulkReader.__frame_bytes(df), time.perf_counter() - started)
+            yield df
+            values_start += values_limit
+            if values_start >= number_of_rows:
+                break
+
+    def column_stats(
+        self,
+        submatrix_iid: int,
+        column_patterns: list[str] | None = None,
+        stats: tuple[str, ...] = ("min", "max", "mean", "std", "count_nan"),
+        chunk_rows: int = 1_000_000,
+        column_patterns_case_insensitive: bool = False,
+        memory_budget_bytes: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Computes statistics of the numeric channels of an ASAM ODS SubMatrix in a single streaming pass.
+        The values are read in chunks of `chunk_rows` rows. Each chunk is reduced using NumPy and merged
+        into running results (Chan et al. parallel variance), so the submatrix is never loaded completely.
+
+        Example::
+
+            from odsbox.con_i import ConI
+
+            with ConI(
+                url="https://MYSERVER/api",
+                auth=("USER", "PASSWORD"),
+            ) as con_i:
+                submatrix_id = 1234
+                stats_df = con_i.bulk.column_stats(submatrix_id, ["Co*"], stats=("min", "max", "count_nan"))
+
+        Args:
+            submatrix_iid: The ID of the submatrix to analyze.
+            column_patterns: List of column name patterns to filter the columns.
+                If None, all columns are analyzed. `*?` is used as a wildcard.
+            stats: Statistics to compute. Supported are `min`, `max`, `mean`, `std` (sample standard
+                deviation like `pandas.DataFrame.std`), `count` (number of values that are not NaN)
+                and `count_nan`. NaN values are ignored by all other statistics.
+            chunk_rows: Number of rows retrieved per chunk.
+            column_patterns_case_insensitive: Whether to treat column name patterns as case insensitive.
+            memory_budget_bytes: Memory a chunk may use while it is read. If given, `chunk_rows` is ignored.
+                See `data_read_chunks`.
+
+        Returns:
+            A DataFrame with one row per numeric channel, indexed by channel name, and one column per statistic.
+            ``df.attrs["unit_names"]`` maps channel names to unit names. Non numeric channels are skipped.
+
+        Raises:
+            requests.HTTPError: If access fails.
+            ValueError: If a statistic is unknown or chunk_rows is not positive.
+        """
+        unknown = [stat for stat in stats if stat not in BulkReader.__COLUMN_STATS]
+        if unknown:
+            raise ValueError(f"Unknown statistics {unknown}. Use any of {list(BulkReader.__COLUMN_STATS)}.")
+
+        names: list[str] | None = None
+        unit_names: dict[str, str] = {}
+        count = minimum = maximum = mean = m2 = count_nan = np.empty(0)
+        for chunk in self.data_read_chunks(
+            submatrix_iid,
+            column_patterns=column_patterns,
+            chunk_rows=chunk_rows,
+            column_patterns_case_insensitive=column_patterns_case_insensitive,
+            set_independent_as_index=False,
+            memory_budget_bytes=memory_budget_bytes,
+        ):
+            if names is None:
+                names = [str(name) for name, dtype in chunk.dtypes.items() if dtype.kind in "biuf"]
+                unit_names = {name: chunk.attrs.get("unit_names", {}).get(name, "") for name in names}
+                count, m2, count_nan = np.zeros(len(names)), np.zeros(len(names)), np.zeros(len(names), np.int64)
+                minimum, maximum, mean = np.full(len(names), np.nan), np.full(len(names), np.nan), np.zeros(len(names))
+            if chunk.shape[0] == 0 or not names:
+                continue
+
+            values = chunk[names].to_numpy(dtype=np.float64)
+            nan_mask = np.isnan(values)
+            chunk_count_nan = nan_mask.sum(axis=0)
+            chunk_count = values.shape[0] - chunk_count_nan
+            with np.errstate(invalid="ignore", divide="ignore"):
+                chunk_mean = np.where(chunk_count > 0, np.nansum(values, axis=0) / chunk_count, 0.0)
+            chunk_m2 = np.nansum((values - chunk_mean) ** 2, axis=0)
+
+            # merge chunk into the running results
+            total = count + chunk_count
+            delta = chunk_mean - mean
+            with np.errstate(invalid="ignore", divide="ignore"):
+                weight = np.where(total > 0, chunk_count / total, 0.0)
+            mean = mean + delta * weight
+            m2 = m2 + chunk_m2 + delta**2 * count * weight
+            count = total
+            count_nan = count_nan + chunk_count_nan
+            minimum = np.fmin(minimum, np.fmin.reduce(values, axis=0))
+            maximum = np.fmax(maximum, np.fmax.reduce(values, axis=0))
+
+        names = names or []
+        with np.errstate(invalid="ignore", divide="ignore"):
+            results = {
+                "min": minimum,
+                "max": maximum,
+                "mean": np.where(count > 0, mean, np.nan),
+                "std": np.where(count > 1, np.sqrt(m2 / (count - 1)), np.nan),
+                "count": count.astype(np.int64),
+                "count_nan": count_nan,
+            }
+        rv = pd.DataFrame({stat: results[stat] for stat in stats}, index=pd.Index(names, name="name"))
+        rv.attrs["unit_names"] = unit_names
+        return rv
+
+    def data_read_decimated(
+        self,
+        submatrix_iid: int,
+        column_patterns: list[str] | None = None,
+        points: int = 2000,
+        method: str = "minmax",
+        chunk_rows: int = 1_000_000,
+        preview_chunks: int = 0,
+        column_patterns_case_insensitive: bool = False,
+        date_as_timestamp: bool = True,
+    ) -> dict[str, pd.Series]:
+        """
+        Loads the numeric channels of an ASAM ODS SubMatrix reduced to a fixed number of points for plotting.
+        The values are read in chunks using `values_start` and `values_limit` and decimated chunk by chunk,
+        so memory is bounded by the chunk size independent of the length of the channels.
+
+        Example::
+
+            from odsbox.con_i import ConI
+
+            with ConI(
+                url="https://MYSERVER/api",
+                auth=("USER", "PASSWORD"),
+            ) as con_i:
+                submatrix_id = 1234
+                preview = con_i.bulk.data_read_decimated(submatrix_id, ["Time", "Co*"], points=1000, preview_chunks=4)
+                series = con_i.bulk.data_read_decimated(submatrix_id, ["Time", "Co*"], points=1000)
+                series["Coolant"].plot()
+
+        Args:
+            submatrix_iid: The ID of the submatrix to load.
+            column_patterns: List of column name patterns to filter the columns.
+                If None, all columns are loaded. `*?` is used as a wildcard.
+            points: Maximum number of points returned per channel. Channels with fewer rows are returned completely.
+            method: `minmax` keeps minimum and maximum of each bucket of rows, `lttb` uses
+                Largest-Triangle-Three-Buckets to keep the visual shape. See `odsbox.bulk_decimation.Decimator`.
+            chunk_rows: Number of rows retrieved per request.
+            preview_chunks: If greater than 0, only this number of evenly spaced chunks is read and decimated.
+                This gives a fast but approximate overview of long channels for interactive use.
+            column_patterns_case_insensitive: Whether to treat column name patterns as case insensitive.
+            date_as_timestamp: Whether to treat date columns as timestamps.
+
+        Returns:
+            A dictionary mapping channel name to a Series of the selected values. The Series is indexed by
+            the independent values if the submatrix has exactly one independent column, otherwise by the
+            row number. ``series.attrs["unit_name"]`` contains the unit name. Non numeric channels are skipped.
+
+        Raises:
+            requests.HTTPError: If access fails.
+            ValueError: If chunk_rows is not positive or method or points are invalid.
+        """
+        if chunk_rows <= 0:
+            raise ValueError(f"chunk_rows must be positive, got {chunk_rows}.")
+        number_of_rows = self._submatrix_number_of_rows(submatrix_iid)
+
+        chunk_count = -(-number_of_rows // chunk_rows)
+        if 0 < preview_chunks < chunk_count:
+            starts = [int(start) for start in np.round(np.linspace(0, number_of_rows - chunk_rows, preview_chunks))]
+        else:
+            starts = list(range(0, max(number_of_rows, 1), chunk_rows))
+
+        decimators: dict[str, Decimator] = {}
+        unit_names: dict[str, str] = {}
+        index_name: str | None = None
+        for values_start in starts:
+            df = self.data_read(
+                submatrix_iid,
+                column_patterns=column_patterns,
+                column_patterns_case_insensitive=column_patterns_case_insensitive,
+                date_as_timestamp=date_as_timestamp,
+                values_start=values_start,
+                values_limit=chunk_rows,
+            )
+            if not decimators:
+                unit_names = df.attrs.get("unit_names", {})
+                index_name = None if isinstance(df.index, pd.RangeIndex) else str(df.index.name)
+                for name, dtype in df.dtypes.items():
+                    if dtype.kind in "biuf":
+                        decimators[str(name)] = Decimator(number_of_rows, points, method)
+                    else:
+                        self._log.debug("Skipping non numeric column '%s' for decimation", name)
+            rows = np.arange(values_start, values_start + df.shape[0], dtype=np.int64)
+            x = rows if index_name is None else df.index.to_numpy()
+            for name, decimator in decimators.items():
+                decimator.add(rows, x, df[name].to_numpy())
+
+        rv: dict[str, pd.Series] = {}
+        for name, decimator in decimators.items():
+            _, x, y = decimator.finish()
+            series = pd.Series(y, index=pd.Index(x, name=index_name), name=name)
+            series.attrs["unit_name"] = unit_names.get(name, "")
+            rv[name] = series
+        return rv
+
+    def export(
+        self,
+        iid: int,
+        path: str,
+        format: str = "parquet",
+        chunk_rows: int = 100_000,
+        column_patterns: list[str] | None = None,
+        column_patterns_case_insensitive: bool = False,
+        is_measurement: bool = False,
+        memory_budget_bytes: int | None = None,
+    ) -> list[str]:
+        """
+        Export a SubMatrix or all SubMatrices of a Measurement to Parquet, Arrow IPC or HDF5 files.
+        The data is streamed from the server in chunks which are written as row groups, record batches
+        or table appends. Peak memory is about one chunk instead of the whole submatrix.
+
+        Example::
+
+            from odsbox.con_i import ConI
+
+            with ConI(
+                url="https://MYSERVER/api",
+                auth=("USER", "PASSWORD"),
+            ) as con_i:
+                con_i.bulk.export(1234, "/archive/1234.parquet", chunk_rows=500_000)
+                con_i.bulk.export(4711, "/archive/4711", format="arrow", is_measurement=True)
+
+        Remark: Parquet and Arrow need `pyarrow`, HDF5 needs `tables`. Both are installed with
+        ``pip install odsbox[export]``. The unit names are stored as column metadata.
+
+        Args:
+            iid: The ID of the submatrix or measurement to export.
+            path: Target file. If `is_measurement` is True, a folder that will contain one file
+                per submatrix named `<submatrix id>.<parquet|arrow|h5>`.
+            format: One of `parquet`, `arrow` or `hdf5`.
+            chunk_rows: Number of rows retrieved and written per chunk.
+            column_patterns: List of column name patterns to filter the columns.
+                If None, all columns are loaded. `*?` is used as a wildcard.
+            column_patterns_case_insensitive: Whether to treat column name patterns as case insensitive.
+            is_measurement: Whether `iid` identifies a measurement instead of a submatrix.
+            memory_budget_bytes: Memory a chunk may use while it is read. If given, `chunk_rows` is ignored.
+                See `data_read_chunks`.
+
+        Returns:
+            The paths of the written files.
+
+        Raises:
+            requests.HTTPError: If access fails.
+            ValueError: If the format is unknown.
+            ImportError: If the packages needed for the format are not installed.
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{format}'. Use one of {list(EXPORT_FORMATS)}.")
+
+        targets: list[tuple[int, str]] = []
+        if is_measurement:
+            os.makedirs(path, exist_ok=True)
+            for submatrix_iid in self._measurement_submatrix_iids(iid):
+                targets.append((submatrix_iid, os.path.join(path, f"{submatrix_iid}{EXPORT_FORMATS[format]}")))
+        else:
+            targets.append((iid, path))
+
+        for submatrix_iid, target_path in targets:
+            row_count = write_chunks(
+                self.data_read_chunks(
+                    submatrix_iid,
+                    column_patterns=column_patterns,
+                    chunk_rows=chunk_rows,
+                    column_patterns_case_insensitive=column_patterns_case_insensitive,
+                    set_independent_as_index=False,
+                    memory_budget_bytes=memory_budget_bytes,
+                ),
+                target_path,
+                format=format,
+            )
+            self._log.debug("Exported %s rows of submatrix %s to '%s'", row_count, submatrix_iid, target_path)
+
+        return [target_path for _, target_path in targets]
+
+    def read_measurement(
+        self,
+        measurement_iid: int,
+        column_patterns: list[str] | None = None,
+        column_patterns_case_insensitive: bool = False,
+        date_as_timestamp: bool = True,
+        set_independent_as_index: bool = True,
+        max_workers: int = 4,
+        concatenate: bool = False,
+        memmap_directory: str | None = None,
+    ) -> dict[int, pd.DataFrame] | pd.DataFrame:
+        """
+        Loads all SubMatrices of an ASAM ODS Measurement. The submatrices are determined once
+        and their local columns are fetched concurrently using `data_read`.
+
+        Example::
+
+            from odsbox.con_i import ConI
+
+            with ConI(
+                url="https://MYSERVER/api",
+                auth=("USER", "PASSWORD"),
+            ) as con_i:
+                measurement_id = 4711
+                frames = con_i.bulk.read_measurement(measurement_id, ["Time", "Co*"], max_workers=8)
+
+        Remark: The requests are sent in parallel over the connection pool of the ConI session.
+        The default `requests` adapter keeps up to 10 connections per host, so higher values
+        for `max_workers` need a custom session with a bigger pool.
+
+        Args:
+            measurement_iid: The ID of the measurement to load.
+            column_patterns: List of column name patterns to filter the columns.
+                If None, all columns are loaded. `*?` is used as a wildcard.
+            column_patterns_case_insensitive: Whether to treat column name patterns as case insensitive.
+            date_as_timestamp: Whether to treat date columns as timestamps.
+            set_independent_as_index: Whether to set the independent column as the index.
+            max_workers: Maximum number of submatrices loaded in parallel. 1 loads them sequentially.
+            concatenate: If True, a single DataFrame is returned. Its index is extended by
+                a first level `submatrix` containing the submatrix id.
+            memmap_directory: If given, the frames are backed by memory mapped files in this
+                directory. See `data_read`.
+
+        Returns:
+            A dictionary mapping submatrix id to the DataFrame returned by `data_read`, ordered by
+            submatrix id. If `concatenate` is True, the frames are combined into a single DataFrame.
+            ``df.attrs["unit_names"]`` of the combined frame contains the units of all submatrices.
+
+        Raises:
+            requests.HTTPError: If access fails.
+        """
+        submatrix_iids = self._measurement_submatrix_iids(measurement_iid)
+
+        # fill the unit cache before spreading work to threads
+        self.unit_name_lookup()
+
+        def _read(submatrix_iid: int) -> pd.DataFrame:
+            return self.data_read(
+                submatrix_iid,
+                column_patterns=column_patterns,
+                column_patterns_case_insensitive=column_patterns_case_insensitive,
+                date_as_timestamp=date_as_timestamp,
+                set_independent_as_index=set_independent_as_index,
+                memmap_directory=memmap_directory,
+            )
+
+        if max_workers > 1 and len(submatrix_iids) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(submatrix_iids))) as executor:
+                frames = list(executor.map(_read, submatrix_iids))
+        else:
+            frames = [_read(submatrix_iid) for submatrix_iid in submatrix_iids]
+
+        rv = dict(zip(submatrix_iids, frames))
+        if not concatenate:
+            return rv
+
+        if not frames:
+            return pd.DataFrame()
+        combined = pd.concat(frames, keys=submatrix_iids, names=["submatrix"])
+        unit_names: dict[str, str] = {}
+        for frame in frames:
+            unit_names.update(frame.attrs.get("unit_names", {}))
+        combined.attrs["unit_names"] = unit_names
+        return combined
+
+    def read_aligned(
+        self,
+        channels: dict[int, list[str] | None],
+        rate_or_index: float | Sequence[Any] | np.ndarray | pd.Index,
+        method: str = "nearest",
+        max_workers: int = 4,
+        column_patterns_case_insensitive: bool = False,
+        date_as_timestamp: bool = True,
+        independent_range: tuple[Any, Any] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Loads channels of several SubMatrices and resamples them onto a common independent axis.
+        The submatrices are loaded concurrently. All channels of a submatrix are resampled at once
+        using vectorized NumPy operations, see `odsbox.bulk_resample.resample`.
+
+        If the extent of the common axis is known up front, because `rate_or_index` contains its values or
+        `independent_range` is given, only the rows overlapping it and one neighbouring row on each side are
+        read. The window is determined like for `data_read` with `independent_range`, which requires
+        increasing independent columns. Otherwise all rows are read.
+
+        Example::
+
+            from odsbox.con_i import ConI
+
+            with ConI(
+                url="https://MYSERVER/api",
+                auth=("USER", "PASSWORD"),
+            ) as con_i:
+                # 100 Hz grid covering both submatrices
+                df = con_i.bulk.read_aligned({1234: ["Speed"], 1235: ["Co*"]}, 100.0, method="linear")
+                speed = df[(1234, "Speed")]
+
+        Args:
+            channels: Maps submatrix id to a list of column name patterns. None loads all columns.
+                `*?` is used as a wildcard. The independent column of each submatrix is always loaded
+                and used as source axis.
+            rate_or_index: Either a sampling rate or the independent values of the common axis. A rate is given
+                in samples per unit of the independent columns, for timestamps in samples per second. The grid
+                starts at the smallest first independent value and ends at the largest last one unless
+                `independent_range` is given.
+            method: `nearest`, `linear` or `zoh` (zero order hold). Values outside of the range of a
+                submatrix are NaN.
+            max_workers: Maximum number of submatrices loaded in parallel. 1 loads them sequentially.
+            column_patterns_case_insensitive: Whether to treat column name patterns as case insensitive.
+            date_as_timestamp: Whether to treat date columns as timestamps.
+            independent_range: Closed interval `(start, end)` the common axis is limited to, e.g. `(120.0, 180.0)`.
+                A rate grid starts at `start`, values of an explicit index outside of it are dropped.
+
+        Returns:
+            A DataFrame indexed by the common axis. Its columns are a MultiIndex of submatrix id and channel
+            name. ``df.attrs["unit_names"]`` maps these tuples to unit names. Non numeric channels are skipped.
+
+        Raises:
+            requests.HTTPError: If access fails.
+            ValueError: If a submatrix has not exactly one independent column, the rate is not positive
+                or the method is unknown.
+        """
+        if method not in RESAMPLE_METHODS:
+            raise ValueError(f"Unknown resample method '{method}'. Use one of {list(RESAMPLE_METHODS)}.")
+        submatrix_iids = list(channels)
+        index: np.ndarray | None = None
+        if not np.isscalar(rate_or_index):
+            index = np.asarray(rate_or_index)
+            if independent_range is not None:
+                index = index[(index >= independent_range[0]) & (index <= independent_range[1])]
+            if len(index) > 0:
+                independent_range = (index.min(), index.max())
+
+        # fill the unit cache before spreading work to threads
+        self.unit_name_lookup()
+
+        def _read(submatrix_iid: int) -> pd.DataFrame:
+            conditions: dict[str, Any] = {"submatrix": submatrix_iid}
+            BulkReader.add_column_filters(conditions, channels[submatrix_iid], column_patterns_case_insensitive)
+            if len(conditions) > 1:
+                name_conditions = {key: value for key, value in conditions.items() if key != "submatrix"}
+                conditions = {"submatrix": submatrix_iid, "$or": [name_conditions, {"independent": 1}]}
+            values_start = values_limit = 0
+            if independent_range is not None:
+                start, end, number_of_rows = self.__independent_rows(submatrix_iid, *independent_range)
+                # the neighbouring rows are needed to resample at the borders of the window
+                values_start = max(start - 1, 0)
+                values_limit = min(end + 1, number_of_rows) - values_start
+                if values_limit <= 0:
+                    values_start = values_limit = 0
+            return self.query(
+                conditions, date_as_timestamp=date_as_timestamp, values_start=values_start, values_limit=values_limit
+            )
+
+        if max_workers > 1 and len(submatrix_iids) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(submatrix_iids))) as executor:
+                localcolumn_dfs = list(executor.map(_read, submatrix_iids))
+        else:
+            localcolumn_dfs = [_read(submatrix_iid) for submatrix_iid in submatrix_iids]
+
+        sources: list[tuple[int, np.ndarray, list[str], list[np.ndarray], dict[str, str]]] = []
+        for submatrix_iid, localcolumn_df in zip(submatrix_iids, localcolumn_dfs):
+            independent_mask = localcolumn_df["independent"].fillna(0).astype(bool).to_numpy()
+            if independent_mask.sum() != 1:
+                raise ValueError(
+                    f"SubMatrix {submatrix_iid} needs exactly one independent column, found {independent_mask.sum()}."
+                )
+            x = np.asarray(localcolumn_df["values"].to_numpy()[independent_mask][0])
+            order = None if np.all(x[1:] >= x[:-1]) else np.argsort(x, kind="stable")
+            names: list[str] = []
+            columns: list[np.ndarray] = []
+            for name, values in zip(
+                localcolumn_df["name"].to_numpy()[~independent_mask],
+                localcolumn_df["values"].to_numpy()[~independent_mask],
+            ):
+                values = np.asarray(values)
+                if values.dtype.kind not in "biuf" or len(values) != len(x):
+                    self._log.debug("Skipping column '%s' of SubMatrix %s for alignment", name, submatrix_iid)
+                    continue
+                names.append(str(name))
+                columns.append(values if order is None else values[order])
+            sources.append(
+                (
+                    submatrix_iid,
+                    x if order is None else x[order],
+                    names,
+                    columns,
+                    localcolumn_df.attrs.get("unit_names", {}),
+                )
+            )
+
+        target = BulkReader.__aligned_axis(
+            [source[1] for source in sources], rate_or_index if index is None else index, independent_range
+        )
+        blocks: list[np.ndarray] = []
+        keys: list[tuple[int, str]] = []
+        unit_names: dict[tuple[int, str], str] = {}
+        for submatrix_iid, x, names, columns, source_unit_names in sources:
+            if not names:
+                continue
+            blocks.append(resample(x, np.column_stack(columns), target, method))
+            for name in names:
+                keys.append((submatrix_iid, name))
+                unit_names[(submatrix_iid, name)] = source_unit_names.get(name, "")
+
+        rv = pd.DataFrame(
+            np.hstack(blocks) if blocks else np.empty((len(target), 0)),
+            index=pd.Index(target),
+            columns=pd.MultiIndex.from_tuples(keys, names=["submatrix", "name"]),
+            copy=False,
+        )
+        rv.attrs["unit_names"] = unit_names
+        return rv
+
+    @staticmethod
+    def __aligned_axis(
+        independents: list[np.ndarray],
+        rate_or_index: float | Sequence[Any] | np.ndarray | pd.Index,
+        independent_range: tuple[Any, Any] | None,
+    ) -> np.ndarray:
+        """Create the common independent axis from a rate or explicit values."""
+        if not np.isscalar(rate_or_index):
+            return np.asarray(rate_or_index)
+        rate = float(rate_or_index)  # type: ignore[arg-type]
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}.")
+        if independent_range is not None:
+            start, end = independent_range
+            if start > end:
+                return np.empty(0)
+        else:
+            independents = [x for x in independents if len(x) > 0]
+            if not independents:
+                return np.empty(0)
+            start = min(x[0] for x in independents)
+            end = max(x[-1] for x in independents)
+        if np.asarray(start).dtype.kind == "M":
+            step = np.timedelta64(int(round(1e9 / rate)), "ns")
+            return np.asarray(start, dtype="datetime64[ns]") + step * np.arange(int((end - start) // step) + 1)
+        # small tolerance to keep the end point despite floating point errors
+        steps = (end - start) * rate
+        return start + np.arange(int(np.floor(steps + 1e-9 * max(1.0, abs(steps)))) + 1) / rate
+
     def valuematrix_read(
         self,
         submatrix_iid: int,
@@ -405,6 +1202,7 @@ class BulkReader:
         date_as_timestamp: bool = True,
         values_start: int = 0,
         values_limit: int = 0,
+        memmap_directory: str | None = None,
     ) -> pd.DataFrame:
         """
         Loads an ASAM ODS SubMatrix and returns it as a pandas DataFrame.
@@ -427,6 +1225,9 @@ class BulkReader:
             date_as_timestamp: Whether to treat date columns as timestamps.
             values_start: Zero-based starting index for the values to be processed. Used for chunk loading.
             values_limit: Maximum number of values to be retrieved in this chunk. 0 means all remaining values.
+            memmap_directory: If given, numeric columns are written to `.npy` files with unique names
+                starting with `<submatrix_iid>_<column index>_<values_start>_` in this directory and the
+                returned DataFrame is backed by read only memory maps of these files. See `data_read`.
 
         Returns:
             The Pandas DataFrame contains one column per local column, named after the local
@@ -436,35 +1237,421 @@ class BulkReader:
         Raises:
             requests.HTTPError: If access fails.
         """
+        unit_names: list[str] = []
+
+        def read_chunk(start: int, limit: int) -> pd.DataFrame:
+            chunk, chunk_unit_names = self.__read_valuematrix(
+                submatrix_iid,
+                column_patterns or ["*"],
+                values_start=start,
+                values_limit=limit,
+                date_as_timestamp=date_as_timestamp,
+                extract_unit_names=start == values_start,
+            )
+            unit_names.extend(chunk_unit_names)
+            return chunk
+
+        if memmap_directory is not None:
+            df, rv = self.__read_memmapped(
+                submatrix_iid,
+                values_start,
+                values_limit,
+                memmap_directory,
+                read_chunk,
+                lambda first: [f"{submatrix_iid}_{index}_{values_start}_" for index in range(first.shape[0])],
+            )
+        else:
+            df = read_chunk(values_start, values_limit)
+            rv = BulkReader.__to_frame(df["name"].to_numpy(), df["values"].to_numpy())
+        self._attach_unit_attr(rv, df["name"], unit_names)
+        return rv
+
+    def valuematrix_read_chunks(
+        self,
+        submatrix_iid: int,
+        column_patterns: list[str] | None = None,
+        chunk_rows: int = 100_000,
+        date_as_timestamp: bool = True,
+        storage_mode: bool = False,
+        memory_budget_bytes: int | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Loads an ASAM ODS SubMatrix in chunks of rows using `valuematrix_read` with `values_start`
+        and `values_limit`. Only a single chunk needs to be kept in memory.
+
+        The column patterns are resolved by the first request. The following requests ask for the
+        resolved column names, with the wildcards `*?` escaped, and reuse the unit names of the first
+        chunk. If `memory_budget_bytes` is given, the chunk rows are adapted like in `data_read_chunks`.
+
+        Example::
+
+            from odsbox.con_i import ConI
+
+            with ConI(
+                url="https://MYSERVER/api",
+                auth=("USER", "PASSWORD"),
+            ) as con_i:
+                submatrix_id = 1234
+                for df in con_i.bulk.valuematrix_read_chunks(submatrix_id, ["Time", "Co*"], chunk_rows=50_000):
+                    print(df.shape)
+
+        Args:
+            submatrix_iid: The ID of the submatrix to load.
+            column_patterns: List of column name patterns to filter the columns.
+                If None, all columns are loaded. `*?` is used as a wildcard.
+            chunk_rows: Number of rows retrieved per chunk.
+            date_as_timestamp: Whether to treat date columns as timestamps.
+            storage_mode: If True, the values are requested in `MO_STORAGE` mode together with the
+                sequence representation and generation parameters of the local columns. Implicit and
+                raw values are converted on the client. This avoids the server side calculation.
+            memory_budget_bytes: Memory a chunk may use while it is read. If given, `chunk_rows` is ignored.
+
+        Returns:
+            An iterator of DataFrames as returned by `valuematrix_read`. At least one, possibly empty,
+            DataFrame is returned so the columns are always known.
+
+        Raises:
+            requests.HTTPError: If access fails.
+            ValueError: If chunk_rows or memory_budget_bytes is not positive.
+        """
+        if chunk_rows <= 0:
+            raise ValueError(f"chunk_rows must be positive, got {chunk_rows}.")
+        number_of_rows = self._submatrix_number_of_rows(submatrix_iid)
+        sizer = (
+            self.__chunk_sizer(submatrix_iid, column_patterns, False, memory_budget_bytes, number_of_rows)
+            if memory_budget_bytes is not None
+            else None
+        )
+
+        column_names = column_patterns or ["*"]
+        unit_names: dict[str, str] | None = None
+        values_start = 0
+        while True:
+            values_limit = sizer.rows if sizer is not None else chunk_rows
+            started = time.perf_counter()
+            df, page_unit_names = self.__read_valuematrix(
+                submatrix_iid,
+                column_names,
+                values_start=values_start,
+                values_limit=values_limit,
+                date_as_timestamp=date_as_timestamp,
+                storage_mode=storage_mode,
+                extract_unit_names=unit_names is None,
+            )
+            if storage_mode:
+                df["number_of_rows"] = number_of_rows
+                BulkReader.__apply_sequence_representation(df, values_start=values_start, values_limit=values_limit)
+            rv = BulkReader.__to_frame(df["name"].to_numpy(), df["values"].to_numpy())
+            if sizer is not None:
+                sizer.observe(rv.shape[0], BulkReader.__frame_bytes(rv), time.perf_counter() - started)
+
+            if unit_names is None:
+                self._attach_unit_attr(rv, df["name"], page_unit_names)
+                unit_names = rv.attrs.get("unit_names", {})
+                # names containing wildcards must not match further columns
+                column_names = [BulkReader.__escape_pattern(str(name)) for name in df["name"]]
+            else:
+                rv.attrs["unit_names"] = unit_names
+            yield rv
+            values_start += values_limit
+            if not column_names or values_start >= number_of_rows:
+                break
+
+    @staticmethod
+    def __escape_pattern(name: str) -> str:
+        """Escape the wildcards `*?` and the escape character `\\` of a name so it only matches itself."""
+        return name.replace("\\", "\\\\").replace("*", "\\*").replace("?", "\\?")
+
+    def __chunk_sizer(
+        self,
+        submatrix_iid: int,
+        column_patterns: list[str] | None,
+        column_patterns_case_insensitive: bool,
+        memory_budget_bytes: int,
+        number_of_rows: int,
+    ) -> ChunkSizer:
+        """Create a `ChunkSizer` whose first estimate is based on the measurement quantity data types."""
+        conditions: dict[str, Any] = {"submatrix": submatrix_iid}
+        BulkReader.add_column_filters(conditions, column_patterns, column_patterns_case_insensitive)
+        data_types_df = self.__con_i.query_data(
+            {"AoLocalColumn": conditions, "$attributes": {"measurement_quantity.datatype": 1}}
+        )
+        row_bytes = ChunkSizer.row_bytes(int(data_type) for data_type in data_types_df.iloc[:, 0])
+        return ChunkSizer(
+            memory_budget_bytes,
+            row_bytes,
+            max_rows=max(number_of_rows, 1),
+            max_seconds=BulkReader.__CHUNK_SECONDS,
+        )
+
+    def __read_valuematrix(
+        self,
+        submatrix_iid: int,
+        column_names: list[str],
+        values_start: int,
+        values_limit: int,
+        date_as_timestamp: bool,
+        storage_mode: bool = False,
+        extract_unit_names: bool = True,
+    ) -> tuple[pd.DataFrame, list[str]]:
+        """
+        Request local columns of a submatrix using the ValueMatrix.
+
+        Returns:
+            DataFrame with the columns `name` and `values` and in storage mode additionally
+            `sequence_representation` and `generation_parameters`. The second entry contains the
+            unit names of the columns if `extract_unit_names` is True, otherwise it is empty.
+        """
         sm_e = self.__con_i.mc.entity_by_base_name("AoSubmatrix")
         lc_e = self.__con_i.mc.entity_by_base_name("AoLocalColumn")
-        name_patterns = column_patterns or ["*"]
+        attribute_base_names = ["name", "values"]
+        if storage_mode:
+            attribute_base_names += ["sequence_representation", "generation_parameters"]
 
         raw_dms = self.__con_i.valuematrix_read(
             ValueMatrixRequestStruct(
                 aid=sm_e.aid,
                 iid=submatrix_iid,
-                columns=[ValueMatrixRequestStruct.ColumnItem(name=name_pattern) for name_pattern in name_patterns],
+                columns=[ValueMatrixRequestStruct.ColumnItem(name=column_name) for column_name in column_names],
                 attributes=[
-                    self.__con_i.mc.attribute_by_base_name(lc_e, "name").name,
-                    self.__con_i.mc.attribute_by_base_name(lc_e, "values").name,
+                    self.__con_i.mc.attribute_by_base_name(lc_e, base_name).name for base_name in attribute_base_names
                 ],
-                mode=ValueMatrixRequestStruct.ModeEnum.MO_CALCULATED,
+                mode=(
+                    ValueMatrixRequestStruct.ModeEnum.MO_STORAGE
+                    if storage_mode
+                    else ValueMatrixRequestStruct.ModeEnum.MO_CALCULATED
+                ),
                 values_start=values_start,
                 values_limit=values_limit,
             )
         )
-        unit_names = self._extract_unit_names(raw_dms)
+        unit_names = self._extract_unit_names(raw_dms) if extract_unit_names else []
         df = to_pandas(
             raw_dms,
             date_as_timestamp=date_as_timestamp,
             prefer_np_array_for_unknown=True,
         )
         del raw_dms  # free memory
-        df.columns = ["name", "values"]
-        rv = pd.DataFrame({name: values for name, values in zip(df["name"].values, df["values"].values)})
-        self._attach_unit_attr(rv, df["name"], unit_names)
-        return rv
+        df.columns = attribute_base_names
+        return df, unit_names
+
+    def _independent_window(self, submatrix_iid: int, range_start: Any, range_end: Any) -> tuple[int, int]:
+        """
+        Determine `values_start` and `values_limit` of the rows whose independent value is
+        within the closed interval `[range_start, range_end]`.
+
+        Args:
+            submatrix_iid: The ID of the submatrix.
+            range_start: Smallest independent value to include.
+            range_end: Largest independent value to include.
+
+        Returns:
+            Tuple of `values_start` and `values_limit`. An empty window is returned as
+            `(number_of_rows, 0)`.
+
+        Raises:
+            ValueError: If the submatrix does not have exactly one independent column or the
+                independent column is not increasing.
+        """
+        start, end, number_of_rows = self.__independent_rows(submatrix_iid, range_start, range_end)
+        if start >= end:
+            return number_of_rows, 0
+        return start, end - start
+
+    def __independent_rows(self, submatrix_iid: int, range_start: Any, range_end: Any) -> tuple[int, int, int]:
+        """
+        Determine the rows `[start, end)` whose independent value is within `[range_start, range_end]` and
+        the number of rows of the submatrix. An empty window keeps its position, see `_independent_window`.
+        """
+        # probes are not cached, they would displace the values read afterwards
+        independent_df = self.query({"submatrix": submatrix_iid, "independent": 1}, values_limit=2, use_cache=False)
+        if independent_df.shape[0] != 1:
+            raise ValueError(
+                f"SubMatrix {submatrix_iid} needs exactly one independent column, found {independent_df.shape[0]}."
+            )
+        independent = independent_df.iloc[0]
+        number_of_rows = int(independent["number_of_rows"])
+        sequence_representation = int(independent["sequence_representation"])
+        first_values = independent["values"]
+        if number_of_rows == 0 or range_start > range_end:
+            return number_of_rows, number_of_rows, number_of_rows
+
+        if sequence_representation == SeqRepEnum.implicit_constant:
+            if range_start <= first_values[0] <= range_end:
+                return 0, number_of_rows, number_of_rows
+            return number_of_rows, number_of_rows, number_of_rows
+
+        if sequence_representation == SeqRepEnum.implicit_linear:
+            offset = first_values[0]
+            increment = first_values[1] - offset if number_of_rows > 1 else 1.0
+            if increment <= 0:
+                raise ValueError(f"Independent column '{independent['name']}' is not increasing.")
+            # small tolerance to be robust against floating point errors of the bounds
+            start_pos = (range_start - offset) / increment
+            end_pos = (range_end - offset) / increment
+            start = int(np.ceil(start_pos - 1e-9 * max(1.0, abs(start_pos))))
+            end = int(np.floor(end_pos + 1e-9 * max(1.0, abs(end_pos)))) + 1
+        else:
+            local_column_id = int(independent["id"])
+            start = self.__search_sorted(local_column_id, number_of_rows, range_start, "left")
+            end = self.__search_sorted(local_column_id, number_of_rows, range_end, "right")
+
+        start = min(max(start, 0), number_of_rows)
+        end = min(max(end, start), number_of_rows)
+        return start, end, number_of_rows
+
+    def __search_sorted(self, local_column_id: int, number_of_rows: int, value: Any, side: str) -> int:
+        """
+        Binary search in the values of a sorted local column like `np.searchsorted`.
+        Single values are probed until the remaining range is small enough to be read at once.
+        """
+        low, high = 0, number_of_rows
+        while high - low > BulkReader.__SEARCH_WINDOW_ROWS:
+            middle = (low + high) // 2
+            probe_df = self.query({"id": local_column_id}, values_start=middle, values_limit=1, use_cache=False)
+            probe = probe_df["values"].iloc[0][0]
+            if probe < value or (side == "right" and probe == value):
+                low = middle + 1
+            else:
+                high = middle
+        if low == high:
+            return low
+        window_df = self.query({"id": local_column_id}, values_start=low, values_limit=high - low, use_cache=False)
+        window = window_df["values"].iloc[0]
+        return low + int(np.searchsorted(np.asarray(window), value, side=side))  # type: ignore[call-overload]
+
+    def _submatrix_number_of_rows(self, submatrix_iid: int) -> int:
+        """
+        Get the number of rows of a submatrix.
+
+        Args:
+            submatrix_iid: The ID of the submatrix.
+
+        Returns:
+            The number of rows.
+
+        Raises:
+            ValueError: If the submatrix does not exist.
+        """
+        submatrix_df = self.__con_i.query_data(
+            {"AoSubMatrix": {"id": submatrix_iid}, "$attributes": {"number_of_rows": 1}}
+        )
+        if submatrix_df.empty:
+            raise ValueError(f"SubMatrix with id {submatrix_iid} does not exist.")
+        return int(submatrix_df.iloc[0, 0])  # type: ignore[arg-type]
+
+    def _measurement_submatrix_iids(self, measurement_iid: int) -> list[int]:
+        """
+        Get the ids of all submatrices of a measurement.
+
+        Args:
+            measurement_iid: The ID of the measurement.
+
+        Returns:
+            The submatrix ids in ascending order.
+        """
+        submatrices_df = self.__con_i.query_data(
+            {
+                "AoSubMatrix": {"measurement": measurement_iid},
+                "$attributes": {"id": 1},
+                "$orderby": {"id": 1},
+            }
+        )
+        return [int(iid) for iid in submatrices_df.iloc[:, 0]] if not submatrices_df.empty else []
+
+    @staticmethod
+    def __to_frame(names: Sequence[Any] | np.ndarray, values: Sequence[Any] | np.ndarray) -> pd.DataFrame:
+        """
+        Create a DataFrame from the values of local columns without iterating rows.
+        If all columns are numeric with the same dtype and length they are stacked into a single
+        2D block, otherwise the typed arrays are handed over to pandas without copying.
+        Duplicate names keep the values of the last column like a dict does.
+        """
+        columns: dict[Any, Any] = {}
+        for name, column_values in zip(names, values):
+            if not isinstance(column_values, np.ndarray):
+                array = np.asarray(column_values)
+                column_values = array if array.dtype.kind in "biufc" else column_values
+            columns[name] = column_values
+
+        arrays = list(columns.values())
+        if (
+            len(arrays) > 1
+            and all(isinstance(array, np.ndarray) and array.ndim == 1 for array in arrays)
+            and arrays[0].dtype.kind in "biufc"
+            and all(array.dtype == arrays[0].dtype and len(array) == len(arrays[0]) for array in arrays)
+        ):
+            # stacking rows and transposing keeps the values of each column contiguous in the block
+            return pd.DataFrame(np.vstack(arrays).T, columns=list(columns), copy=False)
+        return pd.DataFrame(columns, copy=False)
+
+    @staticmethod
+    def __frame_bytes(df: pd.DataFrame) -> int:
+        """Decoded size of the values of a DataFrame. A RangeIndex does not hold values and is skipped."""
+        return int(df.memory_usage(index=not isinstance(df.index, pd.RangeIndex), deep=True).sum())
+
+    def __read_memmapped(
+        self,
+        submatrix_iid: int,
+        values_start: int,
+        values_limit: int,
+        memmap_directory: str,
+        read_chunk: Callable[[int, int], pd.DataFrame],
+        file_prefixes: Callable[[pd.DataFrame], list[str]],
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Read rows in chunks of `MEMMAP_CHUNK_ROWS` and stream numeric columns into preallocated `.npy` files
+        with unique names, so only a single chunk is decoded at a time. Other columns are kept in memory.
+
+        Args:
+            read_chunk: Returns the columns with `name` and `values` for a `values_start` and `values_limit`.
+            file_prefixes: Returns the file name prefix of each column of the first chunk.
+
+        Returns:
+            The first chunk holding the metadata of the columns and the DataFrame backed by read only memory maps.
+        """
+        os.makedirs(memmap_directory, exist_ok=True)
+        number_of_rows = self._submatrix_number_of_rows(submatrix_iid)
+        end = number_of_rows if values_limit <= 0 else min(number_of_rows, values_start + values_limit)
+        rows = max(end - values_start, 0)
+        chunk_rows = max(BulkReader.MEMMAP_CHUNK_ROWS, 1)
+        # an empty window is read using the given limit to get the columns
+        first = read_chunk(values_start, min(chunk_rows, rows) if rows > 0 else values_limit)
+
+        paths: list[str | None] = []
+        sinks: list[Any] = []
+        for prefix, values in zip(file_prefixes(first), first["values"].to_numpy()):
+            dtype = np.asarray(values).dtype
+            if dtype.kind in "biufc":
+                fd, path = tempfile.mkstemp(suffix=".npy", prefix=prefix, dir=memmap_directory)
+                os.close(fd)
+                paths.append(path)
+                sinks.append(np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(rows,)))
+            else:
+                paths.append(None)
+                sinks.append([])
+
+        chunk, position = first, 0
+        while True:
+            for sink, values in zip(sinks, chunk["values"].to_numpy()):
+                if isinstance(sink, list):
+                    sink.append(values)
+                else:
+                    sink[position : position + len(values)] = values
+            position += chunk_rows
+            if position >= rows:
+                break
+            chunk = read_chunk(values_start + position, min(chunk_rows, rows - position))
+
+        columns: dict[str, Any] = {}
+        for name, memmap_path, sink in zip(first["name"].to_numpy(), paths, sinks):
+            if memmap_path is None:
+                columns[name] = sink[0] if len(sink) == 1 else np.concatenate([np.asarray(v) for v in sink])
+            else:
+                sink.flush()
+                columns[name] = np.load(memmap_path, mmap_mode="r", allow_pickle=False)
+        del sinks  # release the writable maps
+        return first, pd.DataFrame(columns, copy=False)
 
     def _attach_unit_attr(self, df: pd.DataFrame, column_names: pd.Series, unit_names: list[str]) -> None:
         """
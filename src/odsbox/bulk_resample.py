@@ -0,0 +1,70 @@
+"""vectorized resampling of channels onto a common independent axis"""
+
+from __future__ import annotations
+
+import numpy as np
+
+RESAMPLE_METHODS: tuple[str, ...] = ("nearest", "linear", "zoh")
+
+
+def resample(x: np.ndarray, values: np.ndarray, target: np.ndarray, method: str = "nearest") -> np.ndarray:
+    """
+    Resample the columns of a 2D array sampled at `x` onto the independent values `target`.
+    All columns are resampled at once using the same interpolation positions.
+
+    Target values outside of `[x[0], x[-1]]` result in NaN, no extrapolation is done.
+
+    Args:
+        x: Increasing independent values of the rows of `values`. Datetime values are supported.
+        values: Array of shape `(len(x), channels)` or `(len(x),)`. It is converted to float64.
+        target: Independent values to resample to. Must be comparable with `x`.
+        method: `nearest` takes the closest sample, `linear` interpolates linearly between the neighbouring
+            samples and `zoh` (zero order hold) takes the last sample at or before the target value.
+
+    Returns:
+        Float64 array of shape `(len(target), channels)` or `(len(target),)`.
+
+    Raises:
+        ValueError: If the method is unknown or the lengths of `x` and `values` differ.
+    """
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(f"Unknown resample method '{method}'. Use one of {list(RESAMPLE_METHODS)}.")
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[0] != len(x):
+        raise ValueError(f"x has {len(x)} values but values has {values.shape[0]} rows.")
+    x_f = _as_numeric(np.asarray(x))
+    target_f = _as_numeric(np.asarray(target))
+
+    result_shape = (len(target_f),) + values.shape[1:]
+    if len(x_f) == 0:
+        return np.full(result_shape, np.nan)
+
+    inside = (target_f >= x_f[0]) & (target_f <= x_f[-1])
+    if method == "zoh":
+        result = values[np.clip(np.searchsorted(x_f, target_f, side="right") - 1, 0, len(x_f) - 1)]
+    else:
+        if len(x_f) == 1:
+            lower = upper = np.zeros(len(target_f), dtype=np.int64)
+        else:
+            upper = np.clip(np.searchsorted(x_f, target_f, side="left"), 1, len(x_f) - 1)
+            lower = upper - 1
+        to_lower, to_upper = target_f - x_f[lower], x_f[upper] - target_f
+        if method == "nearest":
+            result = values[np.where(to_lower <= to_upper, lower, upper)]
+        else:
+            span = (to_lower + to_upper).astype(np.float64)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                weight = np.where(span > 0, to_lower / span, 0.0)
+            if values.ndim > 1:
+                weight = weight[:, np.newaxis]
+            result = values[lower] * (1.0 - weight) + values[upper] * weight
+
+    result[~inside] = np.nan
+    return result
+
+
+def _as_numeric(values: np.ndarray) -> np.ndarray:
+    """Numeric representation for comparisons. Datetime values are kept as int64 nanoseconds to stay exact."""
+    if values.dtype.kind in "mM":
+        return values.astype("datetime64[ns]" if values.dtype.kind == "M" else "timedelta64[ns]").view(np.int64)
+    return values.astype(np.float64)
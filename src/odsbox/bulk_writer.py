@@ -0,0 +1,611 @@
+"""utility to write local column values in bulk"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+import odsbox.proto.ods_pb2 as ods
+from odsbox.bulk_chunking import ChunkSizer
+from odsbox.bulk_reader import SeqRepEnum
+from odsbox.pandas_to_datamatrices import data_type_of, from_pandas
+
+if TYPE_CHECKING:
+    from .con_i import ConI
+
+
+def smallest_exact_dtype(values: np.ndarray) -> np.ndarray:
+    """
+    Convert an array to the smallest NumPy dtype holding all of its values without loss.
+
+    Signed integers are narrowed to int16, int32 or int64 depending on their range. Unsigned
+    integers stay uint8 (DT_BYTE) or use the smallest signed type covering their range. Floating
+    point and complex values are narrowed to single precision if all values survive the round trip.
+    Other arrays are returned unchanged.
+
+    Args:
+        values: One dimensional array of column values.
+
+    Returns:
+        The narrowed array or `values` itself if no smaller type is exact.
+    """
+    kind = values.dtype.kind
+    if values.size == 0 or kind not in "iufc" or (kind == "u" and values.dtype.itemsize == 1):
+        return values
+    if kind in "iu":
+        minimum, maximum = int(values.min()), int(values.max())
+        for dtype in (np.int16, np.int32, np.int64):
+            info = np.iinfo(dtype)
+            if info.min <= minimum and maximum <= info.max:
+                return values if values.dtype == dtype else values.astype(dtype)
+        return values
+    narrow = np.float32 if kind == "f" else np.complex64
+    if values.dtype.itemsize <= np.dtype(narrow).itemsize:
+        return values
+    with np.errstate(over="ignore", invalid="ignore"):
+        narrowed = values.astype(narrow)
+    return narrowed if np.array_equal(narrowed, values, equal_nan=True) else values
+
+
+def detect_sequence_representation(values: np.ndarray, rtol: float = 0.0) -> tuple[SeqRepEnum, np.ndarray]:
+    """
+    Detect whether column values can be stored using an implicit sequence representation.
+
+    The checks are vectorized and compare the values against the generated sequence:
+
+    - `implicit_constant`: all values equal `p1`. Parameters are `[p1]`.
+    - `implicit_linear`: value i equals `p1 + i * p2`. Parameters are `[p1, p2]`.
+    - `implicit_saw`: value i equals `p1 + (i mod n) * p2` with at least two periods of n values.
+      Parameters are `[p1, p2, p3]` with the last value of a period `p3 = p1 + (n - 1) * p2` as defined by ASAM ODS.
+
+    By default the generated sequence converted to the dtype of the values has to be equal to them,
+    so no information is lost. Floating point values may deviate by `rtol` times the largest absolute
+    value if a positive `rtol` is given. Integer values always have to match exactly.
+
+    Args:
+        values: One dimensional array of column values.
+        rtol: Relative tolerance for floating point values. 0 requires an exact match.
+
+    Returns:
+        The detected sequence representation and its generation parameters, or `explicit` and the values themselves.
+    """
+    number_of_values = values.size
+    kind = values.dtype.kind
+    if number_of_values < 2 or kind not in "biuf":
+        return SeqRepEnum.explicit, values
+    if kind == "b":
+        if np.all(values == values[0]):
+            return SeqRepEnum.implicit_constant, values[:1]
+        return SeqRepEnum.explicit, values
+
+    if kind == "f":
+        with np.errstate(invalid="ignore"):
+            scale = float(np.max(np.abs(values)))
+        if not np.isfinite(scale):
+            return SeqRepEnum.explicit, values
+        atol = max(rtol, float(np.finfo(values.dtype).eps)) * scale if rtol > 0 else None
+        numbers = values.astype(np.float64, copy=False)
+    else:
+        atol = 0.0
+        numbers = values.astype(np.int64, copy=False)
+
+    indices = np.arange(number_of_values)
+
+    def matches(generate: Callable[[np.ndarray], Any]) -> bool:
+        # a short prefix rejects noisy channels before the whole column is generated
+        for part in (slice(0, 64), slice(None)):
+            generated = np.asarray(generate(indices[part]))
+            if atol is None:
+                # exact: the reader generates float64 values which are stored in the dtype of the column
+                equal = generated.astype(values.dtype, copy=False) == values[part]
+            else:
+                equal = np.abs(numbers[part] - generated) <= atol
+            if not np.all(equal):
+                return False
+        return True
+
+    first = numbers[0]
+    if matches(lambda _: first):
+        return SeqRepEnum.implicit_constant, __parameters(values, [first])
+
+    increment = __increment(numbers[0], numbers[-1], number_of_values - 1)
+    if increment is not None and matches(lambda index: first + index * increment):
+        return SeqRepEnum.implicit_linear, __parameters(values, [first, increment])
+
+    drops = np.flatnonzero(np.diff(numbers) < 0)
+    if drops.size > 0:
+        period = int(drops[0]) + 1
+        increment = __increment(numbers[0], numbers[period - 1], period - 1) if period >= 2 else None
+        if (
+            increment is not None
+            and increment > 0
+            and number_of_values > period
+            and matches(lambda index: first + (index % period) * increment)
+        ):
+            return SeqRepEnum.implicit_saw, __parameters(values, [first, increment, first + (period - 1) * increment])
+
+    return SeqRepEnum.explicit, values
+
+
+def quantize_linear(
+    values: np.ndarray, precision: float | None = None, bits: int | None = None
+) -> tuple[np.ndarray, list[float]] | None:
+    """
+    Quantize floating point values to integer raw values for the `raw_linear` sequence representation.
+
+    The values are reconstructed by `p1 + p2 * raw` with the generation parameters `[p1, p2]`. `p1` is
+    the minimum so that the raw values are not negative, which keeps their protobuf encoding small.
+    Raw values of up to 15 bits are stored as int16 (DT_SHORT), up to 31 bits as int32 (DT_LONG).
+
+    Args:
+        values: One dimensional array of floating point values.
+        precision: Maximal absolute error of the reconstructed values. The number of bits is derived from it.
+        bits: Number of raw value bits between 1 and 31 used for the range of the values.
+
+    Returns:
+        The raw values and the generation parameters, or None if the values contain NaN or infinity
+        or `precision` would need more than 31 bits.
+
+    Raises:
+        ValueError: If not exactly one of precision and bits is given, they are out of range or the
+            values are not floating point values.
+    """
+    if (precision is None) == (bits is None):
+        raise ValueError("Exactly one of precision and bits has to be given.")
+    if values.dtype.kind != "f":
+        raise ValueError(f"Only floating point values can be quantized, got dtype '{values.dtype}'.")
+    if values.size == 0 or not np.all(np.isfinite(values)):
+        return None
+    minimum, maximum = float(np.min(values)), float(np.max(values))
+    if precision is not None:
+        if precision <= 0:
+            raise ValueError(f"precision must be positive, got {precision}.")
+        step = 2.0 * precision
+        steps = np.ceil((maximum - minimum) / step)
+        if not steps < 2**31:
+            return None
+        max_raw = int(steps)
+    else:
+        if bits is None or not 1 <= bits <= 31:
+            raise ValueError(f"bits must be between 1 and 31, got {bits}.")
+        max_raw = 2**bits - 1
+        step = (maximum - minimum) / max_raw if maximum > minimum else 1.0
+    dtype = np.int16 if max_raw < 2**15 else np.int32
+    raw = np.clip(np.rint((values.astype(np.float64) - minimum) / step), 0, max_raw).astype(dtype)
+    return raw, [minimum, step]
+
+
+def __increment(first: Any, last: Any, steps: int) -> Any:
+    if isinstance(first, np.integer):
+        difference = int(last) - int(first)
+        return difference // steps if difference % steps == 0 else None
+    return (last - first) / steps
+
+
+def __parameters(values: np.ndarray, parameters: list[Any]) -> np.ndarray:
+    # parameters are written in the dtype of the column if this is exact
+    wide = np.array(parameters, dtype=np.float64 if values.dtype.kind == "f" else np.int64)
+    narrow = wide.astype(values.dtype)
+    return narrow if np.array_equal(narrow, wide) else wide
+
+
+class _Submatrix:
+    """Columns of a submatrix prepared to be written."""
+
+    def __init__(self, name: str, independent: str, number_of_rows: int) -> None:
+        self.name = name
+        self.independent = independent
+        self.number_of_rows = number_of_rows
+        self.sequence_representations: dict[str, SeqRepEnum] = {}
+        self.generation_parameters: dict[str, list[float] | None] = {}
+        # values of streamed columns and generation parameters of implicit ones
+        self.stored: dict[str, np.ndarray] = {}
+        self.streamed: list[str] = []
+
+    def add(
+        self,
+        name: str,
+        sequence_representation: SeqRepEnum,
+        stored: np.ndarray,
+        generation_parameters: list[float] | None,
+    ) -> None:
+        self.sequence_representations[name] = sequence_representation
+        self.stored[name] = stored
+        self.generation_parameters[name] = generation_parameters
+        if sequence_representation in (SeqRepEnum.explicit, SeqRepEnum.raw_linear):
+            self.streamed.append(name)
+
+
+class BulkWriter:
+    """
+    BulkWriter is a class for writing local column values in bulk using a ConI instance.
+    It creates a submatrix with a measurement quantity and a local column for each column
+    of a DataFrame. Each column is transported using the smallest exact typed array while the
+    measurement quantity keeps the data type of the given column.
+    The values are streamed in several requests so that no request exceeds `max_request_bytes`.
+
+    Example::
+
+        from odsbox.con_i import ConI
+
+        with ConI(
+            url="https://MYSERVER/api",
+            auth=("USER", "PASSWORD"),
+        ) as con_i:
+            with con_i.transaction() as transaction:
+                submatrix_id = con_i.bulk_writer.write(measurement_id, df, unit_ids={"Time": time_unit_id})
+                transaction.commit()
+    """
+
+    _log: logging.Logger = logging.getLogger(__name__)
+    MAX_REQUEST_BYTES: int = 32 * 1024**2
+
+    def __init__(self, con_i: ConI) -> None:
+        """Initialize the BulkWriter with a ConI instance."""
+        self.__con_i = con_i
+
+    def write(
+        self,
+        measurement_iid: int,
+        data: pd.DataFrame | Mapping[str, np.ndarray],
+        submatrix_name: str | None = None,
+        independent: str | None = None,
+        unit_ids: Mapping[str, int] | None = None,
+        max_request_bytes: int | None = None,
+        detect_implicit: bool = True,
+        rtol: float = 0.0,
+        quantize_precision: Mapping[str, float] | None = None,
+        quantize_bits: Mapping[str, int] | None = None,
+    ) -> int:
+        """
+        Create a submatrix with its local columns and write the column values.
+
+        The first rows are written together with the local columns using data-create. The
+        remaining rows are appended using data-update with `values_update_mode` VU_APPEND.
+        Constant, linear and saw tooth columns are detected by `detect_sequence_representation`
+        and only their generation parameters are written. By default only sequences reproducing
+        the values exactly are detected. Floating point columns named in
+        `quantize_precision` or `quantize_bits` are stored as `raw_linear` integers using `quantize_linear`
+        unless they are implicit. This is lossy and has to be requested explicitly.
+        Call it inside a transaction to avoid partially written submatrices on errors.
+
+        Args:
+            measurement_iid: Id of the measurement the submatrix and the measurement quantities belong to.
+            data: DataFrame or dictionary of equally long one dimensional arrays. Keys are the column names.
+            submatrix_name: Name of the submatrix. Defaults to the name of the first column.
+            independent: Name of the independent column. Defaults to the first column.
+            unit_ids: Unit id of a column by its name. Columns not contained have no unit.
+            max_request_bytes: Maximal size of a single request. Defaults to `MAX_REQUEST_BYTES`.
+            detect_implicit: If False, all columns are written using the explicit sequence representation.
+            rtol: Relative tolerance used to detect implicit sequence representations of floating point columns.
+                The default 0 only accepts sequences reproducing the values exactly, a positive value is lossy.
+            quantize_precision: Maximal absolute error by column name of floating point columns to be quantized.
+            quantize_bits: Number of raw value bits by column name of floating point columns to be quantized.
+
+        Returns:
+            Id of the created submatrix.
+
+        Raises:
+            ValueError: If data contains no column, the columns differ in length, `independent` or a
+                quantized column is not a column or a single row exceeds `max_request_bytes`.
+        """
+        columns = self.__columns(data)
+        self.__check_quantized([columns], quantize_precision, quantize_bits)
+        submatrix = self.__prepare(
+            submatrix_name or next(iter(columns)),
+            columns,
+            independent,
+            detect_implicit,
+            rtol,
+            quantize_precision or {},
+            quantize_bits or {},
+        )
+
+        data_types = [int(data_type_of(values)) for values in columns.values()]
+        quantity_ids = self.__con_i.data_create(
+            self.__measurement_quantities(measurement_iid, list(columns), data_types, unit_ids or {})
+        )
+        submatrix_id = self.__con_i.data_create(self.__submatrices(measurement_iid, [submatrix]))[0]
+        self.__write_local_columns([submatrix], [submatrix_id], dict(zip(columns, quantity_ids)), max_request_bytes)
+        return submatrix_id
+
+    def write_measurement(
+        self,
+        parent_iid: int,
+        measurement_name: str,
+        submatrices: Mapping[str, pd.DataFrame | Mapping[str, np.ndarray]],
+        independent: Mapping[str, str] | None = None,
+        unit_ids: Mapping[str, int] | None = None,
+        measurement_values: Mapping[str, Any] | None = None,
+        max_request_bytes: int | None = None,
+        detect_implicit: bool = True,
+        rtol: float = 0.0,
+        quantize_precision: Mapping[str, float] | None = None,
+        quantize_bits: Mapping[str, int] | None = None,
+    ) -> tuple[int, dict[str, int]]:
+        """
+        Create a measurement with its submatrices, measurement quantities and local columns.
+
+        The hierarchy is created level by level with a single request per level: the measurement,
+        the submatrices together with the measurement quantities and the local columns of all
+        submatrices together with their first rows. Remaining rows are appended like in `write`.
+        Columns of the same name in different submatrices share a measurement quantity.
+        Relations are resolved by their base names. Call it inside a transaction to avoid partially
+        written measurements on errors.
+
+        Example::
+
+            with con_i.transaction() as transaction:
+                measurement_id, submatrix_ids = con_i.bulk_writer.write_measurement(
+                    sub_test_id, "Run 1", {"fast": fast_df, "slow": slow_df}, unit_ids={"Time": time_unit_id}
+                )
+                transaction.commit()
+
+        Args:
+            parent_iid: Id of the test the measurement belongs to, usually an AoSubTest instance.
+            measurement_name: Name of the measurement.
+            submatrices: Columns of each submatrix by submatrix name. See `data` of `write`.
+            independent: Name of the independent column by submatrix name. Defaults to the first column.
+            unit_ids: Unit id of a column by its name. Columns not contained have no unit.
+            measurement_values: Additional attribute values of the measurement by name.
+            max_request_bytes: Maximal size of a single request. Defaults to `MAX_REQUEST_BYTES`.
+            detect_implicit: If False, all columns are written using the explicit sequence representation.
+            rtol: Relative tolerance used to detect implicit sequence representations of floating point columns.
+                The default 0 only accepts sequences reproducing the values exactly, a positive value is lossy.
+            quantize_precision: Maximal absolute error by column name of floating point columns to be quantized.
+            quantize_bits: Number of raw value bits by column name of floating point columns to be quantized.
+
+        Returns:
+            Id of the created measurement and the ids of the created submatrices by name.
+
+        Raises:
+            ValueError: If there is no submatrix, a submatrix contains no column, its columns differ in length,
+                an independent or quantized column is not a column or a single row exceeds `max_request_bytes`.
+        """
+        if not submatrices:
+            raise ValueError("No submatrices to write.")
+        columns = {name: self.__columns(data) for name, data in submatrices.items()}
+        self.__check_quantized(list(columns.values()), quantize_precision, quantize_bits)
+        independent = independent or {}
+        prepared = [
+            self.__prepare(
+                name,
+                submatrix_columns,
+                independent.get(name),
+                detect_implicit,
+                rtol,
+                quantize_precision or {},
+                quantize_bits or {},
+            )
+            for name, submatrix_columns in columns.items()
+        ]
+
+        # a quantity shared by several submatrices gets a data type holding the values of all of them
+        dtypes: dict[str, list[np.dtype]] = {}
+        for submatrix_columns in columns.values():
+            for name, values in submatrix_columns.items():
+                dtypes.setdefault(name, []).append(values.dtype)
+        data_types = [int(data_type_of(np.empty(0, dtype=np.result_type(*types)))) for types in dtypes.values()]
+
+        mc = self.__con_i.mc
+        measurement_entity = mc.entity_by_base_name("AoMeasurement")
+        measurement = {
+            "name": [measurement_name],
+            "mime_type": "application/x-asam.aomeasurement",
+            mc.relation_by_base_name(measurement_entity, "test").name: parent_iid,
+            **{name: [value] for name, value in (measurement_values or {}).items()},
+        }
+        measurement_iid = self.__con_i.data_create(from_pandas(pd.DataFrame(measurement), measurement_entity, mc))[0]
+
+        request = self.__submatrices(measurement_iid, prepared)
+        request.matrices.extend(
+            self.__measurement_quantities(measurement_iid, list(dtypes), data_types, unit_ids or {}).matrices
+        )
+        submatrix_ids, quantity_ids = self.__con_i.data_create_matrices(request)
+        self.__write_local_columns(prepared, submatrix_ids, dict(zip(dtypes, quantity_ids)), max_request_bytes)
+        return measurement_iid, dict(zip(columns, submatrix_ids))
+
+    def __prepare(
+        self,
+        name: str,
+        columns: dict[str, np.ndarray],
+        independent: str | None,
+        detect_implicit: bool,
+        rtol: float,
+        quantize_precision: Mapping[str, float],
+        quantize_bits: Mapping[str, int],
+    ) -> _Submatrix:
+        if independent is None:
+            independent = next(iter(columns))
+        elif independent not in columns:
+            raise ValueError(f"Independent column '{independent}' is not contained in data.")
+        submatrix = _Submatrix(name, independent, len(columns[independent]))
+        for column_name, values in columns.items():
+            # only the transport is narrowed, the measurement quantity keeps the data type of the column
+            values = smallest_exact_dtype(values)
+            sequence_representation, stored = (
+                detect_sequence_representation(values, rtol) if detect_implicit else (SeqRepEnum.explicit, values)
+            )
+            generation_parameters = None
+            if sequence_representation != SeqRepEnum.explicit:
+                generation_parameters = stored.astype(np.float64).tolist()
+            elif column_name in quantize_precision or column_name in quantize_bits:
+                quantized = quantize_linear(values, quantize_precision.get(column_name), quantize_bits.get(column_name))
+                if quantized is None:
+                    self._log.info("Column '%s' is written explicit because it can not be quantized.", column_name)
+                else:
+                    sequence_representation = SeqRepEnum.raw_linear
+                    stored, generation_parameters = quantized
+            submatrix.add(column_name, sequence_representation, stored, generation_parameters)
+        return submatrix
+
+    def __write_local_columns(
+        self,
+        submatrices: list[_Submatrix],
+        submatrix_ids: list[int],
+        quantity_ids: Mapping[str, int],
+        max_request_bytes: int | None,
+    ) -> None:
+        mc = self.__con_i.mc
+        local_column_entity = mc.entity_by_base_name("AoLocalColumn")
+        submatrix_relation = mc.relation_by_base_name(local_column_entity, "submatrix").name
+        quantity_relation = mc.relation_by_base_name(local_column_entity, "measurement_quantity").name
+        max_request_bytes = max_request_bytes or BulkWriter.MAX_REQUEST_BYTES
+        number_of_rows = max(submatrix.number_of_rows for submatrix in submatrices)
+        # local columns of all submatrices in order of their submatrices and columns
+        columns = [(submatrix, name) for submatrix in submatrices for name in submatrix.stored]
+        metadata = pd.DataFrame(
+            {
+                "name": [name for _, name in columns],
+                "mime_type": "application/x-asam.aolocalcolumn",
+                submatrix_relation: [
+                    submatrix_id
+                    for submatrix, submatrix_id in zip(submatrices, submatrix_ids)
+                    for _ in submatrix.stored
+                ],
+                quantity_relation: [quantity_ids[name] for _, name in columns],
+                "independent": [1 if name == submatrix.independent else 0 for submatrix, name in columns],
+                "sequence_representation": [
+                    int(submatrix.sequence_representations[name]) for submatrix, name in columns
+                ],
+                "generation_parameters": [submatrix.generation_parameters[name] for submatrix, name in columns],
+                "global_flag": 15,
+            }
+        )
+        if any(SeqRepEnum.raw_linear in submatrix.sequence_representations.values() for submatrix in submatrices):
+            metadata["raw_datatype"] = pd.array(
+                [
+                    (
+                        int(data_type_of(submatrix.stored[name]))
+                        if submatrix.sequence_representations[name] == SeqRepEnum.raw_linear
+                        else None
+                    )
+                    for submatrix, name in columns
+                ],
+                dtype="Int64",
+            )
+
+        def create_request(start: int, stop: int) -> ods.DataMatrices:
+            chunk = metadata.assign(
+                values=[
+                    submatrix.stored[name][start:stop] if name in submatrix.streamed else submatrix.stored[name]
+                    for submatrix, name in columns
+                ]
+            )
+            return from_pandas(chunk, local_column_entity, mc)
+
+        streamed_data_types = [
+            int(data_type_of(submatrix.stored[name])) for submatrix in submatrices for name in submatrix.streamed
+        ]
+        if streamed_data_types:
+            rows = max(1, max_request_bytes // max(ChunkSizer.row_bytes(streamed_data_types), 1))
+        else:
+            # a single request contains the generation parameters of all columns
+            rows = max(number_of_rows, 1)
+        stop, request, rows = self.__fit(0, rows, number_of_rows, max_request_bytes, create_request)
+        local_column_ids = self.__con_i.data_create(request)
+        streamed = [
+            (submatrix, name, local_column_id)
+            for (submatrix, name), local_column_id in zip(columns, local_column_ids)
+            if name in submatrix.streamed
+        ]
+
+        def append_request(start: int, stop: int) -> ods.DataMatrices:
+            # submatrices with less rows are complete already
+            remaining = [column for column in streamed if start < column[0].number_of_rows]
+            chunk = pd.DataFrame(
+                {
+                    "id": [local_column_id for _, _, local_column_id in remaining],
+                    "values": [submatrix.stored[name][start:stop] for submatrix, name, _ in remaining],
+                }
+            )
+            request = from_pandas(chunk, local_column_entity, mc)
+            request.matrices[0].values_start = start
+            request.matrices[0].values_update_mode = ods.DataMatrix.VU_APPEND
+            return request
+
+        while stop < number_of_rows:
+            start = stop
+            stop, request, rows = self.__fit(start, rows, number_of_rows, max_request_bytes, append_request)
+            self.__con_i.data_update(request)
+            self._log.debug("Appended rows %d to %d of %d submatrices", start, stop, len(submatrices))
+
+    def __fit(
+        self,
+        start: int,
+        rows: int,
+        number_of_rows: int,
+        max_request_bytes: int,
+        build: Callable[[int, int], ods.DataMatrices],
+    ) -> tuple[int, ods.DataMatrices, int]:
+        # rows is an estimate, the serialized size decides and the estimate is corrected by it
+        while True:
+            stop = min(start + rows, number_of_rows)
+            request = build(start, stop)
+            request_bytes = request.ByteSize()
+            if request_bytes <= max_request_bytes:
+                return stop, request, rows
+            if stop - start <= 1:
+                raise ValueError(f"A single row needs {request_bytes} bytes exceeding max_request_bytes.")
+            rows = max(1, min(stop - start - 1, (stop - start) * max_request_bytes // request_bytes))
+
+    def __measurement_quantities(
+        self,
+        measurement_iid: int,
+        column_names: list[str],
+        data_types: list[int],
+        unit_ids: Mapping[str, int],
+    ) -> ods.DataMatrices:
+        mc = self.__con_i.mc
+        entity = mc.entity_by_base_name("AoMeasurementQuantity")
+        measurement_quantities = pd.DataFrame(
+            {
+                "name": column_names,
+                "mime_type": "application/x-asam.aomeasurementquantity",
+                mc.relation_by_base_name(entity, "measurement").name: measurement_iid,
+                "datatype": data_types,
+            }
+        )
+        if unit_ids:
+            measurement_quantities[mc.relation_by_base_name(entity, "unit").name] = pd.array(
+                [unit_ids.get(name) for name in column_names], dtype="Int64"
+            )
+        return from_pandas(measurement_quantities, entity, mc)
+
+    def __submatrices(self, measurement_iid: int, submatrices: list[_Submatrix]) -> ods.DataMatrices:
+        mc = self.__con_i.mc
+        entity = mc.entity_by_base_name("AoSubmatrix")
+        submatrix = pd.DataFrame(
+            {
+                "name": [submatrix.name for submatrix in submatrices],
+                "mime_type": "application/x-asam.aosubmatrix",
+                mc.relation_by_base_name(entity, "measurement").name: measurement_iid,
+                "number_of_rows": [submatrix.number_of_rows for submatrix in submatrices],
+            }
+        )
+        return from_pandas(submatrix, entity, mc)
+
+    @staticmethod
+    def __check_quantized(
+        columns: list[dict[str, np.ndarray]],
+        quantize_precision: Mapping[str, float] | None,
+        quantize_bits: Mapping[str, int] | None,
+    ) -> None:
+        for name in (*(quantize_precision or {}), *(quantize_bits or {})):
+            if not any(name in submatrix_columns for submatrix_columns in columns):
+                raise ValueError(f"Quantized column '{name}' is not contained in data.")
+
+    @staticmethod
+    def __columns(data: pd.DataFrame | Mapping[str, np.ndarray]) -> dict[str, np.ndarray]:
+        items = data.items()
+        columns = {str(name): np.asarray(values) for name, values in items}
+        if not columns:
+            raise ValueError("No columns to write.")
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"All columns must have the same length, got {sorted(lengths)}.")
+        return columns
@@ -17,6 +17,7 @@ from __future__ import annotations
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import requests
@@ -27,6 +28,8 @@ from pandas import DataFrame
 
 import odsbox.proto.ods_pb2 as ods
 from odsbox.bulk_reader import BulkReader
+from odsbox.bulk_writer import BulkWriter
+from odsbox.datamatrices_split import fits, split_data_matrices
 from odsbox.datamatrices_to_pandas import to_pandas
 from odsbox.jaquel import Jaquel
 from odsbox.model_cache import ModelCache
@@ -67,6 +70,9 @@ class ConI:
         connection_timeout: float = 60.0,
         request_timeout: float = 600.0,
         custom_session: requests.Session | None = None,
+        max_request_rows: int | None = None,
+        max_request_bytes: int | None = None,
+        max_parallel_requests: int = 1,
     ) -> None:
         """
         Create a session object keeping track of ASAM ODS session URL named `conI`.
@@ -118,18 +124,30 @@ class ConI:
             custom_session: A preconfigured requests.Session to use.
                 If provided, `auth` and `verify_certificate` parameters are ignored. Defaults to None.
                 e.g. Some OAuth packages provide custom `requests.Session` implementations.
+            max_request_rows: Maximal number of rows of a matrix sent by `data_create`, `data_update` and
+                `data_delete`. Bigger matrices are split into several requests, which are not atomic, see
+                `odsbox.datamatrices_split.split_data_matrices`. Defaults to None (unbounded).
+            max_request_bytes: Maximal serialized size of a request sent by `data_create`, `data_update`
+                and `data_delete`. Bigger requests are split by rows. Defaults to None (unbounded).
+            max_parallel_requests: Number of split requests sent in parallel. Only use values bigger than 1
+                if the server allows parallel writes in a transaction. Defaults to 1 (sequential).
 
         Raises:
             requests.HTTPError: If connection to ASAM ODS server fails.
         """
+        self.__url: str = url
         self.__session: requests.Session | None = None
         self.__con_i: str | None = None
         self.__security: Security | None = None
         self.__mc: ModelCache | None = None
         self.__allow_redirects: bool = allow_redirects
         self.__bulk_reader: BulkReader | None = None
+        self.__bulk_writer: BulkWriter | None = None
         self.__connection_timeout: float = connection_timeout
         self.__request_timeout: float = request_timeout
+        self.__max_request_rows: int | None = max_request_rows
+        self.__max_request_bytes: int | None = max_request_bytes
+        self.__max_parallel_requests: int = max_parallel_requests
 
         session = custom_session
         if session is None:
@@ -187,6 +205,16 @@ class ConI:
         except Exception as e:
             self.__log.exception("Exception during logout in close: %s", e)
 
+    @property
+    def url(self) -> str:
+        """
+        Get the base URL of the ASAM ODS API this session was created for.
+
+        Returns:
+            The base URL given in the constructor.
+        """
+        return self.__url
+
     def con_i_url(self) -> str:
         """
         Get the ASAM ODS session URL used to work with this session.
@@ -223,6 +251,7 @@ class ConI:
                 self.__session = None
                 self.__security = None
                 self.__bulk_reader = None
+                self.__bulk_writer = None
                 self.__mc = None
 
     def query(
@@ -415,26 +444,53 @@ class ConI:
     def data_create(self, data: ods.DataMatrices) -> list[int]:
         """
         Create new ASAM ODS instances or write bulk data.
+        The request is split if it exceeds `max_request_rows` or `max_request_bytes`.
 
         Args:
             data: Matrices containing columns for instances to be created.
 
         Returns:
-            List of ids created from your request.
+            List of ids created from your request. If the request is split the ids of the
+            first matrix are concatenated in order of its rows.
 
         Raises:
             requests.HTTPError: If creation fails.
         """
         if not isinstance(data, ods.DataMatrices):
             raise TypeError(f"data_create expects 'ods.DataMatrices', got '{type(data).__name__}'")
-        response = self.ods_post_request("data-create", data)
-        return_value = ods.DataMatrices()
-        return_value.ParseFromString(response.content)
-        return list(return_value.matrices[0].columns[0].longlong_array.values)
+        ids = self.data_create_matrices(data)
+        return ids[0] if ids else []
+
+    def data_create_matrices(self, data: ods.DataMatrices) -> list[list[int]]:
+        """
+        Create new ASAM ODS instances of several entities with a single request.
+        The request is split if it exceeds `max_request_rows` or `max_request_bytes`.
+
+        Args:
+            data: Matrices containing columns for instances to be created.
+
+        Returns:
+            Ids created for each matrix in order of the matrices.
+
+        Raises:
+            requests.HTTPError: If creation fails.
+        """
+        if not isinstance(data, ods.DataMatrices):
+            raise TypeError(f"data_create_matrices expects 'ods.DataMatrices', got '{type(data).__name__}'")
+        ids: list[list[int]] = [[] for _ in data.matrices]
+        for matrix_index, response in self.__post_split("data-create", data):
+            return_value = ods.DataMatrices()
+            return_value.ParseFromString(response.content)
+            # an unsplit request returns a matrix for each matrix of the request
+            for offset, matrix in enumerate(return_value.matrices[: len(ids) - matrix_index]):
+                if matrix.columns:
+                    ids[matrix_index + offset].extend(matrix.columns[0].longlong_array.values)
+        return ids
 
     def data_update(self, data: ods.DataMatrices) -> None:
         """
         Update existing instances.
+        The request is split if it exceeds `max_request_rows` or `max_request_bytes`.
 
         Args:
             data: Matrices containing columns for instances to be updated.
@@ -445,11 +501,12 @@ class ConI:
         """
         if not isinstance(data, ods.DataMatrices):
             raise TypeError(f"data_update expects 'ods.DataMatrices', got '{type(data).__name__}'")
-        self.ods_post_request("data-update", data)
+        self.__post_split("data-update", data)
 
     def data_delete(self, data: ods.DataMatrices, timeout: float | None = None) -> None:
         """
         Delete existing instances.
+        The request is split if it exceeds `max_request_rows` or `max_request_bytes`.
 
         Args:
             data: Matrices containing columns for instances to be deleted.
@@ -462,7 +519,26 @@ class ConI:
         """
         if not isinstance(data, ods.DataMatrices):
             raise TypeError(f"data_delete expects 'ods.DataMatrices', got '{type(data).__name__}'")
-        self.ods_post_request("data-delete", data, timeout=timeout)
+        self.__post_split("data-delete", data, timeout=timeout)
+
+    def __post_split(
+        self, relative_url_part: str, data: ods.DataMatrices, timeout: float | None = None
+    ) -> list[tuple[int, requests.Response]]:
+        # returns the index of the matrix each response belongs to
+        if fits(data, self.__max_request_rows, self.__max_request_bytes):
+            return [(0, self.ods_post_request(relative_url_part, data, timeout=timeout))]
+        chunks = split_data_matrices(data, self.__max_request_rows, self.__max_request_bytes)
+        self.__log.debug("Split %s request into %d requests", relative_url_part, len(chunks))
+
+        def post(chunk: ods.DataMatrices) -> requests.Response:
+            return self.ods_post_request(relative_url_part, chunk, timeout=timeout)
+
+        if self.__max_parallel_requests > 1:
+            with ThreadPoolExecutor(max_workers=min(self.__max_parallel_requests, len(chunks))) as executor:
+                responses = list(executor.map(post, [chunk for _, chunk in chunks]))
+        else:
+            responses = [post(chunk) for _, chunk in chunks]
+        return [(matrix_index, response) for (matrix_index, _), response in zip(chunks, responses)]
 
     def data_copy(self, copy_request: ods.CopyRequest) -> ods.Instance:
         """
@@ -1030,3 +1106,30 @@ class ConI:
         if self.__bulk_reader is None:
             self.__bulk_reader = BulkReader(self)
         return self.__bulk_reader
+
+    @property
+    def bulk_writer(self) -> BulkWriter:
+        """
+        Get the bulk writer for the current session.
+
+        Example::
+
+            from odsbox.con_i import ConI
+
+            with ConI(
+                url="https://MYSERVER/api",
+                auth=("USER", "PASSWORD"),
+            ) as con_i:
+                with con_i.transaction() as transaction:
+                    submatrix_id = con_i.bulk_writer.write(measurement_id, df)
+                    transaction.commit()
+
+        Returns:
+            BulkWriter object for writing data in bulk.
+        """
+        if self.__session is None:
+            raise ValueError("No open session!")
+
+        if self.__bulk_writer is None:
+            self.__bulk_writer = BulkWriter(self)
+        return self.__bulk_writer
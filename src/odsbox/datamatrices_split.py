@@ -0,0 +1,179 @@
+"""Split ASAM ODS DataMatrices into smaller requests by row count or serialized size."""
+
+from __future__ import annotations
+
+import odsbox.proto.ods_pb2 as ods
+
+
+def row_count(matrix: ods.DataMatrix) -> int:
+    """
+    Get the number of rows of a DataMatrix.
+
+    Args:
+        matrix: Matrix to count the rows of.
+
+    Returns:
+        The maximal number of values or `is_null` flags of its columns.
+    """
+    rows = 0
+    for column in matrix.columns:
+        field = column.WhichOneof("ValuesOneOf")
+        if field is not None:
+            rows = max(rows, len(getattr(column, field).values))
+        rows = max(rows, len(column.is_null))
+    return rows
+
+
+def fits(data: ods.DataMatrices, max_rows: int | None = None, max_bytes: int | None = None) -> bool:
+    """
+    Check if DataMatrices can be sent as a single request.
+
+    Args:
+        data: DataMatrices to check.
+        max_rows: Maximal number of rows of each matrix. None means unbounded.
+        max_bytes: Maximal serialized size. None means unbounded.
+
+    Returns:
+        True if no limit is exceeded.
+    """
+    if max_rows is not None and any(row_count(matrix) > max_rows for matrix in data.matrices):
+        return False
+    return max_bytes is None or data.ByteSize() <= max_bytes
+
+
+def split_data_matrix(
+    matrix: ods.DataMatrix, max_rows: int | None = None, max_bytes: int | None = None
+) -> list[ods.DataMatrices]:
+    """
+    Split the rows of a DataMatrix into DataMatrices containing at most `max_rows` rows
+    and serializing to at most `max_bytes` each.
+
+    Example::
+
+        from odsbox.datamatrices_split import split_data_matrix
+
+        for chunk in split_data_matrix(data.matrices[0], max_bytes=16 * 1024**2):
+            con_i.data_update(chunk)
+
+    Args:
+        matrix: Matrix whose rows are split. All other fields are copied to each chunk.
+        max_rows: Maximal number of rows of a chunk. None means unbounded.
+        max_bytes: Maximal serialized size of a chunk. None means unbounded.
+
+    Returns:
+        DataMatrices containing a single matrix each, in order of the rows.
+
+    Raises:
+        ValueError: If a limit is not positive or a single row exceeds `max_bytes`. Also if the matrix
+            exceeds the limits and uses `row_start`, `values_start`, `values_remove_length` or a
+            `values_update_mode` other than VU_APPEND, because they can not be applied to each chunk.
+    """
+    if (max_rows is not None and max_rows <= 0) or (max_bytes is not None and max_bytes <= 0):
+        raise ValueError(f"Limits must be positive, got max_rows={max_rows} and max_bytes={max_bytes}.")
+    if (
+        matrix.row_start != 0
+        or matrix.values_start != 0
+        or matrix.values_remove_length != 0
+        or matrix.values_update_mode != ods.DataMatrix.VU_APPEND
+    ) and not fits(ods.DataMatrices(matrices=[matrix]), max_rows, max_bytes):
+        raise ValueError(
+            f"Matrix '{matrix.name}' can not be split because it uses row or values offsets "
+            "or a values_update_mode other than VU_APPEND."
+        )
+    number_of_rows = row_count(matrix)
+    rows = max_rows or max(number_of_rows, 1)
+    if max_bytes is not None and number_of_rows > 0:
+        # first estimate assumes rows of equal size, it is corrected by the serialized size of each chunk
+        rows = max(1, min(rows, number_of_rows * max_bytes // max(matrix.ByteSize(), 1)))
+
+    chunks: list[ods.DataMatrices] = []
+    start = 0
+    while start < number_of_rows or not chunks:
+        stop = min(start + rows, number_of_rows)
+        chunk = ods.DataMatrices()
+        __copy_rows(matrix, chunk.matrices.add(), start, stop)
+        if max_bytes is not None:
+            chunk_bytes = chunk.ByteSize()
+            if chunk_bytes > max_bytes:
+                if stop - start <= 1:
+                    raise ValueError(f"A single row of '{matrix.name}' needs {chunk_bytes} bytes exceeding max_bytes.")
+                rows = max(1, min(stop - start - 1, (stop - start) * max_bytes // chunk_bytes))
+                continue
+        chunks.append(chunk)
+        start = stop
+    return chunks
+
+
+def split_data_matrices(
+    data: ods.DataMatrices, max_rows: int | None = None, max_bytes: int | None = None
+) -> list[tuple[int, ods.DataMatrices]]:
+    """
+    Split DataMatrices into requests not exceeding `max_rows` and `max_bytes`.
+    Consecutive matrices within the limits are kept together in one request as long as the request fits.
+    Matrices exceeding the limits are split by `split_data_matrix` into requests of their own.
+
+    The requests are not atomic. Matrices that depend on each other, like the local columns and the
+    `number_of_rows` of a submatrix, might be sent in different requests. Use a transaction if a
+    failed request must not leave the other requests applied.
+
+    Args:
+        data: DataMatrices to split.
+        max_rows: Maximal number of rows of each matrix. None means unbounded.
+        max_bytes: Maximal serialized size of a request. None means unbounded.
+
+    Returns:
+        Index of the first matrix of `data` contained in the request and the request, in order of the matrices.
+
+    Raises:
+        ValueError: If a matrix can not be split, see `split_data_matrix`.
+    """
+    requests: list[tuple[int, ods.DataMatrices]] = []
+    pending = ods.DataMatrices()
+    pending_index = 0
+    for matrix_index, matrix in enumerate(data.matrices):
+        if fits(ods.DataMatrices(matrices=[matrix]), max_rows, max_bytes):
+            pending.matrices.add().CopyFrom(matrix)
+            if len(pending.matrices) == 1:
+                pending_index = matrix_index
+            elif not fits(pending, max_rows, max_bytes):
+                del pending.matrices[-1]
+                requests.append((pending_index, pending))
+                pending = ods.DataMatrices(matrices=[matrix])
+                pending_index = matrix_index
+            continue
+        if pending.matrices:
+            requests.append((pending_index, pending))
+            pending = ods.DataMatrices()
+        requests.extend((matrix_index, chunk) for chunk in split_data_matrix(matrix, max_rows, max_bytes))
+    if pending.matrices:
+        requests.append((pending_index, pending))
+    return requests
+
+
+def __copy_rows(source: ods.DataMatrix, target: ods.DataMatrix, start: int, stop: int) -> None:
+    target.name = source.name
+    target.base_name = source.base_name
+    target.aid = source.aid
+    target.row_start = source.row_start
+    target.values_start = source.values_start
+    target.values_update_mode = source.values_update_mode
+    target.values_remove_length = source.values_remove_length
+    for column in source.columns:
+        target_column = target.columns.add(
+            name=column.name,
+            base_name=column.base_name,
+            unit_id=column.unit_id,
+            aggregate=column.aggregate,
+            data_type=column.data_type,
+        )
+        target_column.is_null.extend(column.is_null[start:stop])
+        field = column.WhichOneof("ValuesOneOf")
+        if field is None:
+            continue
+        values = getattr(column, field).values
+        target_array = getattr(target_column, field)
+        target_array.SetInParent()
+        if isinstance(values, bytes):
+            target_array.values = values[start:stop]
+        else:
+            target_array.values.extend(values[start:stop])
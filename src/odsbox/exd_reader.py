@@ -0,0 +1,384 @@
+"""direct bulk access to an ASAM ODS External Data Reader (ExD) gRPC service"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from odsbox.datamatrices_to_pandas import to_pandas, unknown_array_values
+from odsbox.proto.ods_pb2 import DataMatrices
+
+if TYPE_CHECKING:
+    from odsbox.proto import ods_external_data_pb2 as exd
+
+    from .con_i import ConI
+
+
+class ExdReader:
+    """
+    Client for an ASAM ODS External Data Reader (ExD) service. The bulk data is read directly
+    from the ExD plugin without passing the ASAM ODS server.
+
+    Channels are fetched in parallel using several concurrent `GetValues` calls on a single
+    gRPC channel. The values are decoded into NumPy arrays.
+
+    Example::
+
+        from odsbox.con_i import ConI
+        from odsbox.exd_reader import ExdReader
+
+        with ConI(url="https://MYSERVER/api", auth=("USER", "PASSWORD")) as con_i, ExdReader("exd-host:50051") as exd:
+            df = exd.read_submatrix(con_i, 1234, ["Time", "Co*"])
+
+    Remark: Needs `grpcio`. Install with ``pip install odsbox[exd-data]``.
+    """
+
+    _log: logging.Logger = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        target: str | None = None,
+        credentials: Any = None,
+        max_workers: int = 4,
+        options: list[tuple[str, Any]] | None = None,
+        channel: Any = None,
+    ) -> None:
+        """
+        Connect to an ExD service.
+
+        Args:
+            target: Address of the service like `localhost:50051`.
+            credentials: `grpc.ChannelCredentials` to create a secure channel. If None an insecure channel is used.
+            max_workers: Maximum number of concurrent `GetValues` calls.
+            options: gRPC channel options. By default the message size limits are removed
+                because bulk responses easily exceed the default of 4 MB.
+            channel: An existing `grpc.Channel` to use instead of `target`.
+
+        Raises:
+            ImportError: If grpcio is not installed.
+            ValueError: If neither target nor channel is given.
+        """
+        try:
+            import grpc
+
+            from odsbox.proto import ods_external_data_pb2, ods_external_data_pb2_grpc
+        except ImportError as e:
+            raise ImportError("ExdReader requires grpcio. Install with: pip install odsbox[exd-data]") from e
+
+        if channel is None:
+            if target is None:
+                raise ValueError("Either target or channel needs to be given.")
+            if options is None:
+                options = [("grpc.max_receive_message_length", -1), ("grpc.max_send_message_length", -1)]
+            channel = (
+                grpc.secure_channel(target, credentials, options=options)
+                if credentials is not None
+                else grpc.insecure_channel(target, options=options)
+            )
+        self.__exd = ods_external_data_pb2
+        self.__channel = channel
+        self.__stub = ods_external_data_pb2_grpc.ExternalDataReaderStub(channel)  # type: ignore[no-untyped-call]
+        self.__max_workers = max_workers
+
+    def __enter__(self) -> ExdReader:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        exc_traceback: object,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the gRPC channel.
+        """
+        self.__channel.close()
+
+    def open(self, url: str, parameters: str = "") -> exd.Handle:
+        """
+        Open a file at the ExD service.
+
+        Args:
+            url: URL of the file as known by the ExD plugin.
+            parameters: Plugin specific parameters.
+
+        Returns:
+            Handle to be used in further requests. Release it using `close_handle`.
+        """
+        handle: exd.Handle = self.__stub.Open(self.__exd.Identifier(url=url, parameters=parameters))
+        return handle
+
+    def close_handle(self, handle: exd.Handle) -> None:
+        """
+        Release a handle created by `open`.
+
+        Args:
+            handle: The handle to release.
+        """
+        self.__stub.Close(handle)
+
+    def structure(self, handle: exd.Handle, channel_names: list[str] | None = None) -> exd.StructureResult:
+        """
+        Get the groups and channels of an opened file.
+
+        Args:
+            handle: Handle created by `open`.
+            channel_names: If given, only channels with these names are returned.
+
+        Returns:
+            The structure of the file without attributes.
+        """
+        structure: exd.StructureResult = self.__stub.GetStructure(
+            self.__exd.StructureRequest(handle=handle, suppress_attributes=True, channel_names=channel_names or [])
+        )
+        return structure
+
+    def read_values(
+        self,
+        handle: exd.Handle,
+        group_id: int,
+        channel_ids: list[int],
+        start: int = 0,
+        limit: int = 0,
+    ) -> dict[int, np.ndarray | list[Any]]:
+        """
+        Read channel values of a group. The channels are split into up to `max_workers`
+        batches that are requested concurrently.
+
+        Args:
+            handle: Handle created by `open`.
+            group_id: Id of the group.
+            channel_ids: Ids of the channels to read.
+            start: Zero-based index of the first row.
+            limit: Maximum number of rows. 0 means all remaining rows.
+
+        Returns:
+            A dictionary mapping channel id to values. Numeric values are returned as NumPy arrays.
+            Values whose flags mark them as invalid are set to NaN, converting the channel to float.
+        """
+        if not channel_ids:
+            return {}
+        batch_count = max(1, min(self.__max_workers, len(channel_ids)))
+        batches = [channel_ids[index::batch_count] for index in range(batch_count)]
+
+        def _read(batch: list[int]) -> exd.ValuesResult:
+            result: exd.ValuesResult = self.__stub.GetValues(
+                self.__exd.ValuesRequest(handle=handle, group_id=group_id, channel_ids=batch, start=start, limit=limit)
+            )
+            return result
+
+        if batch_count > 1:
+            with ThreadPoolExecutor(max_workers=batch_count) as executor:
+                results = list(executor.map(_read, batches))
+        else:
+            results = [_read(batches[0])]
+
+        decoded = {channel.id: ExdReader.decode_channel(channel) for result in results for channel in result.channels}
+        return {channel_id: decoded[channel_id] for channel_id in channel_ids if channel_id in decoded}
+
+    def read_values_ex(
+        self,
+        handle: exd.Handle,
+        group_id: int,
+        channel_names: list[str],
+        attributes: list[str],
+        start: int = 0,
+        limit: int = 0,
+    ) -> pd.DataFrame:
+        """
+        Read channel values of a group together with local column attributes using `GetValuesEx`.
+
+        Args:
+            handle: Handle created by `open`.
+            group_id: Id of the group.
+            channel_names: Names of the channels to read.
+            attributes: Attributes of the local columns to return, e.g. `["name", "values"]`.
+            start: Zero-based index of the first row.
+            limit: Maximum number of rows. 0 means all remaining rows.
+
+        Returns:
+            A DataFrame with one row per channel as returned by `to_pandas`. Unknown array values
+            are decoded into NumPy arrays. ``df.attrs["unit_map"]`` maps unit ids to unit names.
+        """
+        result: exd.ValuesExResult = self.__stub.GetValuesEx(
+            self.__exd.ValuesExRequest(
+                handle=handle,
+                group_id=group_id,
+                channel_names=channel_names,
+                attributes=attributes,
+                start=start,
+                limit=limit,
+            )
+        )
+        df = to_pandas(DataMatrices(matrices=[result.values]), prefer_np_array_for_unknown=True)
+        df.attrs["unit_map"] = dict(result.unit_map)
+        return df
+
+    def read_group(
+        self,
+        url: str,
+        group_id: int | None = None,
+        channel_names: list[str] | None = None,
+        start: int = 0,
+        limit: int = 0,
+        parameters: str = "",
+    ) -> pd.DataFrame:
+        """
+        Open a file, read channels of a group and close the file again.
+
+        Args:
+            url: URL of the file as known by the ExD plugin.
+            group_id: Id of the group. If None and `channel_names` are given, the only group containing all
+                of them is used. Otherwise the first group containing channels is used.
+            channel_names: Names of the channels to read. If None all channels are read.
+            start: Zero-based index of the first row.
+            limit: Maximum number of rows. 0 means all remaining rows.
+            parameters: Plugin specific parameters.
+
+        Returns:
+            A DataFrame with one column per channel, named after the channel.
+            ``df.attrs["unit_names"]`` maps the channel names to the unit strings.
+
+        Raises:
+            ValueError: If the group does not exist or `channel_names` are not contained in exactly one group.
+        """
+        handle = self.open(url, parameters)
+        try:
+            structure = self.structure(handle, channel_names)
+            groups = [group for group in structure.groups if group_id is None or group.id == group_id]
+            if group_id is None and channel_names:
+                groups = [
+                    group for group in groups if set(channel_names) <= {channel.name for channel in group.channels}
+                ]
+                if len(groups) > 1:
+                    raise ValueError(
+                        f"Channels {channel_names} are contained in groups {[group.id for group in groups]} "
+                        f"of '{url}', the group id is needed."
+                    )
+            elif group_id is None:
+                groups = [group for group in groups if len(group.channels) > 0] or groups
+            if not groups:
+                raise ValueError(f"Group {group_id} containing channels {channel_names} not found in '{url}'.")
+            group = groups[0]
+            channels = list(group.channels)
+            values = self.read_values(handle, group.id, [channel.id for channel in channels], start, limit)
+        finally:
+            self.close_handle(handle)
+
+        rv: pd.DataFrame = pd.DataFrame(
+            {channel.name: values[channel.id] for channel in channels if channel.id in values}, copy=False
+        )
+        rv.attrs["unit_names"] = {channel.name: channel.unit_string for channel in channels}
+        return rv
+
+    def read_submatrix(
+        self,
+        con_i: ConI,
+        submatrix_iid: int,
+        column_patterns: list[str] | None = None,
+        column_patterns_case_insensitive: bool = False,
+        start: int = 0,
+        limit: int = 0,
+        exd_group_ids: int | Mapping[str, int] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Read the local columns of a submatrix directly from the files referenced by their external components.
+        The ASAM ODS server is only asked for the file URLs and the sequence representations. Local columns are
+        matched to ExD channels by name within the group of the file containing all of them. Local columns without
+        external component are skipped. The raw values of `raw_*_external` columns are converted to physical
+        values like `BulkReader` does, see `odsbox.bulk_external.physical_values`.
+
+        Args:
+            con_i: Session to the ASAM ODS server containing the submatrix.
+            submatrix_iid: The ID of the submatrix.
+            column_patterns: List of column name patterns to filter the columns.
+                If None, all columns are loaded. `*?` is used as a wildcard.
+            column_patterns_case_insensitive: Whether to treat column name patterns as case insensitive.
+            start: Zero-based index of the first row.
+            limit: Maximum number of rows. 0 means all remaining rows.
+            exd_group_ids: ExD group id of the submatrix used for all files or by file URL. Needed if
+                the channels are contained in several groups of a file.
+
+        Returns:
+            A DataFrame with one column per local column read from the external files.
+            ``df.attrs["unit_names"]`` maps the column names to the unit strings of the ExD channels.
+
+        Raises:
+            ValueError: If the group of a file can not be resolved, see `read_group`, or the sequence
+                representation of a column can not be converted to physical values.
+        """
+        from odsbox.bulk_external import physical_values
+        from odsbox.bulk_reader import BulkReader
+
+        conditions: dict[str, Any] = {"submatrix": submatrix_iid}
+        BulkReader.add_column_filters(conditions, column_patterns, column_patterns_case_insensitive)
+        components_df = con_i.query_data(
+            {
+                "AoLocalColumn": conditions,
+                "$attributes": {
+                    "name": 1,
+                    "external_component.filename_url": 1,
+                    "sequence_representation": 1,
+                    "generation_parameters": 1,
+                },
+            }
+        )
+        frames: list[pd.DataFrame] = []
+        unit_names: dict[str, str] = {}
+        if not components_df.empty:
+            names = components_df.iloc[:, 0]
+            urls = components_df.iloc[:, 1]
+            internal = urls.isna()
+            if internal.any():
+                self._log.debug("Skip local columns without external component: %s", names[internal].tolist())
+            for url in pd.unique(urls[~internal]):
+                group_id = exd_group_ids.get(url) if isinstance(exd_group_ids, Mapping) else exd_group_ids
+                frame = self.read_group(
+                    url,
+                    group_id=group_id,
+                    channel_names=sorted(set(names[urls == url])),
+                    start=start,
+                    limit=limit,
+                )
+                unit_names.update(frame.attrs["unit_names"])
+                frames.append(frame)
+        rv = pd.concat(frames, axis=1) if frames else pd.DataFrame()
+        if not rv.empty:
+            # the files contain the raw values of raw_*_external columns
+            for name, sequence_representation, generation_parameters in (
+                components_df.iloc[:, [0, 2, 3]].drop_duplicates(subset=components_df.columns[0]).to_numpy()
+            ):
+                if name in rv.columns:
+                    rv[name] = physical_values(
+                        rv[name].to_numpy(), int(sequence_representation), generation_parameters, str(name)
+                    )
+        rv.attrs["unit_names"] = unit_names
+        return rv
+
+    @staticmethod
+    def decode_channel(channel: exd.ValuesResult.ChannelValues) -> np.ndarray | list[Any]:
+        """
+        Decode the values of a channel returned by `GetValues`.
+
+        Args:
+            channel: Channel of a `ValuesResult`.
+
+        Returns:
+            Numeric values as NumPy array, strings and dates as list. If flags are given, values
+            without the valid bit are set to NaN.
+        """
+        values = unknown_array_values(channel.values, prefer_np_array=True)
+        if len(channel.flags.values) > 0 and isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+            invalid = (np.asarray(channel.flags.values) & 1) == 0
+            if invalid.any():
+                values = values.astype(np.float64)
+                values[invalid] = np.nan
+        return values
@@ -0,0 +1,274 @@
+"""in-process ASAM ODS External Data Reader (ExD) service for tests and benchmarks"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+import odsbox.proto.ods_pb2 as ods
+from odsbox.asam_time import from_pd_timestamp
+
+try:
+    import grpc
+
+    from odsbox.proto import ods_external_data_pb2 as exd
+    from odsbox.proto import ods_external_data_pb2_grpc as exd_grpc
+except ImportError as e:  # pragma: no cover
+    raise ImportError("odsbox.exd_server requires grpcio. Install with: pip install odsbox[exd-data]") from e
+
+
+class ExdStandInServicer(exd_grpc.ExternalDataReaderServicer):
+    """
+    Reference implementation of the `ExternalDataReader` service serving pandas DataFrames.
+    It can be used to test and benchmark ExD clients like `odsbox.exd_reader.ExdReader`
+    without a vendor plugin.
+
+    Each file is identified by its URL and contains groups. Each group is a DataFrame whose
+    columns are the channels. Unit strings are taken from ``df.attrs["unit_names"]``.
+    Group and channel ids are the one-based positions of the groups and columns.
+
+    Example::
+
+        from odsbox.exd_reader import ExdReader
+        from odsbox.exd_server import ExdStandInServicer, serve
+
+        servicer = ExdStandInServicer()
+        servicer.add_file("file:///synthetic.mf4", {"g1": ExdStandInServicer.synthetic_group(1_000_000, 100)})
+        server, target = serve(servicer)
+        with ExdReader(target, max_workers=8) as reader:
+            df = reader.read_group("file:///synthetic.mf4")
+        server.stop(None)
+    """
+
+    _log: logging.Logger = logging.getLogger(__name__)
+
+    def __init__(self, files: dict[str, dict[str, pd.DataFrame]] | None = None) -> None:
+        """
+        Create the servicer.
+
+        Args:
+            files: Maps file URLs to groups. Each group maps a group name to the DataFrame holding its channels.
+        """
+        self.__files: dict[str, list[tuple[str, pd.DataFrame]]] = {}
+        self.__handles: dict[str, str] = {}
+        self.__lock = threading.Lock()
+        self.values_request_count = 0
+        for url, groups in (files or {}).items():
+            self.add_file(url, groups)
+
+    def add_file(self, url: str, groups: dict[str, pd.DataFrame]) -> None:
+        """
+        Serve a file made of DataFrames.
+
+        Unsigned integer channels are served using the next larger signed data type.
+
+        Args:
+            url: URL used to open the file.
+            groups: Maps group names to DataFrames holding the channels.
+
+        Raises:
+            ValueError: If an uint64 channel contains values exceeding the DT_LONGLONG range.
+        """
+        for group_name, df in groups.items():
+            for name in df.columns:
+                values = df[name].to_numpy()
+                if values.dtype == np.uint64 and values.size > 0 and values.max() > np.iinfo(np.int64).max:
+                    raise ValueError(f"Channel '{name}' of group '{group_name}' exceeds the DT_LONGLONG range.")
+        self.__files[url] = list(groups.items())
+
+    def add_parquet(self, url: str, path: str, group_name: str | None = None) -> None:
+        """
+        Serve a Parquet file as file with a single group. The file is loaded into memory.
+
+        Args:
+            url: URL used to open the file.
+            path: Path of the Parquet file, e.g. written by `BulkReader.export`.
+            group_name: Name of the group. Defaults to the URL.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        try:
+            import pyarrow.parquet as pa_parquet
+        except ImportError as e:
+            raise ImportError("Parquet files require pyarrow. Install with: pip install odsbox[export]") from e
+        table = pa_parquet.read_table(path)
+        df = table.to_pandas()
+        unit_names = {field.name: field.metadata[b"unit"].decode("utf-8") for field in table.schema if field.metadata}
+        df.attrs["unit_names"] = unit_names
+        self.add_file(url, {group_name or url: df})
+
+    @staticmethod
+    def synthetic_group(rows: int, channels: int, dtype: Any = np.float64, seed: int = 0) -> pd.DataFrame:
+        """
+        Create a group of random channels with a leading `Time` channel.
+
+        Args:
+            rows: Number of rows.
+            channels: Number of channels besides `Time`.
+            dtype: Data type of the channels.
+            seed: Seed of the random number generator.
+
+        Returns:
+            The DataFrame to be used with `add_file`.
+        """
+        rng = np.random.default_rng(seed)
+        columns: dict[str, np.ndarray] = {"Time": np.arange(rows, dtype=np.float64) * 0.001}
+        for index in range(channels):
+            columns[f"Channel{index}"] = (rng.standard_normal(rows) * 100).astype(dtype)
+        df: pd.DataFrame = pd.DataFrame(columns, copy=False)
+        df.attrs["unit_names"] = {"Time": "s"}
+        return df
+
+    def Open(self, request: exd.Identifier, context: Any) -> exd.Handle:
+        if request.url not in self.__files:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"File '{request.url}' not found.")
+        handle = str(uuid.uuid4())
+        with self.__lock:
+            self.__handles[handle] = request.url
+        return exd.Handle(uuid=handle)
+
+    def Close(self, request: exd.Handle, context: Any) -> exd.Empty:
+        with self.__lock:
+            self.__handles.pop(request.uuid, None)
+        return exd.Empty()
+
+    def GetStructure(self, request: exd.StructureRequest, context: Any) -> exd.StructureResult:
+        url = self.__url(request.handle, context)
+        result = exd.StructureResult(identifier=exd.Identifier(url=url), name=url)
+        for group_id, (group_name, df) in enumerate(self.__files[url], start=1):
+            group = result.groups.add(
+                id=group_id, name=group_name, total_number_of_channels=df.shape[1], number_of_rows=df.shape[0]
+            )
+            if request.suppress_channels:
+                continue
+            unit_names = df.attrs.get("unit_names", {})
+            for channel_id, name in enumerate(df.columns, start=1):
+                if request.channel_names and name not in request.channel_names:
+                    continue
+                group.channels.add(
+                    id=channel_id,
+                    name=str(name),
+                    data_type=ExdStandInServicer.__data_type(df[name].to_numpy()),
+                    unit_string=unit_names.get(name, ""),
+                )
+        return result
+
+    def GetValues(self, request: exd.ValuesRequest, context: Any) -> exd.ValuesResult:
+        df = self.__group(request.handle, request.group_id, context)
+        with self.__lock:
+            self.values_request_count += 1
+        end = request.start + request.limit if request.limit > 0 else None
+        result = exd.ValuesResult(id=request.group_id)
+        for channel_id in request.channel_ids:
+            if not 1 <= channel_id <= df.shape[1]:
+                context.abort(grpc.StatusCode.NOT_FOUND, f"Channel {channel_id} not found.")
+            channel = result.channels.add(id=channel_id)
+            ExdStandInServicer.__fill(channel.values, df.iloc[request.start : end, channel_id - 1].to_numpy())
+        return result
+
+    def GetValuesEx(self, request: exd.ValuesExRequest, context: Any) -> exd.ValuesExResult:
+        df = self.__group(request.handle, request.group_id, context)
+        with self.__lock:
+            self.values_request_count += 1
+        end = request.start + request.limit if request.limit > 0 else None
+        names = [name for name in request.channel_names if name in df.columns] or [str(c) for c in df.columns]
+        unit_names = df.attrs.get("unit_names", {})
+        unit_ids = {unit: index for index, unit in enumerate(sorted(set(unit_names.values())), start=1)}
+
+        matrix = ods.DataMatrix(name="LocalColumn", base_name="AoLocalColumn")
+        for attribute in request.attributes or ["name", "values"]:
+            column = matrix.columns.add(name=attribute, base_name=attribute)
+            if attribute == "name":
+                column.string_array.values.extend(names)
+            elif attribute == "values":
+                for name in names:
+                    ExdStandInServicer.__fill(
+                        column.unknown_arrays.values.add(), df[name].to_numpy()[request.start : end]
+                    )
+            elif attribute == "unit":
+                column.longlong_array.values.extend([unit_ids.get(unit_names.get(name, ""), 0) for name in names])
+            else:
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Attribute '{attribute}' not supported.")
+        return exd.ValuesExResult(values=matrix, unit_map={index: unit for unit, index in unit_ids.items()})
+
+    def __url(self, handle: exd.Handle, context: Any) -> str:
+        with self.__lock:
+            url = self.__handles.get(handle.uuid)
+        if url is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Handle '{handle.uuid}' not found.")
+        return str(url)
+
+    def __group(self, handle: exd.Handle, group_id: int, context: Any) -> pd.DataFrame:
+        groups = self.__files[self.__url(handle, context)]
+        if not 1 <= group_id <= len(groups):
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Group {group_id} not found.")
+        return groups[group_id - 1][1]
+
+    @staticmethod
+    def __data_type(values: np.ndarray) -> ods.DataTypeEnum:
+        kind, size = values.dtype.kind, values.dtype.itemsize
+        if kind == "f":
+            return ods.DT_FLOAT if size == 4 else ods.DT_DOUBLE
+        if kind == "b":
+            return ods.DT_BOOLEAN
+        if kind == "u" and size == 1:
+            return ods.DT_BYTE
+        if kind in "iu":
+            # unsigned integers use the next larger signed type
+            bits = size * 8 + (1 if kind == "u" else 0)
+            return ods.DT_SHORT if bits <= 16 else ods.DT_LONG if bits <= 32 else ods.DT_LONGLONG
+        if kind == "M":
+            return ods.DT_DATE
+        return ods.DT_STRING
+
+    @staticmethod
+    def __fill(unknown_array: ods.DataMatrix.Column.UnknownArray, values: np.ndarray) -> None:
+        # tolist is much faster than letting protobuf iterate NumPy scalars
+        data_type = ExdStandInServicer.__data_type(values)
+        unknown_array.data_type = data_type
+        if data_type == ods.DT_DOUBLE:
+            unknown_array.double_array.values.extend(values.tolist())
+        elif data_type == ods.DT_FLOAT:
+            unknown_array.float_array.values.extend(values.tolist())
+        elif data_type == ods.DT_BOOLEAN:
+            unknown_array.boolean_array.values.extend(values.tolist())
+        elif data_type == ods.DT_BYTE:
+            unknown_array.byte_array.values = values.tobytes()
+        elif data_type in (ods.DT_SHORT, ods.DT_LONG):
+            unknown_array.long_array.values.extend(values.tolist())
+        elif data_type == ods.DT_LONGLONG:
+            unknown_array.longlong_array.values.extend(values.tolist())
+        elif data_type == ods.DT_DATE:
+            unknown_array.string_array.values.extend(from_pd_timestamp(pd.Timestamp(v)) for v in values)
+        else:
+            unknown_array.string_array.values.extend(str(v) for v in values)
+
+
+def serve(servicer: ExdStandInServicer, address: str = "localhost:0", max_workers: int = 10) -> tuple[Any, str]:
+    """
+    Start an insecure gRPC server for the servicer in a background thread.
+
+    Args:
+        servicer: The servicer to serve.
+        address: Address to bind to. Port 0 picks a free port.
+        max_workers: Number of threads handling requests.
+
+    Returns:
+        Tuple of the started `grpc.Server` and the target to connect to. Stop the server using `server.stop(None)`.
+    """
+    server = grpc.server(
+        ThreadPoolExecutor(max_workers=max_workers),
+        options=[("grpc.max_receive_message_length", -1), ("grpc.max_send_message_length", -1)],
+    )
+    exd_grpc.add_ExternalDataReaderServicer_to_server(servicer, server)  # type: ignore[no-untyped-call]
+    port = server.add_insecure_port(address)
+    server.start()
+    host = address.rsplit(":", 1)[0]
+    return server, f"{host}:{port}"
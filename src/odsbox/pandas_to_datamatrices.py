@@ -0,0 +1,258 @@
+"""Convert a pandas DataFrame into an ASAM ODS DataMatrices object to be used
+with data_create and data_update. This is the inverse of `to_pandas`."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+import odsbox.proto.ods_pb2 as ods
+from odsbox.model_cache import ModelCache
+
+__SEQUENCE_TO_SCALAR: dict[int, int] = {
+    ods.DS_STRING: ods.DT_STRING,
+    ods.DS_SHORT: ods.DT_SHORT,
+    ods.DS_FLOAT: ods.DT_FLOAT,
+    ods.DS_BOOLEAN: ods.DT_BOOLEAN,
+    ods.DS_BYTE: ods.DT_BYTE,
+    ods.DS_LONG: ods.DT_LONG,
+    ods.DS_DOUBLE: ods.DT_DOUBLE,
+    ods.DS_LONGLONG: ods.DT_LONGLONG,
+    ods.DS_COMPLEX: ods.DT_COMPLEX,
+    ods.DS_DCOMPLEX: ods.DT_DCOMPLEX,
+    ods.DS_DATE: ods.DT_DATE,
+    ods.DS_BYTESTR: ods.DT_BYTESTR,
+    ods.DS_EXTERNALREFERENCE: ods.DT_EXTERNALREFERENCE,
+    ods.DS_ENUM: ods.DT_ENUM,
+}
+
+__ARRAY_FIELDS: dict[int, str] = {
+    ods.DT_STRING: "string_array",
+    ods.DT_DATE: "string_array",
+    ods.DT_EXTERNALREFERENCE: "string_array",
+    ods.DT_SHORT: "long_array",
+    ods.DT_LONG: "long_array",
+    ods.DT_ENUM: "long_array",
+    ods.DT_FLOAT: "float_array",
+    ods.DT_COMPLEX: "float_array",
+    ods.DT_BOOLEAN: "boolean_array",
+    ods.DT_BYTE: "byte_array",
+    ods.DT_DOUBLE: "double_array",
+    ods.DT_DCOMPLEX: "double_array",
+    ods.DT_LONGLONG: "longlong_array",
+    ods.DT_BYTESTR: "bytestr_array",
+}
+
+__NULL_VALUES: dict[int, Any] = {
+    ods.DT_STRING: "",
+    ods.DT_BOOLEAN: False,
+    ods.DT_BYTESTR: b"",
+    ods.DT_EXTERNALREFERENCE: ("", "", ""),
+}
+
+
+def data_type_of(values: np.ndarray) -> ods.DataTypeEnum:
+    """
+    Determine the ASAM ODS data type able to hold the values of a NumPy array.
+
+    Args:
+        values: Array of values, e.g. the values of a local column.
+
+    Returns:
+        The smallest scalar `DataTypeEnum` holding the values without loss. Unsigned integers
+        use the next larger signed type. Other types are transported as DT_STRING.
+    """
+    kind, size = values.dtype.kind, values.dtype.itemsize
+    if kind == "f":
+        return ods.DT_FLOAT if size == 4 else ods.DT_DOUBLE
+    if kind == "c":
+        return ods.DT_COMPLEX if size == 8 else ods.DT_DCOMPLEX
+    if kind == "b":
+        return ods.DT_BOOLEAN
+    if kind == "u" and size == 1:
+        return ods.DT_BYTE
+    if kind in "iu":
+        bits = size * 8 + (1 if kind == "u" else 0)
+        return ods.DT_SHORT if bits <= 16 else ods.DT_LONG if bits <= 32 else ods.DT_LONGLONG
+    if kind == "M":
+        return ods.DT_DATE
+    return ods.DT_STRING
+
+
+def from_pandas(
+    df: pd.DataFrame,
+    entity: str | ods.Model.Entity,
+    model_cache: ModelCache,
+    name_separator: str = ".",
+) -> ods.DataMatrices:
+    """
+    Converts a pandas DataFrame into an ASAM ODS DataMatrices containing a single matrix.
+    Each DataFrame column becomes a matrix column. The data type is taken from the model.
+
+    Example::
+
+        from odsbox.pandas_to_datamatrices import from_pandas
+
+        df = pd.DataFrame({"name": ["km/h", "m/s"], "factor": [1 / 3.6, 1.0], "offset": 0.0, "phys_dimension": 4})
+        ids = con_i.data_create(from_pandas(df, "AoUnit", con_i.mc))
+
+    The values are written to the typed arrays in bulk:
+
+    - Numeric columns are converted to the dtype of the attribute using NumPy.
+    - DT_ENUM accepts the integer values or the case insensitive enumeration keys.
+    - DT_DATE accepts Timestamps or datetime64 values, converted to `YYYYMMDDHHMMSSFFF`, or ASAM ODS date strings.
+    - Missing values (None, NaN, NaT, pd.NA) set the `is_null` flag of the column.
+    - Relation columns contain the ids of the related instances.
+    - Sequence attributes (DS_*) contain a list or array per cell. Attributes of DT_UNKNOWN like
+      `values` of AoLocalColumn contain an array per cell whose data type is derived by `data_type_of`.
+
+    Args:
+        df: DataFrame to convert. The index is ignored.
+        entity: Entity or application or base name of the entity the rows are instances of.
+        model_cache: ModelCache used to resolve column names and data types.
+        name_separator: Columns may be prefixed by the entity name and this separator
+            like the columns created by `to_pandas`.
+
+    Returns:
+        DataMatrices to be passed to `data_create` or `data_update`.
+
+    Raises:
+        ValueError: If a column is neither an attribute nor a relation of the entity or an enumeration key is unknown.
+    """
+    if not isinstance(entity, ods.Model.Entity):
+        entity = model_cache.entity_no_throw(entity) or model_cache.entity_by_base_name(entity)
+
+    data_matrices = ods.DataMatrices()
+    matrix = data_matrices.matrices.add(aid=entity.aid, name=entity.name)
+    prefix = f"{entity.name}{name_separator}"
+    for column_name, values in df.items():
+        name = str(column_name)
+        if name.startswith(prefix):
+            name = name[len(prefix) :]
+        attribute = model_cache.attribute_no_throw(entity, name)
+        if attribute is not None:
+            column = matrix.columns.add(name=attribute.name, data_type=attribute.data_type)
+            enumeration = (
+                model_cache.enumeration(attribute.enumeration)
+                if attribute.data_type in (ods.DT_ENUM, ods.DS_ENUM)
+                else None
+            )
+            __fill_column(column, values, attribute.data_type, enumeration, model_cache)
+            continue
+        relation = model_cache.relation_no_throw(entity, name)
+        if relation is None:
+            raise ValueError(f"Column '{column_name}' is neither an attribute nor a relation of '{entity.name}'.")
+        column = matrix.columns.add(name=relation.name, data_type=ods.DT_LONGLONG)
+        __fill_column(column, values, ods.DT_LONGLONG, None, model_cache)
+    return data_matrices
+
+
+def __fill_column(
+    column: ods.DataMatrix.Column,
+    values: pd.Series,
+    data_type: int,
+    enumeration: ods.Model.Enumeration | None,
+    model_cache: ModelCache,
+) -> None:
+    if data_type == ods.DT_UNKNOWN:
+        for cell in values:
+            unknown_array = column.unknown_arrays.values.add()
+            cell_values = np.asarray(cell if cell is not None else [])
+            cell_data_type = data_type_of(cell_values)
+            unknown_array.data_type = cell_data_type
+            __set_array(unknown_array, cell_data_type, __payload(cell_values, cell_data_type, None, model_cache))
+        return
+
+    scalar_type = __SEQUENCE_TO_SCALAR.get(data_type)
+    if scalar_type is not None:
+        if scalar_type not in __ARRAY_FIELDS:
+            raise ValueError(f"Data type {ods.DataTypeEnum.Name(data_type)} can not be written from pandas.")
+        arrays = getattr(column, f"{__ARRAY_FIELDS[scalar_type]}s").values
+        is_null = values.map(lambda cell: cell is None or (np.ndim(cell) == 0 and pd.isna(cell))).to_numpy(bool)
+        for cell, null in zip(values, is_null):
+            array = arrays.add()
+            if not null:
+                __extend(array, __payload(np.asarray(cell), scalar_type, enumeration, model_cache))
+    else:
+        is_null = values.isna().to_numpy(bool)
+        if is_null.any() and data_type != ods.DT_DATE:
+            values = values.astype(object).where(~is_null, __NULL_VALUES.get(data_type, 0))
+        __set_array(column, data_type, __payload(values, data_type, enumeration, model_cache))
+    if is_null.any():
+        column.is_null.extend(is_null.tolist())
+
+
+def __set_array(target: Any, data_type: int, payload: list[Any] | bytes) -> None:
+    field = __ARRAY_FIELDS.get(data_type)
+    if field is None:
+        raise ValueError(f"Data type {ods.DataTypeEnum.Name(data_type)} can not be written from pandas.")
+    __extend(getattr(target, field), payload)
+
+
+def __extend(array: Any, payload: list[Any] | bytes) -> None:
+    if isinstance(payload, bytes):
+        array.values = payload
+    else:
+        array.values.extend(payload)
+
+
+def __payload(
+    values: pd.Series | np.ndarray,
+    data_type: int,
+    enumeration: ods.Model.Enumeration | None,
+    model_cache: ModelCache,
+) -> Any:
+    # tolist creates Python scalars at C speed, which protobuf consumes much faster than NumPy scalars
+    if data_type == ods.DT_DOUBLE:
+        return np.asarray(values, dtype=np.float64).tolist()
+    if data_type == ods.DT_FLOAT:
+        return np.asarray(values, dtype=np.float32).tolist()
+    if data_type == ods.DT_LONGLONG:
+        return np.asarray(values, dtype=np.int64).tolist()
+    if data_type in (ods.DT_LONG, ods.DT_SHORT):
+        return np.asarray(values, dtype=np.int32).tolist()
+    if data_type == ods.DT_BOOLEAN:
+        return np.asarray(values, dtype=np.bool_).tolist()
+    if data_type == ods.DT_BYTE:
+        return np.asarray(values, dtype=np.uint8).tobytes()
+    if data_type == ods.DT_COMPLEX:
+        return np.asarray(values, dtype=np.complex64).view(np.float32).tolist()
+    if data_type == ods.DT_DCOMPLEX:
+        return np.asarray(values, dtype=np.complex128).view(np.float64).tolist()
+    if data_type == ods.DT_ENUM:
+        return __enum_payload(pd.Series(values, copy=False), enumeration, model_cache)
+    if data_type == ods.DT_DATE:
+        return __date_payload(pd.Series(values, copy=False))
+    if data_type == ods.DT_BYTESTR:
+        return [bytes(value) for value in values]
+    if data_type == ods.DT_EXTERNALREFERENCE:
+        return [str(part) for reference in values for part in reference]
+    return np.asarray(values).astype(str).tolist()
+
+
+def __enum_payload(values: pd.Series, enumeration: ods.Model.Enumeration | None, model_cache: ModelCache) -> list[Any]:
+    if enumeration is None or pd.api.types.is_numeric_dtype(values.dtype):
+        codes = values.to_numpy(dtype=np.int32)
+    else:
+        # each distinct key is looked up once
+        lookup = {
+            key: model_cache.enumeration_key_to_value(enumeration, key) if isinstance(key, str) else int(key)
+            for key in pd.unique(values)
+        }
+        codes = values.map(lookup).to_numpy(dtype=np.int32)
+    rv: list[Any] = codes.tolist()
+    return rv
+
+
+def __date_payload(values: pd.Series) -> list[str]:
+    if pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty"):
+        formatted = values.fillna("").astype(str)
+    else:
+        if isinstance(values.dtype, pd.DatetimeTZDtype):
+            # like from_pd_timestamp the timezone information is ignored
+            values = values.dt.tz_localize(None)
+        formatted = pd.to_datetime(values).dt.strftime("%Y%m%d%H%M%S%f").str[:17].fillna("")
+    rv: list[str] = formatted.tolist()
+    return rv
@@ -0,0 +1,293 @@
+"""Append live samples to the local columns of an existing submatrix"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+import odsbox.proto.ods_pb2 as ods
+from odsbox.bulk_reader import SeqRepEnum
+from odsbox.pandas_to_datamatrices import from_pandas
+
+if TYPE_CHECKING:
+    from .con_i import ConI
+
+DTYPES: dict[int, type[np.generic]] = {
+    ods.DT_BOOLEAN: np.bool_,
+    ods.DT_BYTE: np.uint8,
+    ods.DT_SHORT: np.int16,
+    ods.DT_LONG: np.int32,
+    ods.DT_LONGLONG: np.int64,
+    ods.DT_FLOAT: np.float32,
+    ods.DT_DOUBLE: np.float64,
+    ods.DT_COMPLEX: np.complex64,
+    ods.DT_DCOMPLEX: np.complex128,
+}
+"""NumPy dtype buffering the values of a `DataTypeEnum`. Other data types are buffered as objects."""
+
+
+class _RingBuffer:
+    """Preallocated circular buffer of the pending values of a local column."""
+
+    def __init__(self, capacity: int, dtype: type[np.generic] | type[object]) -> None:
+        self.values = np.empty(capacity, dtype=dtype)
+        self.start = 0
+        self.size = 0
+
+    def write(self, values: np.ndarray) -> None:
+        # the caller guarantees that the values fit
+        capacity = len(self.values)
+        position = (self.start + self.size) % capacity
+        head = min(len(values), capacity - position)
+        self.values[position : position + head] = values[:head]
+        self.values[: len(values) - head] = values[head:]
+        self.size += len(values)
+
+    def pending(self) -> np.ndarray:
+        stop = self.start + self.size
+        if stop <= len(self.values):
+            return self.values[self.start : stop]
+        return np.concatenate((self.values[self.start :], self.values[: stop - len(self.values)]))
+
+    def drop(self) -> None:
+        self.start = (self.start + self.size) % len(self.values)
+        self.size = 0
+
+
+class StreamAppender:
+    """
+    Append samples arriving over time to the local columns of an existing submatrix.
+
+    Samples are collected in a preallocated ring buffer per local column. The buffers are sent
+    if they are full, if the oldest pending sample is older than `max_interval` seconds and on
+    `flush`. A flush is a single data-update appending the values using `values_start` and
+    `values_update_mode` VU_APPEND and setting the `number_of_rows` of the submatrix, so implicit
+    columns are extended as well. If a flush fails the samples stay buffered for the next flush.
+
+    Columns using a raw sequence representation like `raw_linear` take raw samples in their
+    `raw_datatype`. The physical values are calculated from them using the generation parameters
+    of the local column. Samples not fitting an integer raw data type are rejected.
+
+    Example::
+
+        from odsbox.stream_appender import StreamAppender
+
+        with StreamAppender(con_i, submatrix_id, capacity=5000, max_interval=2.0) as appender:
+            for samples in bench.samples():  # dictionaries of arrays by column name
+                appender.append(samples)
+    """
+
+    _log: logging.Logger = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        con_i: ConI,
+        submatrix_iid: int,
+        capacity: int = 10_000,
+        max_interval: float | None = 1.0,
+    ) -> None:
+        """
+        Load the local columns and the number of rows of the submatrix.
+
+        Args:
+            con_i: ConI used to send the requests.
+            submatrix_iid: Id of the submatrix the samples are appended to.
+            capacity: Number of samples per column buffered before they are sent.
+            max_interval: Maximal age of a pending sample in seconds checked by `append` and `poll`.
+                None only flushes on size and on `flush`.
+
+        Raises:
+            ValueError: If capacity is not positive, the submatrix does not exist or one of its
+                local columns stores its values in a way samples can not be appended to.
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}.")
+        self.__con_i = con_i
+        self.__submatrix_iid = submatrix_iid
+        self.__capacity = capacity
+        self.__max_interval = max_interval
+        self.__oldest: float | None = None
+        self.__pending_rows = 0
+
+        submatrix_df = con_i.query_data({"AoSubMatrix": {"id": submatrix_iid}, "$attributes": {"number_of_rows": 1}})
+        if submatrix_df.empty:
+            raise ValueError(f"SubMatrix with id {submatrix_iid} does not exist.")
+        self.__number_of_rows = int(submatrix_df.iloc[0, 0])  # type: ignore[arg-type]
+
+        local_column_entity = con_i.mc.entity_by_base_name("AoLocalColumn")
+        attributes = {"id": 1, "name": 1, "sequence_representation": 1, "measurement_quantity.datatype": 1}
+        has_raw_datatype = con_i.mc.attribute_no_throw(local_column_entity, "raw_datatype") is not None
+        if has_raw_datatype:
+            attributes["raw_datatype"] = 1
+        local_columns_df = con_i.query_data(
+            {"AoLocalColumn": {"submatrix": submatrix_iid}, "$attributes": attributes},
+            result_naming_mode="query",
+        )
+        self.__ids: dict[str, int] = {}
+        self.__buffers: dict[str, _RingBuffer] = {}
+        self.__implicit: set[str] = set()
+        self.__raw: set[str] = set()
+        for local_column in local_columns_df.to_dict("records"):
+            name = str(local_column["name"])
+            sequence_representation = SeqRepEnum(int(local_column["sequence_representation"]))
+            if sequence_representation in (
+                SeqRepEnum.implicit_constant,
+                SeqRepEnum.implicit_linear,
+                SeqRepEnum.implicit_saw,
+            ):
+                # implicit columns grow with number_of_rows
+                self.__implicit.add(name)
+                continue
+            if sequence_representation not in (
+                SeqRepEnum.explicit,
+                SeqRepEnum.raw_linear,
+                SeqRepEnum.raw_polynomial,
+                SeqRepEnum.raw_linear_calibrated,
+                SeqRepEnum.raw_rational,
+            ):
+                raise ValueError(f"Can not append to local column '{name}' using '{sequence_representation.name}'.")
+            data_type = local_column["measurement_quantity.datatype"]
+            if sequence_representation != SeqRepEnum.explicit:
+                self.__raw.add(name)
+                if has_raw_datatype:
+                    raw_datatype = local_column["raw_datatype"]
+                    data_type = raw_datatype if not pd.isna(raw_datatype) else data_type
+            self.__ids[name] = int(local_column["id"])
+            self.__buffers[name] = _RingBuffer(capacity, DTYPES.get(int(data_type), object))
+
+    def __enter__(self) -> StreamAppender:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, exc_traceback: object
+    ) -> None:
+        if exc_type is None:
+            self.flush()
+
+    @property
+    def column_names(self) -> list[str]:
+        """Names of the local columns samples are appended to. Implicit columns are not contained."""
+        return list(self.__buffers)
+
+    @property
+    def number_of_rows(self) -> int:
+        """Number of rows of the submatrix written to the server."""
+        return self.__number_of_rows
+
+    @property
+    def pending_rows(self) -> int:
+        """Number of buffered rows not sent yet."""
+        return self.__pending_rows
+
+    def append(self, samples: Mapping[str, Any]) -> None:
+        """
+        Append rows to the buffers and send them if a threshold is reached.
+
+        Args:
+            samples: Equally long arrays or scalars by column name. Has to contain all `column_names`.
+                Values of implicit columns are ignored. Columns using a raw sequence representation
+                take raw values.
+
+        Raises:
+            ValueError: If a column is missing, not a local column of the submatrix, the columns differ
+                in length or raw values do not fit the raw data type of their column.
+            requests.HTTPError: If a flush fails.
+        """
+        arrays: dict[str, np.ndarray] = {}
+        for name, values in samples.items():
+            if name not in self.__buffers and name not in self.__implicit:
+                raise ValueError(f"Column '{name}' is not a local column of submatrix {self.__submatrix_iid}.")
+            arrays[name] = np.atleast_1d(np.asarray(values))
+        missing = [name for name in self.__buffers if name not in arrays]
+        if missing:
+            raise ValueError(f"Samples are missing the columns {missing}.")
+        lengths = {len(values) for values in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"All columns must have the same length, got {sorted(lengths)}.")
+        rows = lengths.pop() if lengths else 0
+        for name in self.__raw:
+            self.__check_raw(name, arrays[name])
+
+        start = 0
+        while start < rows:
+            stop = min(rows, start + self.__capacity - self.pending_rows)
+            for name, buffer in self.__buffers.items():
+                buffer.write(arrays[name][start:stop])
+            self.__pending_rows += stop - start
+            if self.__oldest is None:
+                self.__oldest = time.monotonic()
+            start = stop
+            if self.pending_rows == self.__capacity:
+                self.flush()
+        self.poll()
+
+    def __check_raw(self, name: str, values: np.ndarray) -> None:
+        dtype = self.__buffers[name].values.dtype
+        if dtype.kind not in "iu" or values.size == 0:
+            return
+        if values.dtype.kind not in "biu":
+            raise ValueError(f"Column '{name}' takes raw {dtype} values, got {values.dtype}.")
+        info = np.iinfo(dtype)
+        if values.min() < info.min or values.max() > info.max:
+            raise ValueError(f"Raw values of column '{name}' exceed the range of {dtype}.")
+
+    def poll(self) -> None:
+        """
+        Send the buffered rows if the oldest of them is older than `max_interval`.
+        Call it regularly if samples may stop arriving.
+
+        Raises:
+            requests.HTTPError: If the flush fails.
+        """
+        if (
+            self.__max_interval is not None
+            and self.__oldest is not None
+            and time.monotonic() - self.__oldest >= self.__max_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Send the buffered rows with a single request.
+
+        Raises:
+            requests.HTTPError: If the request fails. The rows stay buffered.
+        """
+        rows = self.pending_rows
+        if rows == 0:
+            return
+        mc = self.__con_i.mc
+        request = ods.DataMatrices()
+        if self.__buffers:
+            local_columns = from_pandas(
+                pd.DataFrame(
+                    {
+                        "id": list(self.__ids.values()),
+                        "values": [buffer.pending() for buffer in self.__buffers.values()],
+                    }
+                ),
+                mc.entity_by_base_name("AoLocalColumn"),
+                mc,
+            )
+            local_columns.matrices[0].values_start = self.__number_of_rows
+            local_columns.matrices[0].values_update_mode = ods.DataMatrix.VU_APPEND
+            request.matrices.extend(local_columns.matrices)
+        submatrix = from_pandas(
+            pd.DataFrame({"id": [self.__submatrix_iid], "number_of_rows": [self.__number_of_rows + rows]}),
+            mc.entity_by_base_name("AoSubmatrix"),
+            mc,
+        )
+        request.matrices.extend(submatrix.matrices)
+        self.__con_i.data_update(request)
+        self._log.debug("Appended %d rows to submatrix %d at row %d", rows, self.__submatrix_iid, self.__number_of_rows)
+
+        self.__number_of_rows += rows
+        for buffer in self.__buffers.values():
+            buffer.drop()
+        self.__pending_rows = 0
+        self.__oldest = None
@@ -19,6 +19,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from odsbox.batch_writer import BatchWriter
+
 if TYPE_CHECKING:
     from .con_i import ConI
 
@@ -51,6 +53,8 @@ class Transaction:
             con_i: ConI instance to start the transaction on.
         """
 
+        # set before the request, abort is called by __del__ if it fails
+        self.__batch_writers: list[BatchWriter] = []
         con_i.transaction_create()
         self.__con_i = con_i
 
@@ -65,18 +69,52 @@ class Transaction:
     ) -> None:
         self.abort()
 
+    def batch_writer(self, max_rows: int = 1000) -> BatchWriter:
+        """
+        Create a BatchWriter that is flushed before the transaction is committed.
+        Its pending rows are discarded if the transaction is aborted.
+
+        Example::
+
+            with con_i.transaction() as transaction:
+                batch = transaction.batch_writer()
+                unit_id = batch.create("AoUnit", {"name": "km/h", "factor": 1 / 3.6, "phys_dimension": 4})
+                transaction.commit()
+            print(unit_id.result())
+
+        Args:
+            max_rows: Number of rows of an entity and operation that trigger a flush of its buffer.
+
+        Returns:
+            BatchWriter sending its requests inside this transaction.
+
+        Raises:
+            ValueError: If the transaction is already finished.
+        """
+        if self.__con_i is None:
+            raise ValueError("Transaction already finished.")
+        batch_writer = BatchWriter(self.__con_i, max_rows)
+        self.__batch_writers.append(batch_writer)
+        return batch_writer
+
     def commit(self) -> None:
         """
-        Commit the transaction.
+        Commit the transaction. Batch writers created by `batch_writer` are flushed before.
         """
         if self.__con_i is not None:
+            for batch_writer in self.__batch_writers:
+                batch_writer.flush()
             self.__con_i.transaction_commit()
             self.__con_i = None
+            self.__batch_writers = []
 
     def abort(self) -> None:
         """
-        Aborts the transaction.
+        Aborts the transaction. Pending rows of batch writers created by `batch_writer` are discarded.
         """
+        for batch_writer in self.__batch_writers:
+            batch_writer.clear()
+        self.__batch_writers = []
         if self.__con_i is not None:
             self.__con_i.transaction_abort()
             self.__con_i = None
@@ -0,0 +1,143 @@
+"""unit names shared between sessions and optionally processes"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .con_i import ConI
+
+
+class UnitCache:
+    """
+    Cache of the AoUnit instances of ASAM ODS servers shared by all sessions of a process.
+
+    Units are stored by server URL and loaded again if they are older than `ttl_seconds`.
+    If a `directory` is given the units are additionally stored as JSON file so that processes
+    sharing the directory do not query them again. `UnitCatalog` and `BulkReader` use the
+    process wide `default` instance. Creating units with `UnitCatalog` invalidates the entry.
+
+    Example::
+
+        from odsbox.unit_cache import UnitCache
+
+        UnitCache.default().directory = "/data/odsbox_cache"
+        UnitCache.default().ttl_seconds = 600.0
+
+    Remark: Units created by other clients are not visible before the entry expires. Set
+    `ttl_seconds` to 0 to query the units each time they are requested.
+    """
+
+    __log: logging.Logger = logging.getLogger(__name__)
+    __default: UnitCache | None = None
+
+    def __init__(self, ttl_seconds: float = 60.0, directory: str | None = None) -> None:
+        """
+        Create a unit cache.
+
+        Args:
+            ttl_seconds: Age in seconds after which the units of a server are queried again.
+            directory: Folder to store the units in. It is created if it does not exist and
+                can be shared between processes. None keeps the units in memory only.
+        """
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.directory = directory
+        self.__lock = threading.Lock()
+        self.__entries: dict[str, tuple[float, dict[int, str]]] = {}
+
+    @classmethod
+    def default(cls) -> UnitCache:
+        """
+        Get the unit cache shared by all sessions of the process.
+
+        Returns:
+            The process wide instance.
+        """
+        if cls.__default is None:
+            cls.__default = UnitCache()
+        return cls.__default
+
+    def unit_names(self, con_i: ConI, update: bool = False) -> dict[int, str]:
+        """
+        Get the unit names by id of the server of a session.
+
+        Args:
+            con_i: Session used to query the units if they are not cached or expired.
+            update: If True, the units are queried even if they are cached.
+
+        Returns:
+            Copy of the cached unit names by unit id in the order delivered by the server.
+
+        Raises:
+            requests.HTTPError: If the query fails.
+        """
+        server = con_i.url
+        with self.__lock:
+            entry = None if update else self.__entries.get(server)
+            if entry is None or not self.__is_valid(entry[0]):
+                entry = None if update else self.__read(server)
+                if entry is None:
+                    units_df = con_i.query_data({"AoUnit": {}, "$attributes": {"id": 1, "name": 1}})
+                    units: dict[int, str] = {}
+                    if units_df.shape[0] > 0:
+                        units = dict(zip(units_df.iloc[:, 0].astype("int64").tolist(), units_df.iloc[:, 1].tolist()))
+                    entry = (time.time(), units)
+                    self.__write(server, entry)
+                    self.__log.debug("Loaded %d units of '%s'", len(units), server)
+                self.__entries[server] = entry
+            return dict(entry[1])
+
+    def invalidate(self, server: str) -> None:
+        """
+        Remove the units of a server from memory and from the directory.
+
+        Args:
+            server: URL of the ASAM ODS server, see `ConI.url`.
+        """
+        with self.__lock:
+            self.__entries.pop(server, None)
+            if self.directory is not None:
+                try:
+                    os.remove(self.__path(server))
+                except OSError:
+                    pass  # not stored or removed by another process
+
+    def __is_valid(self, loaded: float) -> bool:
+        return time.time() - loaded < self.ttl_seconds
+
+    def __read(self, server: str) -> tuple[float, dict[int, str]] | None:
+        if self.directory is None:
+            return None
+        try:
+            with open(self.__path(server), encoding="utf-8") as units_file:
+                content = json.load(units_file)
+            entry = float(content["loaded"]), {int(iid): str(name) for iid, name in content["units"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return entry if content["server"] == server and self.__is_valid(entry[0]) else None
+
+    def __write(self, server: str, entry: tuple[float, dict[int, str]]) -> None:
+        if self.directory is None:
+            return
+        content = json.dumps({"server": server, "loaded": entry[0], "units": list(entry[1].items())})
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                tmp_file.write(content)
+            os.replace(tmp_path, self.__path(server))
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.__log.warning("Failed to store units of '%s': %s", server, e)
+
+    def __path(self, server: str) -> str:
+        return os.path.join(self.directory or "", "units_" + hashlib.sha1(server.encode("utf-8")).hexdigest() + ".json")
@@ -3,30 +3,38 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .con_i import ConI
 
 import odsbox.proto.ods_pb2 as ods
+from odsbox.unit_cache import UnitCache
 
 
 class UnitCatalog:
     """
     This class caches the units stored in the ASAM ODS server.
     If a Unit does not exist it is created with a physical dimension `unknown`.
+    The units are taken from a `UnitCache` shared with other sessions to the same server.
     """
 
     __log: logging.Logger = logging.getLogger(__name__)
 
-    def __init__(self, con_i: ConI) -> None:
+    def __init__(self, con_i: ConI, unit_cache: UnitCache | None = None) -> None:
+        """
+        Load the units of the server.
+
+        Args:
+            con_i: Session used to query and create units.
+            unit_cache: Cache the units are taken from. Defaults to `UnitCache.default()`.
+        """
         self.__con_i = con_i
-        units_df = con_i.query_data({"AoUnit": {}, "$attributes": {"name": 1, "id": 1}})
-        self.__unit_map: dict[str, int] = {}
-        for _, row in units_df.iterrows():
-            unit_name = row.iloc[0]
-            unit_id = row.iloc[1]
-            self.__unit_map[unit_name] = unit_id
+        self.__unit_cache = unit_cache if unit_cache is not None else UnitCache.default()
+        self.__unit_map: dict[str, int] = {
+            name: unit_id for unit_id, name in self.__unit_cache.unit_names(con_i).items()
+        }
 
         self.unknown_physical_dimension: int | None = None
 
@@ -54,15 +62,26 @@ class UnitCatalog:
         Returns:
             The unit id if the unit exists.
         """
-        if unit_name is None or "" == unit_name:
-            # Unit is obligatory
-            return self.get_or_create("-")
-        rv = self.__unit_map.get(unit_name)
-        if rv is not None:
-            return rv
-        new_unit_id = self.create(unit_name)
-        self.__unit_map[unit_name] = new_unit_id
-        return new_unit_id
+        return self.get_or_create_many([unit_name])[0]
+
+    def get_or_create_many(self, unit_names: Iterable[str | None]) -> list[int]:
+        """
+        Get units by their case sensitive names and create all missing ones with a single request
+        using an unknown physical dimension.
+
+        Args:
+            unit_names: Case sensitive names of units. Empty names and None are mapped to the unit `-`.
+
+        Returns:
+            The unit ids in order of `unit_names`.
+        """
+        # Unit is obligatory
+        names = ["-" if unit_name is None or "" == unit_name else unit_name for unit_name in unit_names]
+        missing = list(dict.fromkeys(name for name in names if name not in self.__unit_map))
+        if missing:
+            physical_dimension_id = self.__get_or_create_unknown_physical_dimension()
+            self.__unit_map.update(zip(missing, self.__create_auto_units(missing, physical_dimension_id)))
+        return [self.__unit_map[name] for name in names]
 
     def create(self, unit_name: str) -> int:
         """
@@ -75,8 +94,7 @@ class UnitCatalog:
             The unit id of the created unit.
         """
         physical_dimension_id = self.__get_or_create_unknown_physical_dimension()
-        unit_id = self.__create_auto_unit(unit_name, physical_dimension_id)
-        return unit_id
+        return self.__create_auto_units([unit_name], physical_dimension_id)[0]
 
     def __get_or_create_unknown_physical_dimension(self) -> int:
         if self.unknown_physical_dimension is None:
@@ -139,19 +157,26 @@ class UnitCatalog:
 
         return physical_dimension_id
 
-    def __create_auto_unit(self, name: str, physical_dimension_id: int) -> int:
+    def __create_auto_units(self, names: list[str], physical_dimension_id: int) -> list[int]:
         unit = self.__con_i.mc.entity_by_base_name("AoUnit")
+        rows = len(names)
         ts = ods.DataMatrices()
         dm = ts.matrices.add(aid=unit.aid)
-        dm.columns.add(name=self.__con_i.mc.attribute_by_base_name(unit, "name").name).string_array.values[:] = [name]
+        dm.columns.add(name=self.__con_i.mc.attribute_by_base_name(unit, "name").name).string_array.values[:] = names
         dm.columns.add(name=self.__con_i.mc.attribute_by_base_name(unit, "mime_type").name).string_array.values[:] = [
             "application/x-asam.aounit"
-        ]
-        dm.columns.add(name=self.__con_i.mc.attribute_by_base_name(unit, "factor").name).double_array.values[:] = [1.0]
-        dm.columns.add(name=self.__con_i.mc.attribute_by_base_name(unit, "offset").name).double_array.values[:] = [0.0]
+        ] * rows
+        dm.columns.add(name=self.__con_i.mc.attribute_by_base_name(unit, "factor").name).double_array.values[:] = [
+            1.0
+        ] * rows
+        dm.columns.add(name=self.__con_i.mc.attribute_by_base_name(unit, "offset").name).double_array.values[:] = [
+            0.0
+        ] * rows
         dm.columns.add(name=self.__con_i.mc.relation_by_base_name(unit, "phys_dimension").name).longlong_array.values[
             :
-        ] = [physical_dimension_id]
+        ] = [physical_dimension_id] * rows
 
         ids = self.__con_i.data_create(ts)
-        return ids[0]
+        self.__log.debug("Created %d units", len(ids))
+        self.__unit_cache.invalidate(self.__con_i.url)
+        return ids
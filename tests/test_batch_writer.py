@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+from google.protobuf.json_format import Parse
+
+import odsbox.proto.ods_pb2 as ods
+from odsbox.batch_writer import BatchWriter
+from odsbox.datamatrices_to_pandas import to_pandas
+from odsbox.model_cache import ModelCache
+from odsbox.transaction import Transaction
+
+
+def _get_model():
+    model_file = os.path.join(os.path.abspath(os.path.dirname(__file__)), "test_data", "application_model.json")
+    model = ods.Model()
+    Parse(Path(model_file).read_text(encoding="utf-8"), model)
+    return model
+
+
+class _FakeConI:
+    def __init__(self):
+        self.mc = ModelCache(_get_model())
+        self.calls: list[tuple[str, ods.DataMatrices | None]] = []
+        self.fail = False
+        self.__next_id = 1
+
+    def data_create(self, data: ods.DataMatrices) -> list[int]:
+        if self.fail:
+            raise RuntimeError("server error")
+        self.calls.append(("create", data))
+        rows = len(data.matrices[0].columns[0].string_array.values)
+        ids = list(range(self.__next_id, self.__next_id + rows))
+        self.__next_id += rows
+        return ids
+
+    def data_update(self, data: ods.DataMatrices) -> None:
+        self.calls.append(("update", data))
+
+    def data_delete(self, data: ods.DataMatrices) -> None:
+        self.calls.append(("delete", data))
+
+    def transaction_create(self) -> None:
+        self.calls.append(("transaction-create", None))
+
+    def transaction_commit(self) -> None:
+        self.calls.append(("transaction-commit", None))
+
+    def transaction_abort(self) -> None:
+        self.calls.append(("transaction-abort", None))
+
+
+def test_batch_writer_buffers_rows_per_entity():
+    con_i = _FakeConI()
+    with BatchWriter(con_i, max_rows=4) as batch:  # type: ignore[arg-type]
+        ids = [batch.create("AoMeasurement", {"name": f"m{index}", "test": 7}) for index in range(6)]
+        assert len(con_i.calls) == 1 and batch.pending_rows == 2
+        batch.update("MeaResult", {"id": 5, "Size": 10})
+        # updates of different attributes are not combined, missing cells would be written as null
+        batch.update("MeaResult", {"id": 6, "description": "changed"})
+        batch.delete("MeaResult", 9)
+        assert not ids[5].done()
+
+    assert [operation for operation, _ in con_i.calls] == ["create", "update", "create", "update", "delete"]
+    assert [future.result() for future in ids] == [1, 2, 3, 4, 5, 6]
+    created = to_pandas(con_i.calls[2][1])
+    assert list(created["MeaResult.Name"]) == ["m4", "m5"]
+    assert list(created["MeaResult.TestStep"]) == [7, 7]
+    assert [column.name for column in con_i.calls[1][1].matrices[0].columns] == ["Id", "Size"]
+    assert [column.name for column in con_i.calls[3][1].matrices[0].columns] == ["Id", "Description"]
+    assert list(con_i.calls[4][1].matrices[0].columns[0].longlong_array.values) == [9]
+
+
+def test_batch_writer_combines_updates_of_the_same_attributes_only():
+    con_i = _FakeConI()
+    with BatchWriter(con_i) as batch:  # type: ignore[arg-type]
+        batch.update("MeaResult", {"id": 1, "name": "a"})
+        batch.update("MeaResult", {"id": 2, "name": "b"})
+        batch.update("MeaResult", {"id": 3, "description": "c"})
+        batch.update("MeaResult", {"id": 4, "description": "d"})
+        batch.update("MeaResult", {"id": 1, "name": "e"})
+
+    updates = [to_pandas(data) for _, data in con_i.calls]
+    assert [list(update.columns) for update in updates] == [
+        ["MeaResult.Id", "MeaResult.Name"],
+        ["MeaResult.Id", "MeaResult.Description"],
+        ["MeaResult.Id", "MeaResult.Name"],
+    ]
+    assert [list(update.iloc[:, 1]) for update in updates] == [["a", "b"], ["c", "d"], ["e"]]
+    assert all(not any(column.is_null) for _, data in con_i.calls for column in data.matrices[0].columns)
+
+
+def test_batch_writer_resolves_futures_in_dependency_order():
+    con_i = _FakeConI()
+    batch = BatchWriter(con_i)  # type: ignore[arg-type]
+    submatrices = []
+    for index in range(3):
+        measurement = batch.create("MeaResult", {"name": f"m{index}"})
+        submatrices.append(batch.create("SubMatrix", {"name": f"sm{index}", "measurement": measurement}))
+    batch.update("SubMatrix", {"id": submatrices[0], "number_of_rows": 5})
+    assert con_i.calls == []
+
+    # a relation within the same entity needs the id before the row can be buffered
+    batch.create("SubMatrix", {"name": "y", "x-axis-for-y-axis": submatrices[1]})
+    assert [to_pandas(data).columns[0] for _, data in con_i.calls] == ["MeaResult.Name", "SubMatrix.Name"]
+    batch.flush()
+
+    assert [operation for operation, _ in con_i.calls] == ["create", "create", "update", "create"]
+    assert list(to_pandas(con_i.calls[1][1])["SubMatrix.MeaResult"]) == [1, 2, 3]
+    assert list(to_pandas(con_i.calls[2][1])["SubMatrix.Id"]) == [4]
+    assert list(to_pandas(con_i.calls[3][1])["SubMatrix.x-axis-for-y-axis"]) == [5]
+    assert batch.pending_rows == 0
+
+
+def test_batch_writer_errors():
+    con_i = _FakeConI()
+    batch = BatchWriter(con_i)  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="'id'"):
+        batch.update("MeaResult", {"name": "x"})
+    with pytest.raises(ValueError, match="this BatchWriter"):
+        batch.create("SubMatrix", {"name": "sm", "measurement": Future()})
+
+    future = batch.create("MeaResult", {"name": "m"})
+    con_i.fail = True
+    with pytest.raises(RuntimeError):
+        batch.flush()
+    assert isinstance(future.exception(), RuntimeError)
+
+    with pytest.raises(ValueError, match="positive"):
+        BatchWriter(con_i, max_rows=0)  # type: ignore[arg-type]
+
+
+def test_transaction_flushes_batch_writer_before_commit():
+    con_i = _FakeConI()
+    with Transaction(con_i) as transaction:  # type: ignore[arg-type]
+        measurement = transaction.batch_writer().create("MeaResult", {"name": "m"})
+        transaction.commit()
+    assert [operation for operation, _ in con_i.calls] == ["transaction-create", "create", "transaction-commit"]
+    assert measurement.result() == 1
+
+    con_i.calls.clear()
+    with Transaction(con_i) as transaction:  # type: ignore[arg-type]
+        measurement = transaction.batch_writer().create("MeaResult", {"name": "m"})
+    assert [operation for operation, _ in con_i.calls] == ["transaction-create", "transaction-abort"]
+    assert measurement.cancelled()
+    with pytest.raises(ValueError, match="finished"):
+        transaction.batch_writer()
+
+
+def test_transactions_do_not_share_batch_writers():
+    con_i = _FakeConI()
+    first, second = Transaction(con_i), Transaction(con_i)  # type: ignore[arg-type]
+    first.batch_writer().create("MeaResult", {"name": "m"})
+    second.commit()
+    assert [operation for operation, _ in con_i.calls] == ["transaction-create"] * 2 + ["transaction-commit"]
+    first.abort()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+from odsbox.bulk_cache import BulkCache
+
+
+def test_key_depends_on_all_parts():
+    key = BulkCache.key("http://server/api", 1, 0, 0, True, "10")
+    assert key == BulkCache.key("http://server/api", 1, 0, 0, True, "10")
+    assert key != BulkCache.key("http://other/api", 1, 0, 0, True, "10")
+    assert key != BulkCache.key("http://server/api", 2, 0, 0, True, "10")
+    assert key != BulkCache.key("http://server/api", 1, 5, 0, True, "10")
+    assert key != BulkCache.key("http://server/api", 1, 0, 5, True, "10")
+    assert key != BulkCache.key("http://server/api", 1, 0, 0, False, "10")
+    assert key != BulkCache.key("http://server/api", 1, 0, 0, True, "11")
+
+
+def test_put_and_get(tmp_path):
+    cache = BulkCache(str(tmp_path))
+    key = BulkCache.key("s", 1, 0, 0, True, "3")
+
+    assert cache.get(key) is None
+    assert cache.put(key, np.array([1.0, 2.0, 3.0]), 42)
+
+    cached = cache.get(key)
+    assert cached is not None
+    values, unit_id = cached
+    assert isinstance(values, np.memmap)
+    assert not values.flags.writeable
+    assert values.tolist() == [1.0, 2.0, 3.0]
+    assert unit_id == 42
+
+
+def test_non_numeric_values_are_skipped(tmp_path):
+    cache = BulkCache(str(tmp_path))
+    key = BulkCache.key("s", 1, 0, 0, True, "2")
+
+    assert not cache.put(key, np.array(["a", "b"], dtype=object), 0)
+    assert cache.get(key) is None
+    assert cache.size_bytes() == 0
+
+
+def test_lru_eviction(tmp_path):
+    array = np.zeros(1000, dtype=np.float64)
+    entry_size = array.nbytes + 128  # npy header
+    cache = BulkCache(str(tmp_path), max_size_bytes=2 * entry_size)
+
+    keys = [BulkCache.key("s", lc_id, 0, 0, True, "1000") for lc_id in range(3)]
+    cache.put(keys[0], array, 0)
+    cache.put(keys[1], array, 0)
+    # make key 1 the oldest and key 0 recently used
+    os.utime(os.path.join(str(tmp_path), keys[1] + ".npy"), (1, 1))
+    cache.get(keys[0])
+    cache.put(keys[2], array, 0)
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+    assert cache.size_bytes() <= 2 * entry_size
+
+
+def test_clear(tmp_path):
+    cache = BulkCache(str(tmp_path))
+    key = BulkCache.key("s", 1, 0, 0, True, "1")
+    cache.put(key, np.array([1], dtype=np.int32), 0)
+
+    cache.clear()
+    assert cache.get(key) is None
+    assert os.listdir(str(tmp_path)) == []
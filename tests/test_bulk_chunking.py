@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+
+import odsbox.proto.ods_pb2 as ods
+from odsbox.bulk_chunking import VARIABLE_SIZE_BYTES, ChunkSizer
+
+
+def test_row_bytes():
+    assert ChunkSizer.row_bytes([ods.DT_DOUBLE, ods.DT_FLOAT, ods.DT_SHORT, ods.DT_BYTE]) == 15
+    assert ChunkSizer.row_bytes([ods.DT_STRING, ods.DT_UNKNOWN]) == 2 * VARIABLE_SIZE_BYTES
+    assert ChunkSizer.row_bytes([]) == 0
+
+
+def test_rows_from_budget():
+    row_bytes = ChunkSizer.row_bytes([ods.DT_DOUBLE] * 2000)
+    assert ChunkSizer(480_000_000, row_bytes).rows == 10_000
+    assert ChunkSizer(480_000_000, ChunkSizer.row_bytes([ods.DT_DOUBLE] * 10)).rows == 2_000_000
+    assert ChunkSizer(480_000_000, row_bytes, max_rows=500).rows == 500
+    assert ChunkSizer(10, row_bytes, min_rows=100).rows == 100
+
+    with pytest.raises(ValueError):
+        ChunkSizer(0, row_bytes)
+    with pytest.raises(ValueError):
+        ChunkSizer(100, row_bytes, min_rows=0)
+
+
+def test_observe_memory():
+    sizer = ChunkSizer(3_000_000, 100)
+    assert sizer.rows == 10_000
+
+    # larger rows are taken over immediately
+    sizer.observe(10_000, 4_000_000, 1.0)
+    assert sizer.estimated_row_bytes == 400
+    assert sizer.rows == 2_500
+
+    # smaller rows are averaged
+    sizer.observe(2_500, 500_000, 1.0)
+    assert sizer.estimated_row_bytes == 300
+    assert sizer.rows == 3_333
+
+    rows = sizer.rows
+    sizer.observe(0, 0, 1.0)
+    assert sizer.rows == rows
+
+
+def test_observe_latency():
+    sizer = ChunkSizer(3_000_000, 1, max_seconds=10.0)
+    assert sizer.rows == 1_000_000
+
+    # a slow chunk shrinks the next one proportionally
+    sizer.observe(1_000_000, 1_000_000, 40.0)
+    assert sizer.rows == 250_000
+
+    # fast chunks grow by at most a factor of two
+    sizer.observe(250_000, 250_000, 0.1)
+    assert sizer.rows == 500_000
+    sizer.observe(500_000, 500_000, 0.1)
+    sizer.observe(1_000_000, 1_000_000, 0.1)
+    assert sizer.rows == 1_000_000
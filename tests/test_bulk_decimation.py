@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from odsbox.bulk_decimation import Decimator
+
+
+def _decimate(y, points, method, chunk_rows, x=None):
+    x = np.arange(len(y), dtype=np.float64) if x is None else x
+    decimator = Decimator(len(y), points, method)
+    for start in range(0, len(y), chunk_rows):
+        rows = np.arange(start, min(start + chunk_rows, len(y)))
+        decimator.add(rows, x[rows], y[rows])
+    return decimator.finish()
+
+
+def _lttb_reference(x, y, points):
+    edges = np.round(np.linspace(1, len(x) - 1, points - 1)).astype(int)
+    selected = [0]
+    for i in range(points - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 1 < points - 2:
+            next_x, next_y = x[edges[i + 1] : edges[i + 2]].mean(), y[edges[i + 1] : edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        a = selected[-1]
+        area = np.abs((x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a]))
+        selected.append(start + int(np.argmax(area)))
+    selected.append(len(x) - 1)
+    return np.array(selected)
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_result_does_not_depend_on_chunk_size(method):
+    y = np.random.default_rng(1).normal(size=100_003).cumsum()
+    y[500] = 1000.0
+    y[70_000] = -1000.0
+
+    rows, _, values = _decimate(y, 1000, method, 100_003)
+
+    assert len(rows) == 1000
+    assert np.all(np.diff(rows) > 0)
+    assert 500 in rows and 70_000 in rows
+    np.testing.assert_array_equal(values, y[rows])
+    for chunk_rows in (100, 7919):
+        np.testing.assert_array_equal(_decimate(y, 1000, method, chunk_rows)[0], rows)
+
+
+def test_minmax_keeps_extrema_of_each_bucket():
+    y = np.array([3.0, 1.0, 2.0, 9.0, 5.0, np.nan, 4.0, 0.0])
+
+    rows, _, values = _decimate(y, 4, "minmax", 3)
+
+    assert rows.tolist() == [1, 3, 4, 7]
+    assert values.tolist() == [1.0, 9.0, 5.0, 0.0]
+
+
+def test_lttb_matches_reference():
+    rng = np.random.default_rng(2)
+    x = np.sort(rng.uniform(0.0, 100.0, 5000))
+    y = rng.normal(size=5000)
+
+    rows, _, _ = _decimate(y, 100, "lttb", 333, x=x)
+
+    np.testing.assert_array_equal(rows, _lttb_reference(x, y, 100))
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_short_channels_are_returned_completely(method):
+    y = np.arange(10, dtype=np.float64)
+    assert _decimate(y, 100, method, 4)[0].tolist() == list(range(10))
+    assert _decimate(y[:1], 100, method, 4)[0].tolist() == [0]
+    assert len(_decimate(y[:0], 100, method, 4)[0]) == 0
+
+
+def test_gaps_between_chunks():
+    y = np.random.default_rng(3).normal(size=1000)
+    decimator = Decimator(1000, 20, "lttb")
+    for start in (0, 450, 900):
+        rows = np.arange(start, start + 100)
+        decimator.add(rows, rows.astype(np.float64), y[rows])
+    rows, _, _ = decimator.finish()
+
+    assert rows[0] == 0 and rows[-1] == 999
+    assert np.all(np.diff(rows) > 0)
+    assert all(0 <= r < 100 or 450 <= r < 550 or 900 <= r < 1000 for r in rows)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        Decimator(10, 100, "mean")
+    with pytest.raises(ValueError):
+        Decimator(10, 2, "lttb")
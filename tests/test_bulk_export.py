@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+import pytest
+
+from odsbox.bulk_export import write_chunks
+
+
+def _chunks():
+    for start in range(0, 6, 2):
+        df = pd.DataFrame({"Time": [float(start), float(start + 1)], "Name": [f"n{start}", f"n{start + 1}"]})
+        df.attrs["unit_names"] = {"Time": "s", "Name": ""}
+        yield df
+
+
+def test_write_parquet_row_groups_and_units(tmp_path):
+    pa_parquet = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "out.parquet")
+
+    assert write_chunks(_chunks(), path, format="parquet") == 6
+
+    parquet_file = pa_parquet.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups == 3
+    schema = parquet_file.schema_arrow
+    assert schema.field("Time").metadata == {b"unit": b"s"}
+    assert json.loads(schema.metadata[b"unit_names"]) == {"Time": "s", "Name": ""}
+    assert pd.read_parquet(path)["Time"].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_write_arrow_record_batches(tmp_path):
+    pa_ipc = pytest.importorskip("pyarrow.ipc")
+    path = str(tmp_path / "out.arrow")
+
+    assert write_chunks(_chunks(), path, format="arrow") == 6
+
+    with pa_ipc.open_file(path) as reader:
+        assert reader.num_record_batches == 3
+        assert reader.schema.field("Time").metadata == {b"unit": b"s"}
+        assert reader.read_all().num_rows == 6
+
+
+def test_write_hdf5(tmp_path):
+    pytest.importorskip("tables")
+    path = str(tmp_path / "out.h5")
+
+    assert write_chunks(_chunks(), path, format="hdf5") == 6
+
+    with pd.HDFStore(path, mode="r") as store:
+        assert store.get_storer("data").attrs.unit_names == {"Time": "s", "Name": ""}
+        assert store["data"]["Name"].tolist() == ["n0", "n1", "n2", "n3", "n4", "n5"]
+
+
+def test_write_hdf5_continues_index_and_grows_strings(tmp_path, monkeypatch):
+    pytest.importorskip("tables")
+    path = str(tmp_path / "out.h5")
+    names = ["a", "b", "a much longer name 21", "c", "d", "e"]
+    chunks = [pd.DataFrame({"Time": [float(i), float(i + 1)], "Name": names[i : i + 2]}) for i in range(0, 6, 2)]
+
+    assert write_chunks(chunks, path, format="hdf5") == 6
+
+    with pd.HDFStore(path, mode="r") as store:
+        df = store["data"]
+    assert df.index.tolist() == [0, 1, 2, 3, 4, 5]
+    assert df["Name"].tolist() == names
+
+    monkeypatch.setattr("odsbox.bulk_export.HDF5_MIN_STRING_ITEMSIZE", 4)
+    with pytest.raises(ValueError, match="column 'Name' exceeds the 4 characters"):
+        write_chunks(chunks, path, format="hdf5")
+
+
+def test_write_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        write_chunks(_chunks(), str(tmp_path / "out.csv"), format="csv")
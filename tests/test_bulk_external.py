@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from google.protobuf.json_format import Parse
+
+import odsbox.proto.ods_pb2 as ods
+from odsbox.bulk_external import ExternalComponentReader, component_values
+from odsbox.bulk_reader import SeqRepEnum
+from odsbox.model_cache import ModelCache
+
+
+def _get_model():
+    model_file = os.path.join(os.path.abspath(os.path.dirname(__file__)), "test_data", "application_model.json")
+    model = ods.Model()
+    Parse(Path(model_file).read_text(encoding="utf-8"), model)
+    return model
+
+
+def _interleaved_file(path, rows: int) -> tuple[np.ndarray, np.ndarray]:
+    """16 byte header followed by blocks of 4 big endian int16 values and 4 little endian float64 values."""
+    ints = np.arange(rows, dtype=">i2")
+    doubles = np.linspace(0.0, 1.0, rows)
+    with open(path, "wb") as file:
+        file.write(b"\0" * 16)
+        for block_start in range(0, rows, 4):
+            # the last block is cut off after its last value
+            file.write(np.resize(ints[block_start : block_start + 4], 4).astype(">i2").tobytes())
+            file.write(doubles[block_start : block_start + 4].astype("<f8").tobytes())
+    return ints.astype(np.int16), doubles
+
+
+class _FakeConI:
+    def __init__(self, columns_df: pd.DataFrame, components_df: pd.DataFrame, model_cache: ModelCache | None = None):
+        self.columns_df = columns_df
+        self.components_df = components_df
+        self.downloads: list[tuple[ods.FileIdentifier, str]] = []
+        self.files: dict[int, str] = {}
+        self.mc = model_cache
+
+        class _Bulk:
+            def unit_name_lookup(self):
+                return {7: "s"}
+
+        self.bulk = _Bulk()
+
+    def query(self, query, **kwargs):
+        if "AoLocalColumn" in query:
+            return self.columns_df
+        return self.components_df[
+            self.components_df["local_column"].isin(query["AoExternalComponent"]["local_column"]["$in"])
+        ]
+
+    def file_access_download(self, file_identifier, target, overwrite_existing=False):
+        self.downloads.append((file_identifier, target))
+        with open(self.files[file_identifier.iid], "rb") as source, open(target, "wb") as file:
+            file.write(source.read())
+        return target
+
+
+def _columns_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": [1, 2],
+            "name": ["Counter", "Voltage"],
+            "independent": [1, 0],
+            "sequence_representation": [SeqRepEnum.raw_linear_external.value, SeqRepEnum.external_component.value],
+            "generation_parameters": [[1.0, 0.5], None],
+            "number_of_rows": [10, 10],
+            "unit": [7, 0],
+        }
+    )
+
+
+def _components_df(url: str, rows: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": [11, 12],
+            "local_column": [1, 2],
+            "ordinal_number": [1, 1],
+            "filename_url": [url, url],
+            "value_type": [7, 6],
+            "component_length": [rows, rows],
+            "start_offset": [16, 16],
+            "block_size": [40, 40],
+            "valuesperblock": [4, 4],
+            "value_offset": [0, 8],
+        }
+    )
+
+
+@pytest.mark.parametrize("start,limit", [(0, 0), (0, 10), (3, 5), (4, 4), (9, 0), (10, 0)])
+def test_component_values_interleaved(tmp_path, start, limit):
+    path = str(tmp_path / "data.bin")
+    ints, doubles = _interleaved_file(path, 10)
+    end = start + limit if limit else None
+
+    values = component_values(path, 7, 10, 16, 40, 4, 0, start=start, limit=limit)
+    assert values.dtype == np.int16
+    np.testing.assert_array_equal(values, ints[start:end])
+    values = component_values(path, 6, 10, 16, 40, 4, 8, start=start, limit=limit)
+    np.testing.assert_array_equal(values, doubles[start:end])
+
+
+def test_component_values_consecutive_is_view(tmp_path):
+    path = str(tmp_path / "data.bin")
+    np.arange(100, dtype="<f4").tofile(path)
+    values = component_values(path, 5, 100, start=10, limit=20)
+    np.testing.assert_array_equal(values, np.arange(10, 30, dtype=np.float32))
+    assert not values.flags.owndata
+    with pytest.raises(ValueError, match="not supported"):
+        component_values(path, 25, 100)
+
+
+def test_read_submatrix_local_path(tmp_path):
+    path = tmp_path / "data.bin"
+    ints, doubles = _interleaved_file(str(path), 10)
+    con_i = _FakeConI(_columns_df(), _components_df(path.as_uri(), 10))
+
+    df = ExternalComponentReader(con_i).read_submatrix(5, ["*"])  # type: ignore[arg-type]
+    assert list(df.columns) == ["Counter", "Voltage"]
+    np.testing.assert_allclose(df["Counter"], 1.0 + 0.5 * ints)
+    np.testing.assert_array_equal(df["Voltage"], doubles)
+    assert df.attrs["unit_names"] == {"Counter": "s", "Voltage": ""}
+    assert con_i.downloads == []
+
+    raw = ExternalComponentReader(con_i).read_submatrix(5, start=2, limit=3, calculate_raw=False)  # type: ignore[arg-type]
+    np.testing.assert_array_equal(raw["Counter"], ints[2:5])
+
+
+def test_read_local_columns_multiple_components_downloaded_once(tmp_path):
+    source = tmp_path / "source.bin"
+    ints, doubles = _interleaved_file(str(source), 10)
+    # the int channel is split into two components of the same file
+    components_df = _components_df("https://fileserver/measurement/data.bin", 10)
+    components_df = pd.concat(
+        [
+            components_df,
+            components_df.iloc[[0]].assign(id=13, ordinal_number=2, start_offset=16 + 40, component_length=6),
+        ],
+        ignore_index=True,
+    )
+    components_df.loc[0, "component_length"] = 4
+    model_cache = ModelCache(_get_model())
+    con_i = _FakeConI(_columns_df(), components_df.iloc[[2, 1, 0]], model_cache)
+    con_i.files = {11: str(source), 12: str(source), 13: str(source)}
+    download_folder = tmp_path / "downloads"
+    os.mkdir(download_folder)
+
+    reader = ExternalComponentReader(con_i, download_folder=str(download_folder))  # type: ignore[arg-type]
+    df = reader.read_local_columns({"submatrix": 5}, start=2, limit=6, calculate_raw=False)
+    np.testing.assert_array_equal(df["values"][0], ints[2:8])
+    np.testing.assert_array_equal(df["values"][1], doubles[2:8])
+    assert len(con_i.downloads) == 1
+    file_identifier, target = con_i.downloads[0]
+    assert file_identifier.aid == model_cache.aid("ExternalComponent")
+    assert file_identifier.attribute == "FilenameURL"
+    assert os.path.dirname(target) == str(download_folder)
@@ -1,9 +1,122 @@
 from __future__ import annotations
 
+import logging
+import os
+import time
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 import pytest
+from google.protobuf.json_format import Parse
 
+import odsbox.proto.ods_pb2 as ods
 from odsbox.bulk_reader import BulkReader, SeqRepEnum
+from odsbox.unit_cache import UnitCache
+
+
+class _FixedUnitCache(UnitCache):
+    """UnitCache returning fixed unit names without querying the server."""
+
+    def __init__(self, unit_names: dict[int, str]) -> None:
+        super().__init__()
+        self.fixed_unit_names = unit_names
+
+    def unit_names(self, con_i, update: bool = False) -> dict[int, str]:
+        return dict(self.fixed_unit_names)
+
+
+def _get_model():
+    model_file = os.path.join(os.path.abspath(os.path.dirname(__file__)), "test_data", "application_model.json")
+    model = ods.Model()
+    Parse(Path(model_file).read_text(encoding="utf-8"), model)
+    return model
+
+
+def _localcolumn_dms(rows, attributes=None):
+    """Build the DataMatrices returned by the data-read done in BulkReader.query."""
+
+    def _requested(name):
+        return attributes is None or name in attributes
+
+    dms = ods.DataMatrices()
+    lc = dms.matrices.add(aid=82, name="LocalColumn")
+    if _requested("Id"):
+        lc.columns.add(name="Id", data_type=ods.DT_LONGLONG).longlong_array.values[:] = [r["id"] for r in rows]
+    if _requested("Name"):
+        lc.columns.add(name="Name", data_type=ods.DT_STRING).string_array.values[:] = [r["name"] for r in rows]
+    if _requested("IndependentFlag"):
+        lc.columns.add(name="IndependentFlag", data_type=ods.DT_SHORT).long_array.values[:] = [
+            r.get("independent", 0) for r in rows
+        ]
+    if _requested("SequenceRepresentation"):
+        lc.columns.add(name="SequenceRepresentation", data_type=ods.DT_ENUM).long_array.values[:] = [
+            r.get("sequence_representation", SeqRepEnum.explicit.value) for r in rows
+        ]
+    if _requested("GenerationParameters"):
+        generation_parameters = lc.columns.add(name="GenerationParameters", data_type=ods.DS_DOUBLE)
+        for r in rows:
+            generation_parameters.double_arrays.values.add().values[:] = r.get("generation_parameters", [])
+    if _requested("Values"):
+        values = lc.columns.add(name="Values", data_type=ods.DT_UNKNOWN)
+        for r in rows:
+            unknown_array = values.unknown_arrays.values.add(data_type=ods.DT_DOUBLE, unit_id=r.get("unit_id", 0))
+            unknown_array.double_array.values[:] = r["values"]
+    if _requested("SubMatrix"):
+        lc.columns.add(name="SubMatrix", data_type=ods.DT_LONGLONG).longlong_array.values[:] = [
+            r.get("submatrix", 5) for r in rows
+        ]
+    if _requested("SubMatrixNoRows"):
+        sm = dms.matrices.add(aid=81, name="SubMatrix")
+        sm.columns.add(name="SubMatrixNoRows", data_type=ods.DT_LONG).long_array.values[:] = [
+            r.get("number_of_rows", len(r["values"])) for r in rows
+        ]
+    return dms
+
+
+class _FakeBulkConI:
+    """Answers data-read requests with the requested attributes of the given local columns."""
+
+    url = "http://fake/api"
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.select_statements = []
+        self.__model = _get_model()
+
+    def model(self):
+        return self.__model
+
+    def number_of_rows(self):
+        return max((r.get("number_of_rows", len(r["values"])) for r in self.rows), default=0)
+
+    def query_data(self, query):
+        if "AoLocalColumn" in query:
+            # measurement quantity data types used to size chunks
+            return pd.DataFrame({"MeaQuantity.DataType": [r.get("datatype", ods.DT_DOUBLE) for r in self.rows]})
+        # submatrix row count lookup
+        return pd.DataFrame({"SubMatrix.SubMatrixNoRows": [self.number_of_rows()]})
+
+    def data_read(self, select_statement):
+        self.select_statements.append(select_statement)
+        rows = self.rows
+        for where in select_statement.where:
+            if where.condition.attribute == "Id":
+                ids = set(where.condition.longlong_array.values)
+                rows = [r for r in rows if r["id"] in ids]
+            if where.condition.attribute == "IndependentFlag":
+                flags = set(where.condition.long_array.values)
+                rows = [r for r in rows if r.get("independent", 0) in flags]
+        start = select_statement.values_start
+        end = start + select_statement.values_limit if select_statement.values_limit > 0 else None
+        rows = [
+            {**r, "values": r["values"][start:end], "number_of_rows": r.get("number_of_rows", len(r["values"]))}
+            if r.get("sequence_representation", SeqRepEnum.explicit.value)
+            not in (SeqRepEnum.implicit_constant.value, SeqRepEnum.implicit_linear.value)
+            else r
+            for r in rows
+        ]
+        return _localcolumn_dms(rows, {c.attribute for c in select_statement.columns})
 
 
 def test_add_column_filters_no_patterns():
@@ -150,54 +263,6 @@ def test_data_read_sets_independent_index():
     assert list(df.columns) == ["val"]
 
 
-def test_query_merges_and_prefixes_duplicate_names(monkeypatch):
-    # Prepare a fake ConI with query_data and data_read_jaquel
-    class FakeConI:
-        def query_data(self, query):
-            # return metadata with duplicate names
-            df = pd.DataFrame(
-                [
-                    {
-                        "id": 1,
-                        "name": "dup",
-                        "independent": False,
-                        "sequence_representation": 0,
-                        "submatrix": 5,
-                        "number_of_rows": 2,
-                    },
-                    {
-                        "id": 2,
-                        "name": "dup",
-                        "independent": False,
-                        "sequence_representation": 0,
-                        "submatrix": 5,
-                        "number_of_rows": 2,
-                    },
-                ]
-            )
-            return df
-
-        def data_read_jaquel(self, jaquel_query):
-            return object()  # ignored by our monkeypatched to_pandas
-
-    fake = FakeConI()
-
-    # to_pandas should return bulk data with id and values columns (will be renamed inside query)
-    def fake_to_pandas(dms, date_as_timestamp=True, prefer_np_array_for_unknown=True):
-        return pd.DataFrame([[1, [1, 2]], [2, [3, 4]]], columns=["a", "b"])
-
-    monkeypatch.setattr("odsbox.bulk_reader.to_pandas", fake_to_pandas)
-    monkeypatch.setattr("odsbox.bulk_reader.extract_column_unit_ids", lambda dms: [])
-
-    br = BulkReader(fake)
-    merged = br.query({"submatrix": 5})
-
-    # duplicates are not prefixed in current behavior; names remain as returned by metadata
-    assert set(merged["name"].unique()) == {"dup"}
-    # values column should exist
-    assert "values" in merged.columns
-
-
 def test_valuematrix_read_maps_names_and_values(monkeypatch):
     # Fake model cache and con_i
     class FakeMC:
@@ -233,39 +298,6 @@ def test_valuematrix_read_maps_names_and_values(monkeypatch):
     assert list(df.columns) == ["a", "b"]
 
 
-def test_query_raises_on_missing_metadata(monkeypatch):
-    # fake ConI: metadata missing id 2 which is present in bulk -> should raise KeyError
-    class FakeConI2:
-        def query_data(self, query):
-            # only metadata for id 1
-            return pd.DataFrame(
-                [
-                    {
-                        "id": 1,
-                        "name": "one",
-                        "independent": False,
-                        "sequence_representation": 0,
-                        "submatrix": 7,
-                        "number_of_rows": 1,
-                    }
-                ]
-            )
-
-        def data_read_jaquel(self, jaquel_query):
-            return object()
-
-    def fake_to_pandas_bulk(dms, date_as_timestamp=True, prefer_np_array_for_unknown=True):
-        # bulk contains id 2 which lacks metadata
-        return pd.DataFrame([[2, [9, 9]]], columns=["id", "values"])
-
-    monkeypatch.setattr("odsbox.bulk_reader.to_pandas", fake_to_pandas_bulk)
-    monkeypatch.setattr("odsbox.bulk_reader.extract_column_unit_ids", lambda dms: [])
-
-    br = BulkReader(FakeConI2())
-    with pytest.raises(KeyError):
-        br.query({"submatrix": 7})
-
-
 def test_apply_sequence_representation_start_limit():
     # implicit_linear with start=1 and limit=2 should produce two values starting at offset
     df = pd.DataFrame(
@@ -283,6 +315,38 @@ def test_apply_sequence_representation_start_limit():
     assert df.loc[0, "values"] == [5, 10]
 
 
+def test_apply_sequence_representation_implicit_saw():
+    df = pd.DataFrame(
+        [
+            {
+                "name": "saw",
+                "values": [1.0, 0.5, 2.0],
+                "sequence_representation": SeqRepEnum.implicit_saw.value,
+                "number_of_rows": 7,
+            }
+        ]
+    )
+    BulkReader._BulkReader__apply_sequence_representation(df, values_start=1, values_limit=5)
+    # ASAM ODS: p3 is the last value of a period, so the saw is 1.0, 1.5, 2.0, 1.0, ...
+    assert df.loc[0, "values"].tolist() == [1.5, 2.0, 1.0, 1.5, 2.0]
+
+
+@pytest.mark.parametrize("parameters", [[3.0, 0.5, 3.0], [3.0, 0.0, 7.0]])
+def test_apply_sequence_representation_implicit_saw_period_of_one(parameters):
+    df = pd.DataFrame(
+        [
+            {
+                "name": "saw",
+                "values": parameters,
+                "sequence_representation": SeqRepEnum.implicit_saw.value,
+                "number_of_rows": 3,
+            }
+        ]
+    )
+    BulkReader._BulkReader__apply_sequence_representation(df)
+    assert df.loc[0, "values"].tolist() == [3.0, 3.0, 3.0]
+
+
 def test_apply_sequence_representation_skip_raw_calculation():
     # raw_linear should remain as original numeric array when calculate_raw=False
     df = pd.DataFrame(
@@ -301,70 +365,6 @@ def test_apply_sequence_representation_skip_raw_calculation():
     assert list(df.loc[0, "values"]) == [1, 2, 3]
 
 
-def test_generation_parameters_requested_when_raw_seq(monkeypatch):
-    # metadata indicates raw_linear sequence representation -> generation_parameters should be requested
-    class FakeConI3:
-        def query_data(self, query):
-            return pd.DataFrame(
-                [
-                    {
-                        "id": 1,
-                        "name": "rawcol",
-                        "independent": False,
-                        "sequence_representation": SeqRepEnum.raw_linear.value,
-                        "submatrix": 9,
-                        "number_of_rows": 3,
-                    }
-                ]
-            )
-
-        def data_read_jaquel(self, jaquel_query):
-            return object()
-
-    # to_pandas should return id, values, generation_parameters columns (will be renamed inside query)
-    def fake_to_pandas(dms, date_as_timestamp=True, prefer_np_array_for_unknown=True):
-        return pd.DataFrame([[1, [1, 2], [1.0, 2.0]]])
-
-    monkeypatch.setattr("odsbox.bulk_reader.to_pandas", fake_to_pandas)
-    monkeypatch.setattr("odsbox.bulk_reader.extract_column_unit_ids", lambda dms: [])
-
-    br = BulkReader(FakeConI3())
-    merged = br.query({"submatrix": 9})
-    # generation_parameters column should be present after processing
-    assert "generation_parameters" in merged.columns
-
-
-def test_generation_parameters_not_requested_when_not_raw(monkeypatch):
-    # metadata indicates explicit sequence representation -> generation_parameters should NOT be requested
-    class FakeConI4:
-        def query_data(self, query):
-            return pd.DataFrame(
-                [
-                    {
-                        "id": 1,
-                        "name": "expcol",
-                        "independent": False,
-                        "sequence_representation": SeqRepEnum.explicit.value,
-                        "submatrix": 10,
-                        "number_of_rows": 2,
-                    }
-                ]
-            )
-
-        def data_read_jaquel(self, jaquel_query):
-            return object()
-
-    def fake_to_pandas2(dms, date_as_timestamp=True, prefer_np_array_for_unknown=True):
-        return pd.DataFrame([[1, [7, 8]]])
-
-    monkeypatch.setattr("odsbox.bulk_reader.to_pandas", fake_to_pandas2)
-    monkeypatch.setattr("odsbox.bulk_reader.extract_column_unit_ids", lambda dms: [])
-
-    br = BulkReader(FakeConI4())
-    merged = br.query({"submatrix": 10})
-    assert "generation_parameters" not in merged.columns
-
-
 def test_add_column_filters_exact_only_case_sensitive():
     conditions = {}
     BulkReader.add_column_filters(conditions, ["ColA", "ColB"], False)
@@ -419,13 +419,13 @@ def test_add_column_filters_skips_wildcards_and_empty():
 
 
 def _make_bulk_reader_with_unit_lookup(unit_lookup: dict) -> BulkReader:
-    """Return a BulkReader whose unit_name_lookup cache is pre-filled."""
+    """Return a BulkReader whose unit cache returns the given unit names."""
 
     class FakeConI:
         pass
 
     br = BulkReader(FakeConI())  # type: ignore[arg-type]
-    br._unit_name_lookup_cache = unit_lookup
+    br.unit_cache = _FixedUnitCache(unit_lookup)
     return br
 
 
@@ -483,93 +483,318 @@ def test_extract_unit_names_unknown_id_returns_empty_string():
     assert br._extract_unit_names(dms) == ["m/s", ""]
 
 
-def test_query_propagates_unit_names(monkeypatch):
-    """query() stores unit_names in df.attrs after a successful bulk read."""
+def test_valuematrix_read_propagates_unit_names(monkeypatch):
+    """valuematrix_read() stores unit_names in df.attrs."""
+
+    class FakeMC:
+        def entity_by_base_name(self, base_name):
+            return type("E", (), {"aid": 1})()
+
+        def attribute_by_base_name(self, entity, name):
+            return type("A", (), {"name": name})()
 
     class FakeConI:
-        def query_data(self, query):
-            return pd.DataFrame(
-                [
-                    {
-                        "id": 1,
-                        "name": "Time",
-                        "independent": True,
-                        "sequence_representation": 0,
-                        "submatrix": 5,
-                        "number_of_rows": 2,
-                    },
-                    {
-                        "id": 2,
-                        "name": "Force",
-                        "independent": False,
-                        "sequence_representation": 0,
-                        "submatrix": 5,
-                        "number_of_rows": 2,
-                    },
-                ]
-            )
+        def __init__(self):
+            self.mc = FakeMC()
 
-        def data_read_jaquel(self, query):
+        def valuematrix_read(self, vmreq):
             return object()
 
     def fake_to_pandas(dms, **kwargs):
-        return pd.DataFrame([[1, [0.0, 1.0]], [2, [10.0, 20.0]]], columns=["a", "b"])
+        return pd.DataFrame({"name": ["Time", "Force"], "values": [[0.0, 1.0], [10.0, 20.0]]})
 
     monkeypatch.setattr("odsbox.bulk_reader.to_pandas", fake_to_pandas)
     monkeypatch.setattr("odsbox.bulk_reader.extract_column_unit_ids", lambda dms: [7, 99])
 
     br = BulkReader(FakeConI())  # type: ignore[arg-type]
-    br._unit_name_lookup_cache = {7: "s", 99: "N"}
+    br.unit_cache = _FixedUnitCache({7: "s", 99: "N"})
+
+    df = br.valuematrix_read(1)
+    assert df.attrs["unit_names"] == {"Time": "s", "Force": "N"}
+
+
+# --- Tests for query ---
+
+
+def test_query_uses_single_data_read():
+    fake = _FakeBulkConI(
+        [
+            {"id": 1, "name": "dup", "values": [1.0, 2.0]},
+            {"id": 2, "name": "dup", "values": [3.0, 4.0]},
+        ]
+    )
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+
+    merged = br.query({"submatrix": 5}, values_start=1, values_limit=10)
+
+    assert len(fake.select_statements) == 1
+    select_statement = fake.select_statements[0]
+    assert [c.attribute for c in select_statement.columns if c.aid == 82] == [
+        "Id",
+        "Name",
+        "IndependentFlag",
+        "SequenceRepresentation",
+        "GenerationParameters",
+        "SubMatrix",
+        "Values",
+    ]
+    assert [c.attribute for c in select_statement.columns if c.aid == 81] == ["SubMatrixNoRows"]
+    assert select_statement.joins[0].relation == "SubMatrix"
+    assert select_statement.values_start == 1
+    assert select_statement.values_limit == 10
+
+    assert list(merged.columns) == [
+        "submatrix",
+        "name",
+        "id",
+        "values",
+        "independent",
+        "sequence_representation",
+        "generation_parameters",
+        "number_of_rows",
+    ]
+    # duplicate names are kept as returned by the server
+    assert set(merged["name"].unique()) == {"dup"}
+    assert merged["id"].tolist() == [1, 2]
+    assert merged["number_of_rows"].tolist() == [2, 2]
+
+
+def test_query_applies_sequence_representation():
+    fake = _FakeBulkConI(
+        [
+            {
+                "id": 1,
+                "name": "time",
+                "independent": 1,
+                "sequence_representation": SeqRepEnum.implicit_linear.value,
+                "values": [0.0, 0.5],
+                "number_of_rows": 4,
+            },
+            {
+                "id": 2,
+                "name": "raw",
+                "sequence_representation": SeqRepEnum.raw_linear.value,
+                "generation_parameters": [1.0, 2.0],
+                "values": [1.0, 2.0, 3.0, 4.0],
+            },
+        ]
+    )
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+
+    merged = br.query({"submatrix": 5})
+
+    assert list(merged.loc[0, "values"]) == [0.0, 0.5, 1.0, 1.5]
+    assert list(merged.loc[1, "values"]) == [3.0, 5.0, 7.0, 9.0]
+
+
+def test_query_empty_result():
+    br = BulkReader(_FakeBulkConI([]))  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+
+    merged = br.query({"submatrix": 5})
+    assert merged.empty
+    assert "values" in merged.columns
+
+
+def test_query_propagates_unit_names():
+    """query() stores unit_names in df.attrs after a successful bulk read."""
+    fake = _FakeBulkConI(
+        [
+            {"id": 1, "name": "Time", "independent": 1, "values": [0.0, 1.0], "unit_id": 7},
+            {"id": 2, "name": "Force", "values": [10.0, 20.0], "unit_id": 99},
+        ]
+    )
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({7: "s", 99: "N"})
 
     merged = br.query({"submatrix": 5})
     assert merged.attrs["unit_names"] == {"Time": "s", "Force": "N"}
 
 
-def test_data_read_propagates_unit_names(monkeypatch):
+def test_data_read_propagates_unit_names():
     """data_read() copies unit_names from the intermediate query result into the returned DataFrame."""
+    fake = _FakeBulkConI(
+        [
+            {"id": 1, "name": "Time", "independent": 1, "values": [0.0, 1.0], "unit_id": 7},
+            {"id": 2, "name": "Force", "values": [10.0, 20.0], "unit_id": 99},
+        ]
+    )
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({7: "s", 99: "N"})
 
-    class FakeConI:
-        def query_data(self, query):
-            return pd.DataFrame(
-                [
-                    {
-                        "id": 1,
-                        "name": "Time",
-                        "independent": True,
-                        "sequence_representation": 0,
-                        "submatrix": 5,
-                        "number_of_rows": 2,
-                    },
-                    {
-                        "id": 2,
-                        "name": "Force",
-                        "independent": False,
-                        "sequence_representation": 0,
-                        "submatrix": 5,
-                        "number_of_rows": 2,
-                    },
-                ]
-            )
+    df = br.data_read(5, set_independent_as_index=False)
+    assert df.attrs["unit_names"] == {"Time": "s", "Force": "N"}
+    assert np.array_equal(df["Force"].to_numpy(), [10.0, 20.0])
 
-        def data_read_jaquel(self, query):
-            return object()
 
-    def fake_to_pandas(dms, **kwargs):
-        return pd.DataFrame([[1, [0.0, 1.0]], [2, [10.0, 20.0]]], columns=["a", "b"])
+def test_query_uses_cache(tmp_path):
+    from odsbox.bulk_cache import BulkCache
+
+    fake = _FakeBulkConI(
+        [
+            {"id": 1, "name": "Time", "independent": 1, "values": [0.0, 1.0], "unit_id": 7},
+            {"id": 2, "name": "Force", "values": [10.0, 20.0], "unit_id": 99},
+        ]
+    )
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({7: "s", 99: "N"})
+    br.cache = BulkCache(str(tmp_path))
+
+    first = br.query({"submatrix": 5})
+    # metadata request and one request for the missing values
+    assert len(fake.select_statements) == 2
+    assert "Values" not in [c.attribute for c in fake.select_statements[0].columns]
+    assert list(fake.select_statements[1].where[0].condition.longlong_array.values) == [1, 2]
+
+    second = br.query({"submatrix": 5})
+    # only the metadata is requested again
+    assert len(fake.select_statements) == 3
+    assert isinstance(second.loc[1, "values"], np.memmap)
+    assert list(second.loc[1, "values"]) == list(first.loc[1, "values"]) == [10.0, 20.0]
+    assert second.attrs["unit_names"] == {"Time": "s", "Force": "N"}
+
+    # a changed row count invalidates the entries
+    fake.rows[1]["values"] = [10.0, 20.0, 30.0]
+    third = br.query({"submatrix": 5})
+    assert len(fake.select_statements) == 5
+    assert list(fake.select_statements[4].where[0].condition.longlong_array.values) == [2]
+    assert list(third.loc[1, "values"]) == [10.0, 20.0, 30.0]
+
+
+class _FakeValueMatrixConI:
+    """Serves ValueMatrix requests of a submatrix with five rows for tests of valuematrix_read_chunks."""
+
+    class _MC:
+        def entity_by_base_name(self, base_name):
+            return type("E", (), {"aid": 1})()
+
+        def attribute_by_base_name(self, entity, name):
+            return type("A", (), {"name": name})()
+
+    def __init__(self):
+        self.mc = _FakeValueMatrixConI._MC()
+        self.requests: list[ods.ValueMatrixRequestStruct] = []
+
+    def query_data(self, query):
+        if "AoLocalColumn" in query:
+            return pd.DataFrame({"MeaQuantity.DataType": [ods.DT_DOUBLE, ods.DT_DOUBLE]})
+        return pd.DataFrame({"SubMatrix.SubMatrixNoRows": [5]})
+
+    def valuematrix_read(self, vmreq):
+        self.requests.append(vmreq)
+        return vmreq
+
+
+def _fake_valuematrix_to_pandas(vmreq, **kwargs):
+    start, end = vmreq.values_start, vmreq.values_start + vmreq.values_limit
+    storage = vmreq.mode == ods.ValueMatrixRequestStruct.ModeEnum.MO_STORAGE
+    raw = np.array([1.0, 2.0, 3.0, 4.0, 5.0])[start:end]
+    df = pd.DataFrame(
+        {
+            "name": ["Time", "Force"],
+            "values": pd.Series(
+                [[0.0, 0.5] if storage else [0.5 * i for i in range(start, min(end, 5))], raw if storage else 10 * raw],
+                dtype=object,
+            ),
+        }
+    )
+    if storage:
+        df["sequence_representation"] = [SeqRepEnum.implicit_linear.value, SeqRepEnum.raw_linear.value]
+        df["generation_parameters"] = pd.Series([None, [0.0, 10.0]], dtype=object)
+    return df
+
+
+@pytest.mark.parametrize("storage_mode", [False, True])
+def test_valuematrix_read_chunks(monkeypatch, storage_mode):
+    monkeypatch.setattr("odsbox.bulk_reader.to_pandas", _fake_valuematrix_to_pandas)
+    extract_calls = []
+    monkeypatch.setattr("odsbox.bulk_reader.extract_column_unit_ids", lambda dms: extract_calls.append(dms) or [7, 99])
+    fake = _FakeValueMatrixConI()
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({7: "s", 99: "N"})
+
+    chunks = list(br.valuematrix_read_chunks(3, ["T*", "Force"], chunk_rows=2, storage_mode=storage_mode))
+
+    assert [chunk.shape[0] for chunk in chunks] == [2, 2, 1]
+    assert [v for chunk in chunks for v in chunk["Time"]] == [0.0, 0.5, 1.0, 1.5, 2.0]
+    assert [v for chunk in chunks for v in chunk["Force"]] == [10.0, 20.0, 30.0, 40.0, 50.0]
+    assert all(chunk.attrs["unit_names"] == {"Time": "s", "Force": "N"} for chunk in chunks)
+    assert len(extract_calls) == 1
+
+    assert [(r.values_start, r.values_limit) for r in fake.requests] == [(0, 2), (2, 2), (4, 2)]
+    # patterns are resolved by the first request
+    assert [c.name for c in fake.requests[0].columns] == ["T*", "Force"]
+    assert [c.name for c in fake.requests[1].columns] == ["Time", "Force"]
+    expected_mode = (
+        ods.ValueMatrixRequestStruct.ModeEnum.MO_STORAGE
+        if storage_mode
+        else ods.ValueMatrixRequestStruct.ModeEnum.MO_CALCULATED
+    )
+    assert all(r.mode == expected_mode for r in fake.requests)
+    assert len(fake.requests[0].attributes) == (4 if storage_mode else 2)
+
+
+def test_valuematrix_read_chunks_escapes_resolved_names(monkeypatch):
+    def fake_to_pandas(vmreq, **kwargs):
+        return pd.DataFrame({"name": ["Speed*", "A?b\\c"], "values": pd.Series([[1.0, 2.0], [3.0, 4.0]], dtype=object)})
 
     monkeypatch.setattr("odsbox.bulk_reader.to_pandas", fake_to_pandas)
+    monkeypatch.setattr("odsbox.bulk_reader.extract_column_unit_ids", lambda dms: [])
+    fake = _FakeValueMatrixConI()
+    br = BulkReader(fake)  # type: ignore[arg-type]
+
+    list(br.valuematrix_read_chunks(3, ["S*", "A*"], chunk_rows=3))
+
+    # the resolved names only match themselves
+    assert [c.name for c in fake.requests[1].columns] == ["Speed\\*", "A\\?b\\\\c"]
+
+
+def test_valuematrix_read_chunks_memory_budget(monkeypatch):
+    monkeypatch.setattr("odsbox.bulk_reader.to_pandas", _fake_valuematrix_to_pandas)
     monkeypatch.setattr("odsbox.bulk_reader.extract_column_unit_ids", lambda dms: [7, 99])
+    fake = _FakeValueMatrixConI()
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({7: "s", 99: "N"})
 
-    br = BulkReader(FakeConI())  # type: ignore[arg-type]
-    br._unit_name_lookup_cache = {7: "s", 99: "N"}
+    chunks = list(br.valuematrix_read_chunks(3, ["T*", "Force"], memory_budget_bytes=2 * 16 * 3))
 
-    df = br.data_read(5, set_independent_as_index=False)
-    assert df.attrs["unit_names"] == {"Time": "s", "Force": "N"}
+    assert [(r.values_start, r.values_limit) for r in fake.requests] == [(0, 2), (2, 2), (4, 2)]
+    assert [v for chunk in chunks for v in chunk["Force"]] == [10.0, 20.0, 30.0, 40.0, 50.0]
 
 
-def test_valuematrix_read_propagates_unit_names(monkeypatch):
-    """valuematrix_read() stores unit_names in df.attrs."""
+def test_data_read_memmap_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(BulkReader, "MEMMAP_CHUNK_ROWS", 2)
+    fake = _FakeBulkConI(
+        [
+            {"id": 1, "name": "Time", "independent": 1, "values": [0.0, 1.0, 2.0, 3.0, 4.0]},
+            {"id": 2, "name": "Force", "values": [10.0, 20.0, 30.0, 40.0, 50.0]},
+        ]
+    )
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
 
+    df = br.data_read(5, set_independent_as_index=False, memmap_directory=str(tmp_path / "scratch"))
+
+    # the values are streamed into the files chunk by chunk
+    assert [(s.values_start, s.values_limit) for s in fake.select_statements] == [(0, 2), (2, 2), (4, 1)]
+    files = sorted(os.listdir(tmp_path / "scratch"))
+    assert [name[:4] for name in files] == ["1_0_", "2_0_"] and all(name.endswith(".npy") for name in files)
+    assert isinstance(df["Force"].values, np.memmap)
+    assert df["Force"].tolist() == [10.0, 20.0, 30.0, 40.0, 50.0]
+    # sibling processes can map the same file
+    shared = np.load(tmp_path / "scratch" / files[1], mmap_mode="r")
+    assert shared.tolist() == [10.0, 20.0, 30.0, 40.0, 50.0]
+
+    # reading the same rows again does not overwrite the files of the first frame
+    window = br.data_read(5, values_start=1, values_limit=3, memmap_directory=str(tmp_path / "scratch"))
+    assert len(os.listdir(tmp_path / "scratch")) == 4
+    assert window["Force"].tolist() == [20.0, 30.0, 40.0]
+    assert df["Force"].tolist() == [10.0, 20.0, 30.0, 40.0, 50.0]
+
+
+def test_valuematrix_read_memmap_directory(monkeypatch, tmp_path):
     class FakeMC:
         def entity_by_base_name(self, base_name):
             return type("E", (), {"aid": 1})()
@@ -581,17 +806,551 @@ def test_valuematrix_read_propagates_unit_names(monkeypatch):
         def __init__(self):
             self.mc = FakeMC()
 
+        def query_data(self, query):
+            return pd.DataFrame({"SubMatrix.SubMatrixNoRows": [2]})
+
         def valuematrix_read(self, vmreq):
             return object()
 
     def fake_to_pandas(dms, **kwargs):
-        return pd.DataFrame({"name": ["Time", "Force"], "values": [[0.0, 1.0], [10.0, 20.0]]})
+        return pd.DataFrame(
+            {"name": ["Time", "Comment"], "values": [np.array([0.0, 1.0]), ["a", "b"]]},
+        )
 
     monkeypatch.setattr("odsbox.bulk_reader.to_pandas", fake_to_pandas)
-    monkeypatch.setattr("odsbox.bulk_reader.extract_column_unit_ids", lambda dms: [7, 99])
+    monkeypatch.setattr("odsbox.bulk_reader.extract_column_unit_ids", lambda dms: [])
 
-    br = BulkReader(FakeConI())  # type: ignore[arg-type]
-    br._unit_name_lookup_cache = {7: "s", 99: "N"}
+    df = BulkReader(FakeConI()).valuematrix_read(3, memmap_directory=str(tmp_path))  # type: ignore[arg-type]
 
-    df = br.valuematrix_read(1)
-    assert df.attrs["unit_names"] == {"Time": "s", "Force": "N"}
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].startswith("3_0_0_") and files[0].endswith(".npy")
+    assert isinstance(df["Time"].values, np.memmap)
+    assert df["Comment"].tolist() == ["a", "b"]
+
+
+# --- Tests for chunked reading and export ---
+
+
+def test_data_read_stacks_homogeneous_columns():
+    fake = _FakeBulkConI(
+        [
+            {"id": 1, "name": "A", "values": [1.0, 2.0, 3.0]},
+            {"id": 2, "name": "B", "values": [4.0, 5.0, 6.0]},
+            {"id": 3, "name": "C", "values": [7.0, 8.0, 9.0]},
+        ]
+    )
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+
+    df = br.data_read(5)
+
+    assert df._mgr.nblocks == 1
+    assert df["B"].to_numpy().flags.c_contiguous
+    assert df["B"].tolist() == [4.0, 5.0, 6.0]
+    assert list(df.columns) == ["A", "B", "C"]
+
+
+def test_to_frame_mixed_and_duplicate_columns():
+    to_frame = BulkReader._BulkReader__to_frame  # type: ignore[attr-defined]
+    ints = np.array([1, 2], dtype=np.int32)
+
+    df = to_frame(
+        np.array(["i", "s", "f", "i"], dtype=object),
+        [ints, ["a", "b"], [0.5, 1.5], np.array([3, 4], dtype=np.int32)],
+    )
+
+    assert list(df.columns) == ["i", "s", "f"]
+    assert df["i"].tolist() == [3, 4]
+    assert df["i"].dtype == np.int32
+    assert df["s"].tolist() == ["a", "b"]
+    assert df["f"].dtype == np.float64
+    assert to_frame([], []).empty
+
+
+def _chunk_test_rows():
+    return [
+        {
+            "id": 1,
+            "name": "Time",
+            "independent": 1,
+            "sequence_representation": SeqRepEnum.implicit_linear.value,
+            "values": [0.0, 0.5],
+            "number_of_rows": 5,
+            "unit_id": 7,
+        },
+        {"id": 2, "name": "Force", "values": [10.0, 20.0, 30.0, 40.0, 50.0], "unit_id": 99},
+    ]
+
+
+def test_data_read_chunks():
+    fake = _FakeBulkConI(_chunk_test_rows())
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({7: "s", 99: "N"})
+
+    chunks = list(br.data_read_chunks(5, chunk_rows=2))
+
+    assert [chunk.shape[0] for chunk in chunks] == [2, 2, 1]
+    assert [v for chunk in chunks for v in chunk.index] == [0.0, 0.5, 1.0, 1.5, 2.0]
+    assert [v for chunk in chunks for v in chunk["Force"]] == [10.0, 20.0, 30.0, 40.0, 50.0]
+    assert [s.values_start for s in fake.select_statements] == [0, 2, 4]
+
+    with pytest.raises(ValueError):
+        next(br.data_read_chunks(5, chunk_rows=0))
+
+
+def test_data_read_chunks_memory_budget():
+    rows = _chunk_test_rows()
+    # a string column is estimated with 64 bytes per value, the observed doubles need 8
+    rows[1]["datatype"] = ods.DT_STRING
+    fake = _FakeBulkConI(rows)
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({7: "s", 99: "N"})
+
+    # (8 + 64) bytes per row and an overhead of 3 give 2 rows for the first chunk
+    chunks = list(br.data_read_chunks(5, memory_budget_bytes=480))
+
+    assert [chunk.shape[0] for chunk in chunks] == [2, 3]
+    assert [(s.values_start, s.values_limit) for s in fake.select_statements] == [(0, 2), (2, 3)]
+    assert [v for chunk in chunks for v in chunk["Force"]] == [10.0, 20.0, 30.0, 40.0, 50.0]
+
+    with pytest.raises(ValueError):
+        next(br.data_read_chunks(5, memory_budget_bytes=0))
+
+
+def test_data_read_chunks_empty_submatrix():
+    br = BulkReader(_FakeBulkConI([{"id": 2, "name": "Force", "values": []}]))  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+
+    chunks = list(br.data_read_chunks(5, chunk_rows=2))
+    assert len(chunks) == 1
+    assert list(chunks[0].columns) == ["Force"]
+    assert chunks[0].empty
+
+
+def test_column_stats():
+    rng = np.random.default_rng(4)
+    force = rng.normal(1e6, 3.0, 1000)
+    force[[3, 500, 501]] = np.nan
+    fake = _FakeBulkConI(
+        [
+            {
+                "id": 1,
+                "name": "Time",
+                "independent": 1,
+                "sequence_representation": SeqRepEnum.implicit_linear.value,
+                "values": [0.0, 0.1],
+                "number_of_rows": 1000,
+                "unit_id": 7,
+            },
+            {"id": 2, "name": "Force", "values": force.tolist(), "unit_id": 99},
+            {"id": 3, "name": "Empty", "values": [np.nan] * 1000},
+        ]
+    )
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({7: "s", 99: "N"})
+
+    stats_df = br.column_stats(5, stats=("min", "max", "mean", "std", "count", "count_nan"), chunk_rows=137)
+
+    assert len(fake.select_statements) == 8
+    expected = pd.DataFrame({"Time": np.arange(1000) * 0.1, "Force": force, "Empty": np.nan})
+    assert stats_df.index.tolist() == ["Time", "Force", "Empty"]
+    for name in ["Time", "Force"]:
+        assert stats_df.loc[name, "min"] == expected[name].min()
+        assert stats_df.loc[name, "max"] == expected[name].max()
+        assert stats_df.loc[name, "mean"] == pytest.approx(expected[name].mean(), rel=1e-12)
+        assert stats_df.loc[name, "std"] == pytest.approx(expected[name].std(), rel=1e-9)
+    assert stats_df["count"].tolist() == [1000, 997, 0]
+    assert stats_df["count_nan"].tolist() == [0, 3, 1000]
+    assert stats_df.loc["Empty", ["min", "max", "mean", "std"]].isna().all()
+    assert stats_df.attrs["unit_names"] == {"Time": "s", "Force": "N", "Empty": ""}
+
+
+def test_column_stats_selection_and_errors():
+    br = BulkReader(_FakeBulkConI(_chunk_test_rows()))  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+
+    stats_df = br.column_stats(5, stats=("count_nan", "max"), chunk_rows=2)
+    assert list(stats_df.columns) == ["count_nan", "max"]
+    assert stats_df.loc["Force", "max"] == 50.0
+
+    with pytest.raises(ValueError):
+        br.column_stats(5, stats=("median",))
+
+
+def _aligned_localcolumns(names, values, independent, unit_names):
+    df = pd.DataFrame(
+        {
+            "submatrix": 0,
+            "name": names,
+            "id": range(len(names)),
+            "values": pd.Series(values, dtype=object),
+            "independent": independent,
+            "sequence_representation": 0,
+            "generation_parameters": None,
+            "number_of_rows": len(values[0]),
+        }
+    )
+    df.attrs["unit_names"] = unit_names
+    return df
+
+
+def _fake_aligned_query(conditions_log):
+    def _query(conditions, values_start=0, values_limit=0, **kwargs):
+        conditions_log.append(conditions)
+        if conditions.get("submatrix", 1) == 1:
+            df = _aligned_localcolumns(
+                ["Time", "Speed", "Label"],
+                [np.array([0.0, 1.0, 2.0]), np.array([0.0, 10.0, 20.0]), np.array(["a", "b", "c"])],
+                [1, 0, 0],
+                {"Time": "s", "Speed": "km/h"},
+            )
+        else:
+            df = _aligned_localcolumns(
+                ["Force", "Time"],
+                [np.array([5.0, 6.0, 8.0]), np.array([1.5, 1.0, 2.5])],
+                [0, 1],
+                {"Force": "N"},
+            )
+        # probes used to determine the rows of a window
+        if "id" in conditions:
+            df = df[df["id"] == conditions["id"]]
+        if conditions.get("independent") == 1:
+            df = df[df["independent"] == 1]
+        end = values_start + values_limit if values_limit > 0 else None
+        return df.assign(values=pd.Series([v[values_start:end] for v in df["values"]], index=df.index, dtype=object))
+
+    return _query
+
+
+def test_read_aligned():
+    br = BulkReader(_FakeBulkConI([]))  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+    conditions_log: list = []
+    br.query = _fake_aligned_query(conditions_log)  # type: ignore[method-assign]
+
+    df = br.read_aligned({1: None, 2: ["Force"]}, 2.0, method="linear")
+
+    assert conditions_log[0] == {"submatrix": 1}
+    assert conditions_log[1] == {"submatrix": 2, "$or": [{"name": {"$in": ["Force"]}}, {"independent": 1}]}
+    assert df.index.tolist() == [0.0, 0.5, 1.0, 1.5, 2.0, 2.5]
+    assert list(df.columns) == [(1, "Speed"), (2, "Force")]
+    np.testing.assert_array_equal(df[(1, "Speed")], [0.0, 5.0, 10.0, 15.0, 20.0, np.nan])
+    # unsorted independent values are sorted before resampling
+    np.testing.assert_array_equal(df[(2, "Force")], [np.nan, np.nan, 6.0, 5.0, 6.5, 8.0])
+    assert df.attrs["unit_names"] == {(1, "Speed"): "km/h", (2, "Force"): "N"}
+
+    df = br.read_aligned({1: ["Speed"]}, [0.4, 1.6], method="zoh", max_workers=1)
+    assert df[(1, "Speed")].tolist() == [0.0, 10.0]
+
+    with pytest.raises(ValueError):
+        br.read_aligned({1: None}, 0.0)
+    with pytest.raises(ValueError):
+        br.read_aligned({1: None}, 1.0, method="cubic")
+
+
+def test_read_aligned_reads_overlapping_rows_only():
+    time_values = np.arange(100) * 0.1
+    reads: list = []
+
+    def _query(conditions, values_start=0, values_limit=0, **kwargs):
+        reads.append((conditions, values_start, values_limit))
+        df = _aligned_localcolumns(["Time", "Speed"], [time_values, time_values * 10.0], [1, 0], {"Speed": "km/h"})
+        if "id" in conditions:
+            df = df[df["id"] == conditions["id"]]
+        if conditions.get("independent") == 1:
+            df = df[df["independent"] == 1]
+        end = values_start + values_limit if values_limit > 0 else None
+        return df.assign(values=pd.Series([v[values_start:end] for v in df["values"]], index=df.index, dtype=object))
+
+    br = BulkReader(_FakeBulkConI([]))  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+    br.query = _query  # type: ignore[method-assign]
+
+    df = br.read_aligned({1: ["Speed"]}, [2.05, 2.5, 3.0], method="linear")
+
+    # rows 21 to 30 are within the index, rows 20 and 31 are needed to interpolate at its borders
+    assert reads[-1][1:] == (20, 12)
+    np.testing.assert_allclose(df[(1, "Speed")], [20.5, 25.0, 30.0])
+
+    df = br.read_aligned({1: None}, 10.0, independent_range=(5.0, 6.0))
+    assert reads[-1][1:] == (49, 13)
+    np.testing.assert_allclose(df.index, np.arange(11) * 0.1 + 5.0)
+    np.testing.assert_allclose(df[(1, "Speed")], np.arange(11) + 50.0)
+
+    # values of the index outside of the range are dropped
+    df = br.read_aligned({1: None}, [0.5, 5.5, 9.5], method="zoh", independent_range=(5.0, 6.0))
+    assert df.index.tolist() == [5.5] and df[(1, "Speed")].tolist() == [55.0]
+
+
+@pytest.mark.slow
+def test_read_aligned_many_channels_benchmark():
+    rows, channels = 200_000, 128
+    rng = np.random.default_rng(5)
+    sources = {
+        1: (np.arange(rows) * 0.001, [rng.normal(size=rows) for _ in range(channels // 2)]),
+        2: (np.arange(rows // 4) * 0.004 + 0.0005, [rng.normal(size=rows // 4) for _ in range(channels // 2)]),
+    }
+
+    def _query(conditions, **kwargs):
+        x, columns = sources[conditions["submatrix"]]
+        names = ["Time"] + [f"C{i}" for i in range(len(columns))]
+        return _aligned_localcolumns(names, [x, *columns], [1] + [0] * len(columns), {})
+
+    br = BulkReader(_FakeBulkConI([]))  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+    br.query = _query  # type: ignore[method-assign]
+
+    for method in ["nearest", "linear", "zoh"]:
+        start = time.perf_counter()
+        df = br.read_aligned({1: None, 2: None}, 1000.0, method=method)
+        elapsed = time.perf_counter() - start
+        logging.getLogger(__name__).info(
+            "read_aligned %s: %d channels x %d rows in %.3fs", method, channels, df.shape[0], elapsed
+        )
+        assert df.shape == (rows, channels)
+        assert df[(1, "C0")].iloc[10] == pytest.approx(sources[1][1][0][10])
+
+
+def _decimation_test_rows():
+    force = np.sin(np.arange(1000) / 50.0)
+    force[123] = 5.0
+    return [
+        {
+            "id": 1,
+            "name": "Time",
+            "independent": 1,
+            "sequence_representation": SeqRepEnum.implicit_linear.value,
+            "values": [0.0, 0.1],
+            "number_of_rows": 1000,
+            "unit_id": 7,
+        },
+        {"id": 2, "name": "Force", "values": force.tolist(), "unit_id": 99},
+    ]
+
+
+def test_data_read_decimated():
+    fake = _FakeBulkConI(_decimation_test_rows())
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({7: "s", 99: "N"})
+
+    series = br.data_read_decimated(5, points=100, chunk_rows=300)
+
+    assert list(series) == ["Force"]
+    force = series["Force"]
+    assert len(force) == 100
+    assert force.index.name == "Time"
+    assert force.attrs["unit_name"] == "N"
+    assert force.max() == 5.0
+    assert force.index[force.argmax()] == pytest.approx(12.3)
+    assert [s.values_start for s in fake.select_statements] == [0, 300, 600, 900]
+
+
+def test_data_read_decimated_preview():
+    fake = _FakeBulkConI(_decimation_test_rows())
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+
+    series = br.data_read_decimated(5, ["Force"], points=50, method="lttb", chunk_rows=100, preview_chunks=3)
+
+    assert [s.values_start for s in fake.select_statements] == [0, 450, 900]
+    assert all(s.values_limit == 100 for s in fake.select_statements)
+    index = series["Force"].index
+    assert index[0] == 0.0 and index[-1] == pytest.approx(99.9)
+    assert len(index) <= 50
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow", "hdf5"])
+def test_export_submatrix(tmp_path, format):
+    pytest.importorskip("pyarrow")
+    if format == "hdf5":
+        pytest.importorskip("tables")
+
+    br = BulkReader(_FakeBulkConI(_chunk_test_rows()))  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({7: "s", 99: "N"})
+
+    target = str(tmp_path / f"sm.{format}")
+    assert br.export(5, target, format=format, chunk_rows=2) == [target]
+
+    if format == "parquet":
+        df = pd.read_parquet(target)
+    elif format == "arrow":
+        df = pd.read_feather(target)
+    else:
+        df = pd.read_hdf(target, "data")
+    assert df["Time"].tolist() == [0.0, 0.5, 1.0, 1.5, 2.0]
+    assert df["Force"].tolist() == [10.0, 20.0, 30.0, 40.0, 50.0]
+
+
+def test_export_measurement(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    fake = _FakeBulkConI(_chunk_test_rows())
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+    br._measurement_submatrix_iids = lambda measurement_iid: [5, 6]
+
+    paths = br.export(4711, str(tmp_path / "mea"), format="arrow", chunk_rows=10, is_measurement=True)
+
+    assert paths == [str(tmp_path / "mea" / "5.arrow"), str(tmp_path / "mea" / "6.arrow")]
+    assert all(os.path.isfile(path) for path in paths)
+
+
+def test_export_unknown_format(tmp_path):
+    br = BulkReader(_FakeBulkConI(_chunk_test_rows()))  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        br.export(5, str(tmp_path / "sm.csv"), format="csv")
+
+
+# --- Tests for independent_range ---
+
+
+def test_data_read_independent_range_implicit_linear():
+    fake = _FakeBulkConI(
+        [
+            {
+                "id": 1,
+                "name": "Time",
+                "independent": 1,
+                "sequence_representation": SeqRepEnum.implicit_linear.value,
+                "values": [0.0, 0.5],
+                "number_of_rows": 400,
+            },
+            {"id": 2, "name": "Force", "values": [float(i) for i in range(400)]},
+        ]
+    )
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+
+    df = br.data_read(5, independent_range=(10.0, 20.0))
+
+    assert df.index.tolist() == [10.0 + 0.5 * i for i in range(21)]
+    assert df["Force"].tolist() == [float(i) for i in range(20, 41)]
+    # one probe for the independent column and one read of the window
+    assert len(fake.select_statements) == 2
+    assert (fake.select_statements[1].values_start, fake.select_statements[1].values_limit) == (20, 21)
+
+
+def test_data_read_independent_range_explicit_binary_search():
+    time = np.cumsum(np.random.default_rng(0).uniform(0.001, 0.01, 20_000))
+    fake = _FakeBulkConI(
+        [
+            {"id": 1, "name": "Time", "independent": 1, "values": time.tolist()},
+            {"id": 2, "name": "Force", "values": list(range(20_000))},
+        ]
+    )
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+
+    range_start, range_end = time[5000], time[12000] + 1e-6
+    df = br.data_read(5, independent_range=(range_start, range_end))
+
+    expected_start = int(np.searchsorted(time, range_start, side="left"))
+    expected_end = int(np.searchsorted(time, range_end, side="right"))
+    assert df["Force"].tolist() == list(range(expected_start, expected_end))
+    assert df.index[0] >= range_start and df.index[-1] <= range_end
+    # binary search probes single values only
+    assert len(fake.select_statements) < 30
+    assert all(s.values_limit <= 1024 for s in fake.select_statements[:-1])
+
+
+def test_data_read_independent_range_probes_bypass_cache(tmp_path):
+    from odsbox.bulk_cache import BulkCache
+
+    time = np.arange(5000) * 0.01
+    fake = _FakeBulkConI(
+        [
+            {"id": 1, "name": "Time", "independent": 1, "values": time.tolist()},
+            {"id": 2, "name": "Force", "values": list(range(5000))},
+        ]
+    )
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+    br.cache = BulkCache(str(tmp_path))
+
+    df = br.data_read(5, independent_range=(10.0, 20.0))
+
+    assert df["Force"].tolist() == list(range(1000, 2001))
+    # only the values of the window are cached
+    assert sorted(name for name in os.listdir(tmp_path) if name.endswith(".npy")) == sorted(
+        BulkCache.key(fake.url, lc_id, 1000, 1001, True, "5000") + ".npy" for lc_id in (1, 2)
+    )
+
+
+def test_data_read_independent_range_outside():
+    fake = _FakeBulkConI(
+        [
+            {"id": 1, "name": "Time", "independent": 1, "values": [0.0, 1.0, 2.0]},
+            {"id": 2, "name": "Force", "values": [1.0, 2.0, 3.0]},
+        ]
+    )
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+
+    assert br._independent_window(5, 5.0, 6.0) == (3, 0)
+    assert br._independent_window(5, 1.5, 1.6) == (3, 0)
+    assert br._independent_window(5, -1.0, 1.0) == (0, 2)
+    assert br.data_read(5, independent_range=(5.0, 6.0)).empty
+
+
+def test_data_read_independent_range_errors():
+    br = BulkReader(_FakeBulkConI([{"id": 2, "name": "Force", "values": [1.0]}]))  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+
+    with pytest.raises(ValueError):
+        br.data_read(5, independent_range=(0.0, 1.0), values_start=1)
+    with pytest.raises(ValueError):
+        br.data_read(5, independent_range=(0.0, 1.0))
+
+
+# --- Tests for read_measurement ---
+
+
+class _FakeMeasurementConI:
+    def __init__(self, submatrix_ids):
+        self.submatrix_ids = submatrix_ids
+        self.queries = []
+
+    def query_data(self, query):
+        self.queries.append(query)
+        return pd.DataFrame({"SubMatrix.Id": self.submatrix_ids})
+
+
+def _fake_data_read(submatrix_iid, **kwargs):
+    df = pd.DataFrame({"val": [submatrix_iid, submatrix_iid + 1]}, index=pd.Index([0.0, 1.0], name="time"))
+    df.attrs["unit_names"] = {"time": "s", "val": f"u{submatrix_iid}"}
+    return df
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_read_measurement_returns_frame_per_submatrix(max_workers):
+    fake = _FakeMeasurementConI([11, 12, 13])
+    br = BulkReader(fake)  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+    br.data_read = _fake_data_read
+
+    frames = br.read_measurement(7, ["val"], max_workers=max_workers)
+
+    assert list(frames.keys()) == [11, 12, 13]
+    assert frames[12]["val"].tolist() == [12, 13]
+    assert len(fake.queries) == 1
+    assert fake.queries[0]["AoSubMatrix"] == {"measurement": 7}
+
+
+def test_read_measurement_concatenate():
+    br = BulkReader(_FakeMeasurementConI([11, 12]))  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+    br.data_read = _fake_data_read
+
+    df = br.read_measurement(7, concatenate=True)
+
+    assert df.index.names == ["submatrix", "time"]
+    assert df.loc[12, "val"].tolist() == [12, 13]
+    assert df.attrs["unit_names"] == {"time": "s", "val": "u12"}
+
+
+def test_read_measurement_without_submatrices():
+    br = BulkReader(_FakeMeasurementConI([]))  # type: ignore[arg-type]
+    br.unit_cache = _FixedUnitCache({})
+
+    assert br.read_measurement(7) == {}
+    assert br.read_measurement(7, concatenate=True).empty
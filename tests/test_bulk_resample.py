@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from odsbox.bulk_resample import resample
+
+X = np.array([0.0, 1.0, 2.0, 4.0])
+VALUES = np.column_stack([X, X + 10.0])
+TARGET = np.array([-1.0, 0.0, 0.4, 0.6, 1.5, 3.0, 4.0, 5.0])
+
+
+@pytest.mark.parametrize(
+    "method, expected",
+    [
+        ("nearest", [np.nan, 0.0, 0.0, 1.0, 1.0, 2.0, 4.0, np.nan]),
+        ("linear", [np.nan, 0.0, 0.4, 0.6, 1.5, 3.0, 4.0, np.nan]),
+        ("zoh", [np.nan, 0.0, 0.0, 0.0, 1.0, 2.0, 4.0, np.nan]),
+    ],
+)
+def test_resample_methods(method, expected):
+    result = resample(X, VALUES, TARGET, method)
+
+    assert result.shape == (len(TARGET), 2)
+    np.testing.assert_array_equal(result[:, 0], expected)
+    np.testing.assert_array_equal(result[:, 1], np.asarray(expected) + 10.0)
+    np.testing.assert_array_equal(resample(X, VALUES[:, 0], TARGET, method), expected)
+
+
+def test_resample_datetime_axis():
+    x = np.array(["2024-01-01T00:00:00", "2024-01-01T00:00:02"], dtype="datetime64[ns]")
+    target = np.array(["2024-01-01T00:00:00.500", "2024-01-01T00:00:03"], dtype="datetime64[ms]")
+
+    np.testing.assert_array_equal(resample(x, np.array([0.0, 2.0]), target, "linear"), [0.5, np.nan])
+
+
+def test_resample_short_sources():
+    np.testing.assert_array_equal(
+        resample(np.array([1.0]), np.array([5.0]), np.array([0.0, 1.0, 2.0])), [np.nan, 5.0, np.nan]
+    )
+    assert np.isnan(resample(np.empty(0), np.empty(0), np.array([0.0]))).all()
+
+
+def test_resample_errors():
+    with pytest.raises(ValueError):
+        resample(X, VALUES, TARGET, "cubic")
+    with pytest.raises(ValueError):
+        resample(X, VALUES[:2], TARGET)
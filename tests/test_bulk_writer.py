@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from google.protobuf.json_format import Parse
+
+import odsbox.proto.ods_pb2 as ods
+from odsbox.bulk_reader import BulkReader, SeqRepEnum
+from odsbox.bulk_writer import BulkWriter, detect_sequence_representation, quantize_linear, smallest_exact_dtype
+from odsbox.datamatrices_to_pandas import to_pandas
+from odsbox.model_cache import ModelCache
+
+
+def _get_model():
+    model_file = os.path.join(os.path.abspath(os.path.dirname(__file__)), "test_data", "application_model.json")
+    model = ods.Model()
+    Parse(Path(model_file).read_text(encoding="utf-8"), model)
+    return model
+
+
+class _FakeConI:
+    def __init__(self):
+        self.mc = ModelCache(_get_model())
+        self.created: list[ods.DataMatrices] = []
+        self.updated: list[ods.DataMatrices] = []
+        self.__next_id = 100
+
+    def data_create(self, data: ods.DataMatrices) -> list[int]:
+        self.created.append(data)
+        rows = len(data.matrices[0].columns[0].string_array.values)
+        ids = list(range(self.__next_id, self.__next_id + rows))
+        self.__next_id += rows
+        return ids
+
+    def data_create_matrices(self, data: ods.DataMatrices) -> list[list[int]]:
+        ids = []
+        for matrix in data.matrices:
+            ids.append(self.data_create(ods.DataMatrices(matrices=[matrix])))
+            self.created.pop()
+        self.created.append(data)
+        return ids
+
+    def data_update(self, data: ods.DataMatrices) -> None:
+        self.updated.append(data)
+
+
+@pytest.mark.parametrize(
+    "values,expected",
+    [
+        (np.array([0, 1000], dtype=np.int64), np.int16),
+        (np.array([-1, 70000], dtype=np.int64), np.int32),
+        (np.array([0, 2**40], dtype=np.int64), np.int64),
+        (np.array([1, 255], dtype=np.uint8), np.uint8),
+        (np.array([1, 40000], dtype=np.uint16), np.int32),
+        (np.array([0.5, np.nan, np.inf], dtype=np.float64), np.float32),
+        (np.array([0.1, 1.0], dtype=np.float64), np.float64),
+        (np.array([1e300], dtype=np.float64), np.float64),
+        (np.array([1 + 2j], dtype=np.complex128), np.complex64),
+        (np.array([True, False]), np.bool_),
+        (np.array(["a"], dtype=object), object),
+    ],
+)
+def test_smallest_exact_dtype(values, expected):
+    narrowed = smallest_exact_dtype(values)
+    assert narrowed.dtype == expected
+    np.testing.assert_array_equal(narrowed, values)
+
+
+def test_write_streams_values_within_request_limit():
+    con_i = _FakeConI()
+    rows = 10_000
+    df = pd.DataFrame(
+        {
+            "Time": np.arange(rows, dtype=np.float64) * 0.5,
+            "Counter": np.arange(rows, dtype=np.int64),
+            "Voltage": np.random.default_rng(1).random(rows),
+        }
+    )
+
+    submatrix_id = BulkWriter(con_i).write(  # type: ignore[arg-type]
+        42, df, independent="Time", unit_ids={"Time": 7}, max_request_bytes=20_000, detect_implicit=False
+    )
+
+    measurement_quantities, submatrix, local_columns = con_i.created
+    assert submatrix_id == 103
+    mq = to_pandas(measurement_quantities)
+    # the measurement quantities keep the data types of the columns, only the transport is narrowed
+    assert list(mq["MeaQuantity.DataType"]) == [ods.DT_DOUBLE, ods.DT_LONGLONG, ods.DT_DOUBLE]
+    assert list(mq["MeaQuantity.MeaResult"]) == [42, 42, 42]
+    assert list(measurement_quantities.matrices[0].columns[4].is_null) == [False, True, True]
+    assert list(to_pandas(submatrix)["SubMatrix.SubMatrixNoRows"]) == [rows]
+
+    lc = to_pandas(local_columns)
+    assert list(lc["LocalColumn.MeaQuantity"]) == [100, 101, 102]
+    assert list(lc["LocalColumn.IndependentFlag"]) == [1, 0, 0]
+    assert list(lc["LocalColumn.SubMatrix"]) == [103, 103, 103]
+
+    requests = [local_columns, *con_i.updated]
+    assert len(requests) > 2
+    assert all(request.ByteSize() <= 20_000 for request in requests)
+    starts = [request.matrices[0].values_start for request in con_i.updated]
+    assert starts == sorted(starts) and starts[0] > 0
+    assert all(request.matrices[0].values_update_mode == ods.DataMatrix.VU_APPEND for request in con_i.updated)
+
+    written: dict[int, list[np.ndarray]] = {}
+    for request in requests:
+        chunk = to_pandas(request, prefer_np_array_for_unknown=True)
+        for index, values in enumerate(chunk["LocalColumn.Values"]):
+            written.setdefault(index, []).append(values)
+    for index, name in enumerate(df.columns):
+        np.testing.assert_array_equal(np.concatenate(written[index]), df[name].to_numpy())
+    assert np.concatenate(written[1]).dtype == np.int16
+
+
+@pytest.mark.parametrize(
+    "values,expected,parameters",
+    [
+        (np.full(5, 3.5), SeqRepEnum.implicit_constant, [3.5]),
+        (np.array([True, True]), SeqRepEnum.implicit_constant, [True]),
+        (np.arange(10, 60, 5, dtype=np.int16), SeqRepEnum.implicit_linear, [10, 5]),
+        (np.arange(1000) * 0.001 + 2.0, SeqRepEnum.implicit_linear, [2.0, 0.001]),
+        (np.tile(np.arange(4, dtype=np.int32), 3) * 2 + 1, SeqRepEnum.implicit_saw, [1, 2, 7]),
+        (np.tile(np.arange(4.0), 2)[:-1], SeqRepEnum.implicit_saw, [0.0, 1.0, 3.0]),
+        (np.array([0, 1, 3], dtype=np.int16), SeqRepEnum.explicit, None),
+        (np.array([0, 2, 4, 6, 0, 2, 5, 6]), SeqRepEnum.explicit, None),
+        (np.array([0.0, np.nan]), SeqRepEnum.explicit, None),
+        (np.array([1.0]), SeqRepEnum.explicit, None),
+        (np.array(["a", "a"]), SeqRepEnum.explicit, None),
+    ],
+)
+def test_detect_sequence_representation(values, expected, parameters):
+    sequence_representation, generation_parameters = detect_sequence_representation(values)
+    assert sequence_representation == expected
+    if parameters is None:
+        assert generation_parameters is values
+    else:
+        np.testing.assert_allclose(generation_parameters, parameters, rtol=1e-12)
+        # the reader reproduces the values from the generation parameters
+        df = pd.DataFrame(
+            [
+                {
+                    "name": "c",
+                    "values": generation_parameters.tolist(),
+                    "sequence_representation": sequence_representation.value,
+                    "number_of_rows": len(values),
+                }
+            ]
+        )
+        BulkReader._BulkReader__apply_sequence_representation(df)  # type: ignore[attr-defined]
+        np.testing.assert_allclose(df.loc[0, "values"], values, rtol=1e-9)
+
+
+def test_detect_sequence_representation_tolerance():
+    values = np.arange(100, dtype=np.float64) + 1e-7
+    values[50] += 1e-6
+    assert detect_sequence_representation(values)[0] == SeqRepEnum.explicit
+    assert detect_sequence_representation(values, rtol=1e-6)[0] == SeqRepEnum.implicit_linear
+
+    # by default a deviation of a single ulp keeps the values explicit
+    values = np.arange(100) * 0.5
+    values[30] = np.nextafter(values[30], np.inf)
+    assert detect_sequence_representation(values)[0] == SeqRepEnum.explicit
+    assert detect_sequence_representation(values, rtol=1e-9)[0] == SeqRepEnum.implicit_linear
+    saw = np.tile(np.arange(10, dtype=np.float32), 3)
+    saw[12] = np.nextafter(saw[12], np.float32(0))
+    assert detect_sequence_representation(saw)[0] == SeqRepEnum.explicit
+
+
+def test_write_implicit_columns():
+    con_i = _FakeConI()
+    rows = 1000
+    data = {
+        "Time": np.arange(rows) * 0.01,
+        "Gear": np.full(rows, 3, dtype=np.int64),
+        "Voltage": np.random.default_rng(1).random(rows),
+    }
+
+    BulkWriter(con_i).write(1, data, max_request_bytes=4_000)  # type: ignore[arg-type]
+
+    local_columns = con_i.created[2]
+    lc = to_pandas(local_columns, prefer_np_array_for_unknown=True)
+    assert list(lc["LocalColumn.SequenceRepresentation"]) == [
+        SeqRepEnum.implicit_linear,
+        SeqRepEnum.implicit_constant,
+        SeqRepEnum.explicit,
+    ]
+    np.testing.assert_allclose(lc["LocalColumn.GenerationParameters"][0], [0.0, 0.01])
+    assert list(lc["LocalColumn.Values"][1]) == [3]
+    assert lc["LocalColumn.Values"][1].dtype == np.int16
+    # only the explicit column is appended
+    assert con_i.updated
+    assert all(len(request.matrices[0].columns[0].longlong_array.values) == 1 for request in con_i.updated)
+    assert all(request.matrices[0].columns[0].longlong_array.values[0] == 106 for request in con_i.updated)
+
+
+@pytest.mark.parametrize("precision,dtype", [(0.01, np.int16), (1e-6, np.int32)])
+def test_quantize_linear_precision(precision, dtype):
+    values = 20.0 + np.cumsum(np.random.default_rng(2).normal(0, 0.05, 5000))
+    raw, (p1, p2) = quantize_linear(values, precision=precision)
+    assert raw.dtype == dtype
+    assert raw.min() == 0
+    assert np.max(np.abs(p1 + p2 * raw - values)) <= precision * (1 + 1e-9)
+
+
+def test_quantize_linear_bits_and_edge_cases():
+    values = np.linspace(-1.0, 3.0, 101)
+    raw, (p1, p2) = quantize_linear(values, bits=8)
+    assert raw.dtype == np.int16 and raw.max() == 255
+    assert np.max(np.abs(p1 + p2 * raw - values)) <= p2 / 2 * (1 + 1e-9)
+    raw, parameters = quantize_linear(np.full(3, 2.5), bits=20)
+    assert raw.dtype == np.int32 and list(raw) == [0, 0, 0] and parameters == [2.5, 1.0]
+    assert quantize_linear(np.array([1.0, np.nan]), bits=8) is None
+    assert quantize_linear(np.array([0.0, 1e300]), precision=1e-300) is None
+    with pytest.raises(ValueError, match="Exactly one"):
+        quantize_linear(values)
+    with pytest.raises(ValueError, match="between 1 and 31"):
+        quantize_linear(values, bits=32)
+    with pytest.raises(ValueError, match="floating point"):
+        quantize_linear(np.arange(3), bits=8)
+
+
+def test_write_quantized_columns():
+    con_i = _FakeConI()
+    rows = 2000
+    temperature = 20.0 + np.cumsum(np.random.default_rng(3).normal(0, 0.01, rows))
+    data = {"Time": np.arange(rows) * 0.1, "Temperature": temperature, "Pressure": np.full(rows, 1.5)}
+
+    BulkWriter(con_i).write(  # type: ignore[arg-type]
+        1, data, max_request_bytes=2_000, quantize_precision={"Temperature": 0.001}, quantize_bits={"Pressure": 12}
+    )
+
+    mq = to_pandas(con_i.created[0])
+    assert list(mq["MeaQuantity.DataType"]) == [ods.DT_DOUBLE, ods.DT_DOUBLE, ods.DT_DOUBLE]
+    lc = to_pandas(con_i.created[2], prefer_np_array_for_unknown=True)
+    # implicit columns are not quantized
+    assert list(lc["LocalColumn.SequenceRepresentation"]) == [
+        SeqRepEnum.implicit_linear,
+        SeqRepEnum.raw_linear,
+        SeqRepEnum.implicit_constant,
+    ]
+    assert list(con_i.created[2].matrices[0].columns[-2].is_null) == [True, False, True]
+    assert lc["LocalColumn.RawDatatype"][1] == ods.DT_SHORT
+
+    raw = np.concatenate(
+        [lc["LocalColumn.Values"][1]]
+        + [to_pandas(request, prefer_np_array_for_unknown=True)["LocalColumn.Values"][0] for request in con_i.updated]
+    )
+    assert raw.dtype == np.int16
+    df = pd.DataFrame(
+        [
+            {
+                "name": "Temperature",
+                "values": raw,
+                "sequence_representation": SeqRepEnum.raw_linear.value,
+                "generation_parameters": list(lc["LocalColumn.GenerationParameters"][1]),
+                "number_of_rows": rows,
+            }
+        ]
+    )
+    BulkReader._BulkReader__apply_sequence_representation(df)  # type: ignore[attr-defined]
+    np.testing.assert_allclose(df.loc[0, "values"], temperature, atol=0.001)
+
+    with pytest.raises(ValueError, match="Quantized column 'Unknown'"):
+        BulkWriter(con_i).write(1, data, quantize_bits={"Unknown": 8})  # type: ignore[arg-type]
+
+
+def test_write_measurement_creates_hierarchy_level_by_level():
+    con_i = _FakeConI()
+    rows = 3000
+    fast = {
+        "Time": np.arange(rows) * 0.001,
+        "Speed": np.random.default_rng(4).random(rows),
+    }
+    slow = {
+        "Time": np.arange(rows // 10, dtype=np.float64) * 0.01,
+        "Gear": np.random.default_rng(5).integers(-3, 4, rows // 10),
+    }
+
+    measurement_id, submatrix_ids = BulkWriter(con_i).write_measurement(  # type: ignore[arg-type]
+        7,
+        "Run",
+        {"fast": fast, "slow": slow},
+        independent={"slow": "Time"},
+        unit_ids={"Time": 3},
+        measurement_values={"description": "bench"},
+        max_request_bytes=4_000,
+    )
+
+    # measurement, submatrices with measurement quantities and local columns
+    measurement, metadata, local_columns = con_i.created
+    assert measurement_id == 100 and submatrix_ids == {"fast": 101, "slow": 102}
+    m = to_pandas(measurement)
+    assert list(m["MeaResult.TestStep"]) == [7] and list(m["MeaResult.Description"]) == ["bench"]
+    assert [matrix.name for matrix in metadata.matrices] == ["SubMatrix", "MeaQuantity"]
+    sm = to_pandas(ods.DataMatrices(matrices=[metadata.matrices[0]]))
+    assert list(sm["SubMatrix.SubMatrixNoRows"]) == [rows, rows // 10]
+    assert list(sm["SubMatrix.MeaResult"]) == [100, 100]
+    mq = to_pandas(ods.DataMatrices(matrices=[metadata.matrices[1]]))
+    # Time is shared by both submatrices
+    assert list(mq["MeaQuantity.Name"]) == ["Time", "Speed", "Gear"]
+    assert list(mq["MeaQuantity.DataType"]) == [ods.DT_DOUBLE, ods.DT_DOUBLE, ods.DT_LONGLONG]
+
+    lc = to_pandas(local_columns, prefer_np_array_for_unknown=True)
+    assert list(lc["LocalColumn.SubMatrix"]) == [101, 101, 102, 102]
+    assert list(lc["LocalColumn.MeaQuantity"]) == [103, 104, 103, 105]
+    assert list(lc["LocalColumn.IndependentFlag"]) == [1, 0, 1, 0]
+    assert list(lc["LocalColumn.SequenceRepresentation"]) == [
+        SeqRepEnum.implicit_linear,
+        SeqRepEnum.explicit,
+        SeqRepEnum.implicit_linear,
+        SeqRepEnum.explicit,
+    ]
+
+    written: dict[int, list[np.ndarray]] = {107: [lc["LocalColumn.Values"][1]], 109: [lc["LocalColumn.Values"][3]]}
+    for request in con_i.updated:
+        assert request.ByteSize() <= 4_000
+        chunk = to_pandas(request, prefer_np_array_for_unknown=True)
+        for iid, values in zip(chunk["LocalColumn.Id"], chunk["LocalColumn.Values"]):
+            written[iid].append(values)
+    np.testing.assert_array_equal(np.concatenate(written[107]), fast["Speed"])
+    np.testing.assert_array_equal(np.concatenate(written[109]), slow["Gear"])
+
+    with pytest.raises(ValueError, match="No submatrices"):
+        BulkWriter(con_i).write_measurement(7, "Run", {})  # type: ignore[arg-type]
+
+
+def test_write_errors():
+    con_i = _FakeConI()
+    writer = BulkWriter(con_i)  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="same length"):
+        writer.write(1, {"a": np.zeros(2), "b": np.zeros(3)})
+    with pytest.raises(ValueError, match="not contained"):
+        writer.write(1, {"a": np.zeros(2)}, independent="b")
+    with pytest.raises(ValueError, match="single row"):
+        writer.write(1, {"a": np.zeros(2)}, max_request_bytes=10)
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from unittest import mock
+
+import pytest
+
+import odsbox.proto.ods_pb2 as ods
+from odsbox.con_i import ConI
+from odsbox.datamatrices_split import fits, row_count, split_data_matrices, split_data_matrix
+
+
+def _matrix(rows: int) -> ods.DataMatrix:
+    matrix = ods.DataMatrix(name="Unit", base_name="AoUnit", aid=10)
+    matrix.columns.add(name="name", data_type=ods.DT_STRING).string_array.values.extend(
+        [f"unit_{index}" for index in range(rows)]
+    )
+    factor = matrix.columns.add(name="factor", data_type=ods.DT_DOUBLE)
+    factor.double_array.values.extend([float(index) for index in range(rows)])
+    factor.is_null.extend([index % 3 == 0 for index in range(rows)])
+    matrix.columns.add(name="data", data_type=ods.DT_BYTE).byte_array.values = bytes(range(rows))
+    matrix.columns.add(name="values", data_type=ods.DT_UNKNOWN).unknown_arrays.values.extend(
+        [
+            ods.DataMatrix.Column.UnknownArray(data_type=ods.DT_LONG, long_array=ods.LongArray(values=[index]))
+            for index in range(rows)
+        ]
+    )
+    return matrix
+
+
+def _join(chunks: list[ods.DataMatrices]) -> ods.DataMatrix:
+    joined = ods.DataMatrix()
+    joined.CopyFrom(chunks[0].matrices[0])
+    for chunk in chunks[1:]:
+        for target, source in zip(joined.columns, chunk.matrices[0].columns):
+            data = target.byte_array.values + source.byte_array.values
+            target.MergeFrom(source)
+            if target.HasField("byte_array"):
+                # bytes are replaced by MergeFrom
+                target.byte_array.values = data
+    return joined
+
+
+@pytest.mark.parametrize("max_rows,max_bytes", [(7, None), (None, 300), (10, 200), (100, None)])
+def test_split_data_matrix(max_rows, max_bytes):
+    matrix = _matrix(50)
+    chunks = split_data_matrix(matrix, max_rows=max_rows, max_bytes=max_bytes)
+
+    assert all(len(chunk.matrices) == 1 for chunk in chunks)
+    assert all(fits(chunk, max_rows, max_bytes) for chunk in chunks)
+    assert sum(row_count(chunk.matrices[0]) for chunk in chunks) == 50
+    assert all(chunk.matrices[0].base_name == "AoUnit" and chunk.matrices[0].aid == 10 for chunk in chunks)
+    assert _join(chunks) == matrix
+
+
+def test_split_data_matrix_edge_cases():
+    empty = ods.DataMatrix(name="Unit")
+    empty.columns.add(name="name").string_array.SetInParent()
+    chunks = split_data_matrix(empty, max_rows=10)
+    assert len(chunks) == 1 and chunks[0].matrices[0] == empty
+    with pytest.raises(ValueError, match="single row"):
+        split_data_matrix(_matrix(5), max_bytes=10)
+    with pytest.raises(ValueError, match="positive"):
+        split_data_matrix(_matrix(5), max_rows=0)
+
+
+@pytest.mark.parametrize(
+    "field,value",
+    [
+        ("row_start", 3),
+        ("values_start", 3),
+        ("values_remove_length", 2),
+        ("values_update_mode", ods.DataMatrix.VU_UPDATE),
+    ],
+)
+def test_split_data_matrix_refuses_offsets(field, value):
+    matrix = _matrix(20)
+    setattr(matrix, field, value)
+    # the offsets apply to the whole matrix and can not be copied to each chunk
+    with pytest.raises(ValueError, match="can not be split"):
+        split_data_matrix(matrix, max_rows=10)
+    chunks = split_data_matrix(matrix, max_rows=20)
+    assert len(chunks) == 1 and chunks[0].matrices[0] == matrix
+
+
+def test_split_data_matrices_keeps_matrices_together():
+    data = ods.DataMatrices(matrices=[_matrix(3), _matrix(4), _matrix(25), _matrix(2), _matrix(9)])
+    requests = split_data_matrices(data, max_rows=10)
+
+    assert [index for index, _ in requests] == [0, 2, 2, 2, 3]
+    assert [[row_count(matrix) for matrix in request.matrices] for _, request in requests] == [
+        [3, 4],
+        [10],
+        [10],
+        [5],
+        [2, 9],
+    ]
+    assert requests[0][1].matrices[1] == data.matrices[1]
+
+    # the serialized size of the request limits the matrices kept together
+    max_bytes = ods.DataMatrices(matrices=[_matrix(4)]).ByteSize() + 10
+    requests = split_data_matrices(ods.DataMatrices(matrices=[_matrix(3), _matrix(4)]), max_bytes=max_bytes)
+    assert [index for index, _ in requests] == [0, 1]
+    assert all(request.ByteSize() <= max_bytes for _, request in requests)
+
+
+@pytest.fixture
+def con_i():
+    con_i = ConI.__new__(ConI)
+    con_i._ConI__session = None
+    con_i._ConI__max_request_rows = 20
+    con_i._ConI__max_request_bytes = None
+    con_i._ConI__max_parallel_requests = 1
+    return con_i
+
+
+def _create_response(data: ods.DataMatrices) -> mock.Mock:
+    # ids are derived from the names to verify the order
+    names = data.matrices[0].columns[0].string_array.values
+    ids = ods.DataMatrices()
+    ids.matrices.add().columns.add(name="id").longlong_array.values.extend([int(name.split("_")[1]) for name in names])
+    return mock.Mock(content=ids.SerializeToString())
+
+
+@pytest.mark.parametrize("max_parallel_requests", [1, 4])
+def test_data_create_split(con_i, max_parallel_requests):
+    con_i._ConI__max_parallel_requests = max_parallel_requests
+    data = ods.DataMatrices(matrices=[_matrix(95), _matrix(30)])
+
+    def post(relative_url_part, message, timeout=None):
+        assert relative_url_part == "data-create"
+        return _create_response(message)
+
+    with mock.patch.object(con_i, "ods_post_request", side_effect=post) as ods_post_request:
+        ids = con_i.data_create(data)
+
+    assert ids == list(range(95))
+    # ids of the first matrix in input order, the second matrix is split as well
+    assert ods_post_request.call_count == 5 + 2
+
+
+def test_data_create_matrices(con_i):
+    data = ods.DataMatrices(matrices=[_matrix(3), _matrix(25)])
+    unsplit = ods.DataMatrices()
+    for values in ([1, 2, 3], [4, 5]):
+        unsplit.matrices.add().columns.add(name="id").longlong_array.values.extend(values)
+    with mock.patch.object(con_i, "ods_post_request", return_value=mock.Mock(content=unsplit.SerializeToString())):
+        con_i._ConI__max_request_rows = None
+        assert con_i.data_create_matrices(data) == [[1, 2, 3], [4, 5]]
+
+    con_i._ConI__max_request_rows = 10
+
+    def post(relative_url_part, message, timeout=None):
+        return _create_response(message)
+
+    with mock.patch.object(con_i, "ods_post_request", side_effect=post) as ods_post_request:
+        assert con_i.data_create_matrices(data) == [[0, 1, 2], list(range(25))]
+    assert ods_post_request.call_count == 1 + 3
+
+
+def test_data_create_matrices_keeps_small_matrices_together(con_i):
+    con_i._ConI__max_request_rows = 10
+    data = ods.DataMatrices(matrices=[_matrix(3), _matrix(4), _matrix(25)])
+
+    def post(relative_url_part, message, timeout=None):
+        # a request containing several matrices returns the ids of each
+        response = ods.DataMatrices()
+        for matrix in message.matrices:
+            names = matrix.columns[0].string_array.values
+            response.matrices.add().columns.add(name="id").longlong_array.values.extend(
+                [int(name.split("_")[1]) for name in names]
+            )
+        return mock.Mock(content=response.SerializeToString())
+
+    with mock.patch.object(con_i, "ods_post_request", side_effect=post) as ods_post_request:
+        assert con_i.data_create_matrices(data) == [[0, 1, 2], [0, 1, 2, 3], list(range(25))]
+    assert ods_post_request.call_count == 1 + 3
+    assert len(ods_post_request.mock_calls[0].args[1].matrices) == 2
+
+
+def test_data_update_and_delete_split(con_i):
+    data = ods.DataMatrices(matrices=[_matrix(10)])
+    with mock.patch.object(con_i, "ods_post_request") as ods_post_request:
+        con_i.data_update(data)
+        ods_post_request.assert_called_once_with("data-update", data, timeout=None)
+
+    con_i._ConI__max_request_rows = None
+    con_i._ConI__max_request_bytes = data.ByteSize() // 2
+    with mock.patch.object(con_i, "ods_post_request") as ods_post_request:
+        con_i.data_delete(data, timeout=5.0)
+    assert ods_post_request.call_count >= 2
+    assert all(call.args[0] == "data-delete" and call.kwargs["timeout"] == 5.0 for call in ods_post_request.mock_calls)
+    assert all(call.args[1].ByteSize() <= data.ByteSize() // 2 for call in ods_post_request.mock_calls)
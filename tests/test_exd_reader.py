@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import threading
+from concurrent import futures
+
+import numpy as np
+import pandas as pd
+import pytest
+
+grpc = pytest.importorskip("grpc")
+
+import odsbox.proto.ods_external_data_pb2 as exd  # noqa: E402
+import odsbox.proto.ods_external_data_pb2_grpc as exd_grpc  # noqa: E402
+import odsbox.proto.ods_pb2 as ods  # noqa: E402
+from odsbox.bulk_reader import SeqRepEnum  # noqa: E402
+from odsbox.exd_reader import ExdReader  # noqa: E402
+
+TIME = np.arange(6, dtype=np.float64) * 0.5
+SPEED = np.arange(6, dtype=np.float32) * 2
+COUNT = np.arange(6, dtype=np.int32)
+
+
+class _Servicer(exd_grpc.ExternalDataReaderServicer):
+    def __init__(self):
+        self.values_requests: list[exd.ValuesRequest] = []
+        self.open_handles: set[str] = set()
+        self.lock = threading.Lock()
+        self.second_group = False
+
+    def Open(self, request, context):
+        assert request.url == "file:///data/a.mf4"
+        self.open_handles.add("h1")
+        return exd.Handle(uuid="h1")
+
+    def Close(self, request, context):
+        self.open_handles.discard(request.uuid)
+        return exd.Empty()
+
+    def GetStructure(self, request, context):
+        channels = [
+            exd.StructureResult.Channel(id=1, name="Time", data_type=ods.DT_DOUBLE, unit_string="s"),
+            exd.StructureResult.Channel(id=2, name="Speed", data_type=ods.DT_FLOAT, unit_string="km/h"),
+            exd.StructureResult.Channel(id=3, name="Count", data_type=ods.DT_LONG, unit_string=""),
+        ]
+        if request.channel_names:
+            channels = [c for c in channels if c.name in request.channel_names]
+        groups = [
+            exd.StructureResult.Group(id=0, name="empty"),
+            exd.StructureResult.Group(id=7, name="g", number_of_rows=6, channels=channels),
+        ]
+        if self.second_group:
+            groups.append(exd.StructureResult.Group(id=8, name="g2", number_of_rows=6, channels=channels))
+        return exd.StructureResult(name="a.mf4", groups=groups)
+
+    def GetValues(self, request, context):
+        with self.lock:
+            self.values_requests.append(request)
+        end = request.start + request.limit if request.limit > 0 else None
+        result = exd.ValuesResult(id=request.group_id)
+        for channel_id in request.channel_ids:
+            channel = result.channels.add(id=channel_id)
+            if channel_id == 1:
+                channel.values.data_type = ods.DT_DOUBLE
+                channel.values.double_array.values.extend(TIME[request.start : end])
+            elif channel_id == 2:
+                channel.values.data_type = ods.DT_FLOAT
+                channel.values.float_array.values.extend(SPEED[request.start : end])
+            else:
+                channel.values.data_type = ods.DT_LONG
+                channel.values.long_array.values.extend(COUNT[request.start : end])
+                flags = np.full(6, 15)
+                flags[4] = 0
+                channel.flags.values.extend(flags[request.start : end])
+        return result
+
+    def GetValuesEx(self, request, context):
+        matrix = ods.DataMatrix(aid=82)
+        names = matrix.columns.add(name="name", base_name="name")
+        names.string_array.values.extend(request.channel_names)
+        values = matrix.columns.add(name="values", base_name="values")
+        for _ in request.channel_names:
+            item = values.unknown_arrays.values.add(data_type=ods.DT_DOUBLE)
+            item.double_array.values.extend(TIME)
+        return exd.ValuesExResult(values=matrix, unit_map={3: "s"})
+
+
+@pytest.fixture()
+def exd_server():
+    servicer = _Servicer()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
+    exd_grpc.add_ExternalDataReaderServicer_to_server(servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    try:
+        yield servicer, f"localhost:{port}"
+    finally:
+        server.stop(None)
+
+
+def test_read_group(exd_server):
+    servicer, target = exd_server
+    with ExdReader(target, max_workers=2) as reader:
+        df = reader.read_group("file:///data/a.mf4", start=1, limit=4)
+
+    assert list(df.columns) == ["Time", "Speed", "Count"]
+    assert df["Time"].tolist() == TIME[1:5].tolist()
+    assert df["Speed"].dtype == np.float32
+    # flags without the valid bit become NaN
+    np.testing.assert_array_equal(df["Count"].to_numpy(), [1.0, 2.0, 3.0, np.nan])
+    assert df.attrs["unit_names"] == {"Time": "s", "Speed": "km/h", "Count": ""}
+
+    # channels are split into concurrent batches
+    assert sorted(sorted(r.channel_ids) for r in servicer.values_requests) == [[1, 3], [2]]
+    assert all((r.group_id, r.start, r.limit) == (7, 1, 4) for r in servicer.values_requests)
+    assert servicer.open_handles == set()
+
+
+def test_read_values_ex(exd_server):
+    _, target = exd_server
+    with ExdReader(target) as reader:
+        handle = reader.open("file:///data/a.mf4")
+        df = reader.read_values_ex(handle, 7, ["Time"], ["name", "values"])
+        reader.close_handle(handle)
+
+    assert df.iloc[0, 0] == "Time"
+    assert isinstance(df.iloc[0, 1], np.ndarray)
+    assert df.iloc[0, 1].tolist() == TIME.tolist()
+    assert df.attrs["unit_map"] == {3: "s"}
+
+
+def test_read_submatrix(exd_server):
+    _, target = exd_server
+
+    class FakeConI:
+        def __init__(self):
+            self.queries = []
+
+        def query_data(self, query):
+            self.queries.append(query)
+            return pd.DataFrame(
+                {
+                    "LocalColumn.Name": ["Speed", "Time"],
+                    "ExternalComponent.FilenameURL": ["file:///data/a.mf4"] * 2,
+                    "LocalColumn.SequenceRepresentation": [SeqRepEnum.external_component] * 2,
+                    "LocalColumn.GenerationParameters": [None] * 2,
+                }
+            )
+
+    con_i = FakeConI()
+    with ExdReader(target) as reader:
+        df = reader.read_submatrix(con_i, 5, ["Time", "Speed"])  # type: ignore[arg-type]
+
+    assert con_i.queries[0]["AoLocalColumn"] == {"submatrix": 5, "name": {"$in": ["Time", "Speed"]}}
+    assert sorted(df.columns) == ["Speed", "Time"]
+    assert df["Speed"].tolist() == SPEED.tolist()
+    assert df.attrs["unit_names"] == {"Time": "s", "Speed": "km/h"}
+
+
+def test_read_submatrix_resolves_group_of_each_file(exd_server):
+    servicer, target = exd_server
+    servicer.second_group = True
+
+    class FakeConI:
+        def query_data(self, query):
+            return pd.DataFrame(
+                {
+                    "LocalColumn.Name": ["Speed", "Time", "Computed"],
+                    "ExternalComponent.FilenameURL": ["file:///data/a.mf4", "file:///data/a.mf4", np.nan],
+                    "LocalColumn.SequenceRepresentation": [
+                        SeqRepEnum.external_component,
+                        SeqRepEnum.external_component,
+                        SeqRepEnum.explicit,
+                    ],
+                    "LocalColumn.GenerationParameters": [None] * 3,
+                }
+            )
+
+    with ExdReader(target) as reader:
+        with pytest.raises(ValueError, match="group id is needed"):
+            reader.read_submatrix(FakeConI(), 5)  # type: ignore[arg-type]
+        df = reader.read_submatrix(FakeConI(), 5, exd_group_ids=8)  # type: ignore[arg-type]
+        assert {r.group_id for r in servicer.values_requests} == {8}
+        servicer.values_requests.clear()
+        reader.read_submatrix(FakeConI(), 5, exd_group_ids={"file:///data/a.mf4": 7})  # type: ignore[arg-type]
+        assert {r.group_id for r in servicer.values_requests} == {7}
+
+    # local columns without external component are skipped
+    assert sorted(df.columns) == ["Speed", "Time"]
+    assert servicer.open_handles == set()
+
+
+def test_read_submatrix_converts_raw_external_columns(exd_server):
+    _, target = exd_server
+
+    class FakeConI:
+        def __init__(self, speed_sequence_representation, speed_parameters):
+            self.speed_sequence_representation = speed_sequence_representation
+            self.speed_parameters = speed_parameters
+
+        def query_data(self, query):
+            assert "sequence_representation" in query["$attributes"]
+            assert "generation_parameters" in query["$attributes"]
+            return pd.DataFrame(
+                {
+                    "LocalColumn.Name": ["Speed", "Time"],
+                    "ExternalComponent.FilenameURL": ["file:///data/a.mf4"] * 2,
+                    "LocalColumn.SequenceRepresentation": [
+                        self.speed_sequence_representation,
+                        SeqRepEnum.external_component,
+                    ],
+                    "LocalColumn.GenerationParameters": [self.speed_parameters, None],
+                }
+            )
+
+    with ExdReader(target) as reader:
+        df = reader.read_submatrix(
+            FakeConI(SeqRepEnum.raw_linear_external, [1.0, 0.5]),
+            5,  # type: ignore[arg-type]
+        )
+        assert df["Speed"].tolist() == (1.0 + 0.5 * SPEED.astype(np.float64)).tolist()
+        assert df["Time"].tolist() == TIME.tolist()
+
+        with pytest.raises(ValueError, match="Speed"):
+            reader.read_submatrix(FakeConI(SeqRepEnum.raw_linear_external, [1.0]), 5)  # type: ignore[arg-type]
+
+
+def test_missing_group(exd_server):
+    servicer, target = exd_server
+    with ExdReader(target) as reader, pytest.raises(ValueError):
+        reader.read_group("file:///data/a.mf4", group_id=42)
+    assert servicer.open_handles == set()
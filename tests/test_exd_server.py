@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+grpc = pytest.importorskip("grpc")
+
+import odsbox.proto.ods_external_data_pb2 as exd  # noqa: E402
+from odsbox.bulk_export import write_chunks  # noqa: E402
+from odsbox.exd_reader import ExdReader  # noqa: E402
+from odsbox.exd_server import ExdStandInServicer, serve  # noqa: E402
+
+
+@pytest.fixture()
+def stand_in():
+    servicer = ExdStandInServicer()
+    server, target = serve(servicer)
+    try:
+        yield servicer, target
+    finally:
+        server.stop(None)
+
+
+def test_round_trip_of_data_types(stand_in):
+    servicer, target = stand_in
+    df = pd.DataFrame(
+        {
+            "f8": np.array([0.5, 1.5, 2.5]),
+            "f4": np.array([1, 2, 3], dtype=np.float32),
+            "i2": np.array([-1, 0, 1], dtype=np.int16),
+            "i4": np.array([1, 2, 3], dtype=np.int32),
+            "i8": np.array([2**40, 0, -1], dtype=np.int64),
+            "b": np.array([True, False, True]),
+            "u1": np.array([0, 128, 255], dtype=np.uint8),
+            "s": ["a", "b", "c"],
+        }
+    )
+    df.attrs["unit_names"] = {"f8": "s"}
+    servicer.add_file("file:///a", {"g1": df, "g2": df[["f8"]]})
+
+    with ExdReader(target) as reader:
+        result = reader.read_group("file:///a", group_id=1)
+
+    assert list(result.columns) == list(df.columns)
+    for name in df.columns:
+        assert result[name].tolist() == df[name].tolist()
+        if name != "s":
+            assert result[name].dtype == df[name].dtype
+    assert result.attrs["unit_names"]["f8"] == "s"
+
+
+def test_unsigned_channels_use_larger_signed_types(stand_in):
+    servicer, target = stand_in
+    df = pd.DataFrame(
+        {
+            "u2": np.array([0, 40_000, 65_535], dtype=np.uint16),
+            "u4": np.array([0, 3_000_000_000, 4_294_967_295], dtype=np.uint32),
+            "u8": np.array([0, 1, 2**63 - 1], dtype=np.uint64),
+        }
+    )
+    servicer.add_file("file:///u", {"g": df})
+
+    with ExdReader(target) as reader:
+        result = reader.read_group("file:///u")
+
+    for name in df.columns:
+        assert result[name].tolist() == df[name].tolist()
+    assert list(result.dtypes) == [np.int32, np.int64, np.int64]
+
+    with pytest.raises(ValueError, match="'u8' of group 'g' exceeds"):
+        servicer.add_file("file:///big", {"g": pd.DataFrame({"u8": np.array([2**63], dtype=np.uint64)})})
+
+
+def test_structure_and_values_ex(stand_in):
+    servicer, target = stand_in
+    servicer.add_file("file:///syn", {"g": ExdStandInServicer.synthetic_group(100, 3)})
+
+    with ExdReader(target) as reader:
+        handle = reader.open("file:///syn")
+        structure = reader.structure(handle, ["Time", "Channel1"])
+        values_ex = reader.read_values_ex(handle, 1, ["Time"], ["name", "values", "unit"], start=10, limit=5)
+        reader.close_handle(handle)
+
+    group = structure.groups[0]
+    assert (group.id, group.number_of_rows, group.total_number_of_channels) == (1, 100, 4)
+    assert [(c.id, c.name, c.unit_string) for c in group.channels] == [(1, "Time", "s"), (3, "Channel1", "")]
+    assert values_ex.iloc[0, 0] == "Time"
+    np.testing.assert_allclose(values_ex.iloc[0, 1], np.arange(10, 15) * 0.001)
+    assert values_ex.attrs["unit_map"][values_ex.iloc[0, 2]] == "s"
+
+
+def test_parquet_backed_file(stand_in, tmp_path):
+    pytest.importorskip("pyarrow")
+    servicer, target = stand_in
+    df = pd.DataFrame({"Time": [0.0, 1.0], "Force": [3.0, 4.0]})
+    df.attrs["unit_names"] = {"Time": "s", "Force": "N"}
+    write_chunks([df], str(tmp_path / "a.parquet"))
+    servicer.add_parquet("file:///a.parquet", str(tmp_path / "a.parquet"))
+
+    with ExdReader(target) as reader:
+        result = reader.read_group("file:///a.parquet")
+
+    assert result["Force"].tolist() == [3.0, 4.0]
+    assert result.attrs["unit_names"] == {"Time": "s", "Force": "N"}
+
+
+def test_unknown_file_and_handle(stand_in):
+    _, target = stand_in
+    with ExdReader(target) as reader:
+        with pytest.raises(grpc.RpcError) as e:
+            reader.open("file:///missing")
+        assert e.value.code() == grpc.StatusCode.NOT_FOUND
+        with pytest.raises(grpc.RpcError):
+            reader.read_values(exd.Handle(uuid="unknown"), 1, [1])
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_throughput_benchmark(stand_in, max_workers):
+    servicer, target = stand_in
+    rows, channels = 200_000, 32
+    servicer.add_file("file:///bench", {"g": ExdStandInServicer.synthetic_group(rows, channels)})
+
+    with ExdReader(target, max_workers=max_workers) as reader:
+        handle = reader.open("file:///bench")
+        for chunk_rows in (20_000, 200_000):
+            start = time.perf_counter()
+            for values_start in range(0, rows, chunk_rows):
+                values = reader.read_values(handle, 1, list(range(1, channels + 2)), values_start, chunk_rows)
+            elapsed = time.perf_counter() - start
+            megabytes = rows * (channels + 1) * 8 / 1e6
+            logging.getLogger(__name__).info(
+                "ExD max_workers=%d chunk_rows=%d: %.1f MB/s", max_workers, chunk_rows, megabytes / elapsed
+            )
+            assert len(values) == channels + 1
+        reader.close_handle(handle)
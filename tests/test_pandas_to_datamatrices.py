@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from google.protobuf.json_format import Parse
+
+import odsbox.proto.ods_pb2 as ods
+from odsbox.datamatrices_to_pandas import to_pandas
+from odsbox.model_cache import ModelCache
+from odsbox.pandas_to_datamatrices import data_type_of, from_pandas
+
+
+def _get_model():
+    model_file = os.path.join(os.path.abspath(os.path.dirname(__file__)), "test_data", "application_model.json")
+    model = ods.Model()
+    Parse(Path(model_file).read_text(encoding="utf-8"), model)
+    return model
+
+
+@pytest.fixture
+def mc() -> ModelCache:
+    return ModelCache(_get_model())
+
+
+def test_from_pandas_attributes_and_relations(mc):
+    df = pd.DataFrame(
+        {
+            "Name": ["m1", None, "m3"],
+            "ao_storagetype": ["database", "EXTERNAL_ONLY", 2],
+            "Size": pd.array([1, None, 3], dtype="Int64"),
+            "MeasurementBegin": pd.Series(
+                [pd.Timestamp("2024-01-02 03:04:05.678"), pd.NaT, pd.Timestamp("2024-12-31")]
+            ),
+            "DateCreated": ["20240102", "", "20240103040506"],
+            "test": [10, 11, 12],
+            "MDMLinks": [[("desc", "text/plain", "file:///a.txt")], [], None],
+        }
+    )
+
+    dms = from_pandas(df, "AoMeasurement", mc)
+
+    matrix = dms.matrices[0]
+    assert matrix.aid == mc.aid("MeaResult")
+    columns = {column.name: column for column in matrix.columns}
+    assert list(columns) == ["Name", "StorageType", "Size", "MeasurementBegin", "DateCreated", "TestStep", "MDMLinks"]
+    assert list(columns["Name"].string_array.values) == ["m1", "", "m3"]
+    assert list(columns["Name"].is_null) == [False, True, False]
+    assert list(columns["StorageType"].long_array.values) == [0, 1, 2]
+    assert list(columns["Size"].longlong_array.values) == [1, 0, 3]
+    assert list(columns["MeasurementBegin"].string_array.values) == ["20240102030405678", "", "20241231000000000"]
+    assert list(columns["MeasurementBegin"].is_null) == [False, True, False]
+    assert list(columns["DateCreated"].string_array.values) == ["20240102", "", "20240103040506"]
+    assert columns["TestStep"].data_type == ods.DT_LONGLONG
+    assert list(columns["TestStep"].longlong_array.values) == [10, 11, 12]
+    assert list(columns["MDMLinks"].string_arrays.values[0].values) == ["desc", "text/plain", "file:///a.txt"]
+    assert list(columns["MDMLinks"].is_null) == [False, False, True]
+
+    back = to_pandas(dms, mc, enum_as_string=True, date_as_timestamp=True, is_null_to_nan=True)
+    assert list(back["MeaResult.StorageType"]) == ["database", "external_only", "mixed"]
+    assert back["MeaResult.MeasurementBegin"][0] == pd.Timestamp("2024-01-02 03:04:05.678")
+    assert pd.isna(back["MeaResult.Size"][1])
+
+
+def test_from_pandas_local_column_values(mc):
+    df = pd.DataFrame(
+        {
+            "LocalColumn.Name": ["Time", "Force", "Valid"],
+            "values": [np.linspace(0, 1, 3), np.array([1, 2, 3], dtype=np.int16), np.array([True, False, True])],
+            "generation_parameters": [[0.0, 0.5], None, np.array([1.0])],
+            "sequence_representation": [0, 0, 0],
+            "submatrix": 5,
+        }
+    )
+
+    dms = from_pandas(df, mc.entity("LocalColumn"), mc)
+
+    columns = {column.name: column for column in dms.matrices[0].columns}
+    unknown = columns["Values"].unknown_arrays.values
+    assert [array.data_type for array in unknown] == [ods.DT_DOUBLE, ods.DT_SHORT, ods.DT_BOOLEAN]
+    assert list(unknown[0].double_array.values) == [0.0, 0.5, 1.0]
+    assert list(unknown[1].long_array.values) == [1, 2, 3]
+    assert list(unknown[2].boolean_array.values) == [True, False, True]
+    assert [list(a.values) for a in columns["GenerationParameters"].double_arrays.values] == [[0.0, 0.5], [], [1.0]]
+    assert list(columns["GenerationParameters"].is_null) == [False, True, False]
+    assert list(columns["SubMatrix"].longlong_array.values) == [5, 5, 5]
+
+    back = to_pandas(dms, prefer_np_array_for_unknown=True)
+    np.testing.assert_array_equal(back["LocalColumn.Values"][1], np.array([1, 2, 3], dtype=np.int16))
+
+
+def test_from_pandas_errors(mc):
+    with pytest.raises(ValueError, match="neither an attribute nor a relation"):
+        from_pandas(pd.DataFrame({"Unknown": [1]}), "Unit", mc)
+    with pytest.raises(ValueError, match="does not contain the key"):
+        from_pandas(pd.DataFrame({"StorageType": ["nowhere"]}), "MeaResult", mc)
+
+
+@pytest.mark.parametrize(
+    "dtype,expected",
+    [
+        (np.float32, ods.DT_FLOAT),
+        (np.float64, ods.DT_DOUBLE),
+        (np.complex128, ods.DT_DCOMPLEX),
+        (np.bool_, ods.DT_BOOLEAN),
+        (np.uint8, ods.DT_BYTE),
+        (np.int8, ods.DT_SHORT),
+        (np.uint16, ods.DT_LONG),
+        (np.int32, ods.DT_LONG),
+        (np.uint32, ods.DT_LONGLONG),
+        (np.int64, ods.DT_LONGLONG),
+        ("datetime64[ns]", ods.DT_DATE),
+        (object, ods.DT_STRING),
+    ],
+)
+def test_data_type_of(dtype, expected):
+    assert data_type_of(np.empty(0, dtype=dtype)) == expected
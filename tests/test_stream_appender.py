@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+from google.protobuf.json_format import Parse
+
+import odsbox.proto.ods_pb2 as ods
+from odsbox.bulk_reader import SeqRepEnum
+from odsbox.datamatrices_to_pandas import to_pandas
+from odsbox.model_cache import ModelCache
+from odsbox.stream_appender import StreamAppender
+
+
+def _get_model():
+    model_file = os.path.join(os.path.abspath(os.path.dirname(__file__)), "test_data", "application_model.json")
+    model = ods.Model()
+    Parse(Path(model_file).read_text(encoding="utf-8"), model)
+    return model
+
+
+class _FakeConI:
+    def __init__(self, local_columns: pd.DataFrame, number_of_rows: int = 100):
+        self.mc = ModelCache(_get_model())
+        self.local_columns = local_columns
+        self.number_of_rows = number_of_rows
+        self.updated: list[ods.DataMatrices] = []
+        self.fail = False
+
+    def query_data(self, query, **kwargs) -> pd.DataFrame:
+        if "AoSubMatrix" in query:
+            return pd.DataFrame({"SubMatrix.SubMatrixNoRows": [self.number_of_rows]})
+        assert kwargs["result_naming_mode"] == "query"
+        assert list(query["$attributes"]) == list(self.local_columns.columns)
+        return self.local_columns
+
+    def data_update(self, data: ods.DataMatrices) -> None:
+        if self.fail:
+            raise RuntimeError("server error")
+        self.updated.append(data)
+
+
+def _local_columns() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": [11, 12, 13],
+            "name": ["Time", "Speed", "Count"],
+            "sequence_representation": [SeqRepEnum.implicit_linear, SeqRepEnum.explicit, SeqRepEnum.raw_linear],
+            "measurement_quantity.datatype": [ods.DT_DOUBLE, ods.DT_FLOAT, ods.DT_DOUBLE],
+            "raw_datatype": [np.nan, np.nan, ods.DT_SHORT],
+        }
+    )
+
+
+def _appended(requests: list[ods.DataMatrices]) -> tuple[list[int], dict[int, np.ndarray]]:
+    starts = []
+    values: dict[int, list[np.ndarray]] = {}
+    for request in requests:
+        local_columns, submatrix = request.matrices
+        assert local_columns.values_update_mode == ods.DataMatrix.VU_APPEND
+        starts.append(local_columns.values_start)
+        df = to_pandas(ods.DataMatrices(matrices=[local_columns]), prefer_np_array_for_unknown=True)
+        for iid, column_values in zip(df["LocalColumn.Id"], df["LocalColumn.Values"]):
+            values.setdefault(iid, []).append(column_values)
+        rows = to_pandas(ods.DataMatrices(matrices=[submatrix]))
+        assert list(rows["SubMatrix.SubMatrixNoRows"]) == [local_columns.values_start + len(column_values)]
+    return starts, {iid: np.concatenate(chunks) for iid, chunks in values.items()}
+
+
+def test_stream_appender_flushes_full_ring_buffers():
+    con_i = _FakeConI(_local_columns())
+    speed = np.random.default_rng(6).random(23).astype(np.float32)
+    count = np.arange(23, dtype=np.int16)
+
+    with StreamAppender(con_i, 5, capacity=10, max_interval=None) as appender:  # type: ignore[arg-type]
+        assert appender.column_names == ["Speed", "Count"]
+        appender.append({"Time": 0.0, "Speed": speed[0], "Count": count[0]})
+        for start in range(1, 23, 4):
+            appender.append({"Speed": speed[start : start + 4], "Count": count[start : start + 4]})
+        assert len(con_i.updated) == 2 and appender.pending_rows == 3
+        assert appender.number_of_rows == 120
+
+    assert appender.number_of_rows == 123 and appender.pending_rows == 0
+    starts, values = _appended(con_i.updated)
+    assert starts == [100, 110, 120]
+    np.testing.assert_array_equal(values[12], speed)
+    np.testing.assert_array_equal(values[13], count)
+    assert values[13].dtype == np.int16
+
+
+def test_stream_appender_flushes_on_time_and_keeps_rows_of_failed_flush():
+    con_i = _FakeConI(_local_columns(), number_of_rows=0)
+    appender = StreamAppender(con_i, 5, capacity=100, max_interval=2.0)  # type: ignore[arg-type]
+    with mock.patch("odsbox.stream_appender.time.monotonic", return_value=10.0):
+        appender.append({"Speed": [1.0, 2.0], "Count": [1, 2]})
+    with mock.patch("odsbox.stream_appender.time.monotonic", return_value=11.0):
+        appender.append({"Speed": [3.0], "Count": [3]})
+    assert con_i.updated == []
+
+    con_i.fail = True
+    with mock.patch("odsbox.stream_appender.time.monotonic", return_value=12.5), pytest.raises(RuntimeError):
+        appender.poll()
+    assert appender.pending_rows == 3 and appender.number_of_rows == 0
+
+    con_i.fail = False
+    appender.flush()
+    starts, values = _appended(con_i.updated)
+    assert starts == [0]
+    np.testing.assert_array_equal(values[12], [1.0, 2.0, 3.0])
+    appender.poll()
+    assert len(con_i.updated) == 1
+
+    # the next rows wrap around the end of the ring buffers
+    appender.append({"Speed": np.arange(99.0), "Count": np.arange(99)})
+    appender.flush()
+    starts, values = _appended(con_i.updated)
+    assert starts == [0, 3]
+    np.testing.assert_array_equal(values[13], [1, 2, 3, *range(99)])
+
+
+def test_stream_appender_errors():
+    con_i = _FakeConI(_local_columns())
+    appender = StreamAppender(con_i, 5)  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="missing the columns \\['Count'\\]"):
+        appender.append({"Speed": [1.0]})
+    with pytest.raises(ValueError, match="same length"):
+        appender.append({"Speed": [1.0], "Count": [1, 2]})
+    with pytest.raises(ValueError, match="'Unknown' is not a local column"):
+        appender.append({"Speed": [1.0], "Count": [1], "Unknown": [1]})
+    with pytest.raises(ValueError, match="positive"):
+        StreamAppender(con_i, 5, capacity=0)  # type: ignore[arg-type]
+
+    # raw columns take exact raw values
+    with pytest.raises(ValueError, match="takes raw int16 values, got float64"):
+        appender.append({"Speed": [1.0], "Count": [1.5]})
+    with pytest.raises(ValueError, match="exceed the range of int16"):
+        appender.append({"Speed": [1.0, 2.0], "Count": [1, 40_000]})
+    assert appender.pending_rows == 0
+
+    external = _local_columns()
+    external.loc[1, "sequence_representation"] = SeqRepEnum.external_component
+    with pytest.raises(ValueError, match="external_component"):
+        StreamAppender(_FakeConI(external), 5)  # type: ignore[arg-type]
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import hashlib
+from unittest import mock
+
+import pandas as pd
+
+from odsbox.bulk_reader import BulkReader
+from odsbox.unit_cache import UnitCache
+
+
+class _FakeConI:
+    def __init__(self, url: str = "http://localhost:8080/api"):
+        self.url = url
+        self.queries = 0
+
+    def query_data(self, query, **kwargs) -> pd.DataFrame:
+        assert query == {"AoUnit": {}, "$attributes": {"id": 1, "name": 1}}
+        self.queries += 1
+        return pd.DataFrame({"Unit.Id": [1, 2, 3], "Unit.Name": ["s", "V", f"q{self.queries}"]})
+
+
+def test_unit_cache_shares_units_per_server_until_expired():
+    cache = UnitCache(ttl_seconds=10.0)
+    con_i, other_session, other_server = _FakeConI(), _FakeConI(), _FakeConI("http://other:8080/api")
+    with mock.patch("odsbox.unit_cache.time.time", return_value=100.0):
+        assert cache.unit_names(con_i) == {1: "s", 2: "V", 3: "q1"}
+        assert cache.unit_names(other_session) == {1: "s", 2: "V", 3: "q1"}
+        cache.unit_names(other_server)
+    assert (con_i.queries, other_session.queries, other_server.queries) == (1, 0, 1)
+
+    with mock.patch("odsbox.unit_cache.time.time", return_value=110.0):
+        assert cache.unit_names(other_session)[3] == "q1"
+    assert other_session.queries == 1
+
+    names = cache.unit_names(con_i, update=True)
+    names[4] = "modified copy"
+    assert cache.unit_names(con_i) == {1: "s", 2: "V", 3: "q2"}
+    cache.invalidate(con_i.url)
+    cache.unit_names(con_i)
+    assert con_i.queries == 3
+    assert UnitCache.default() is UnitCache.default()
+
+
+def test_unit_cache_directory_is_shared_between_processes(tmp_path):
+    con_i = _FakeConI()
+    UnitCache(directory=str(tmp_path)).unit_names(con_i)
+    # a second instance represents another process
+    other_process = UnitCache(directory=str(tmp_path))
+    assert other_process.unit_names(con_i) == {1: "s", 2: "V", 3: "q1"}
+    assert con_i.queries == 1
+
+    with mock.patch("odsbox.unit_cache.time.time", return_value=1e12):
+        assert UnitCache(directory=str(tmp_path)).unit_names(con_i)[3] == "q2"
+    other_process.invalidate(con_i.url)
+    assert list(tmp_path.iterdir()) == []
+    (tmp_path / f"units_{hashlib.sha1(con_i.url.encode()).hexdigest()}.json").write_text("{", encoding="utf-8")
+    assert UnitCache(directory=str(tmp_path)).unit_names(con_i)[3] == "q3"
+
+
+def test_bulk_reader_unit_name_lookup_uses_unit_cache():
+    con_i = _FakeConI()
+    unit_cache = UnitCache()
+    readers = [BulkReader(con_i), BulkReader(con_i)]  # type: ignore[arg-type]
+    for reader in readers:
+        reader.unit_cache = unit_cache
+        assert reader.unit_name_lookup() == {1: "s", 2: "V", 3: "q1"}
+    assert con_i.queries == 1
+    assert readers[0].unit_name_lookup(update=True)[3] == "q2"
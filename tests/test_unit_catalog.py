@@ -2,9 +2,19 @@
 
 from __future__ import annotations
 
+import os
+from pathlib import Path
+
+import pandas as pd
 import pytest
+from google.protobuf.json_format import Parse
 
+import odsbox.proto.ods_pb2 as ods
+from odsbox.bulk_reader import BulkReader
 from odsbox.con_i import ConI
+from odsbox.datamatrices_to_pandas import to_pandas
+from odsbox.model_cache import ModelCache
+from odsbox.unit_cache import UnitCache
 from odsbox.unit_catalog import UnitCatalog
 
 
@@ -38,3 +48,63 @@ def test_unit_get_or_create():
         assert unit_catalog.get_or_create("V") > 0
         assert unit_catalog.get_or_create("J") > 0
         assert unit_catalog.get_or_create("A") > 0
+
+
+class _FakeConI:
+    def __init__(self):
+        model = ods.Model()
+        model_file = os.path.join(os.path.dirname(__file__), "test_data", "application_model.json")
+        Parse(Path(model_file).read_text(encoding="utf-8"), model)
+        self.mc = ModelCache(model)
+        self.url = "http://localhost:8080/api"
+        self.created: list[ods.DataMatrices] = []
+        self.unit_queries = 0
+
+    def query_data(self, query, **kwargs) -> pd.DataFrame:
+        if "AoUnit" in query:
+            self.unit_queries += 1
+            # units created before are returned as well
+            names = ["s", "V"] + [
+                name for data in self.created for name in data.matrices[0].columns[0].string_array.values
+            ]
+            return pd.DataFrame({"Unit.Id": [1, 2, *range(100, 98 + len(names))], "Unit.Name": names})
+        return pd.DataFrame({"PhysDimension.Id": [5]})
+
+    def data_create(self, data: ods.DataMatrices) -> list[int]:
+        self.created.append(data)
+        return list(range(100, 100 + len(data.matrices[0].columns[0].string_array.values)))
+
+
+def test_unit_get_or_create_many_creates_missing_units_in_one_request():
+    con_i = _FakeConI()
+    unit_cache = UnitCache()
+    unit_catalog = UnitCatalog(con_i, unit_cache)  # type: ignore[arg-type]
+    assert unit_catalog.get("V") == 2 and isinstance(unit_catalog.get("V"), int)
+    UnitCatalog(con_i, unit_cache)  # type: ignore[arg-type]
+    assert con_i.unit_queries == 1
+
+    ids = unit_catalog.get_or_create_many(["s", "rpm", "", "rpm", "Nm", "V"])
+
+    assert ids == [1, 100, 101, 100, 102, 2]
+    assert len(con_i.created) == 1
+    units = to_pandas(con_i.created[0])
+    assert list(units.iloc[:, 0]) == ["rpm", "-", "Nm"]
+    assert list(units.iloc[:, -1]) == [5, 5, 5]
+    assert unit_catalog.get_or_create("Nm") == 102
+    assert unit_catalog.get_or_create_many([]) == []
+    assert len(con_i.created) == 1
+    # creating units invalidates the shared cache
+    UnitCatalog(con_i, unit_cache)  # type: ignore[arg-type]
+    assert con_i.unit_queries == 2
+
+
+def test_created_unit_is_resolved_by_bulk_reader():
+    con_i = _FakeConI()
+    unit_cache = UnitCache()
+    reader = BulkReader(con_i)  # type: ignore[arg-type]
+    reader.unit_cache = unit_cache
+    assert reader.unit_name_lookup() == {1: "s", 2: "V"}
+
+    assert UnitCatalog(con_i, unit_cache).get_or_create("rpm") == 100  # type: ignore[arg-type]
+
+    assert reader.unit_name_lookup() == {1: "s", 2: "V", 100: "rpm"}